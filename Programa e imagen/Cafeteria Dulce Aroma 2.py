@@ -1,2094 +1,5419 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, font
-import datetime
-from typing import List, Dict, Optional, Tuple
-import os
-import pickle
-from PIL import Image, ImageTk  
-
-# Configuración de colores
-COLORES = {
-    "fondo": "#f8f4e9",  # Beige claro
-    "primario": "#a68a64",  # Café claro
-    "secundario": "#d4b483",  # Café muy claro
-    "acento": "#e8d9c5",  # Beige
-    "texto": "#5a4a3a",  # Café oscuro para texto
-    "exito": "#7cb342",  # Verde claro
-    "error": "#e53935",  # Rojo
-    "advertencia": "#ffb74d",  # Naranja claro
-    "info": "#64b5f6"  # Azul claro
-}
-
-# Opciones adicionales para productos
-TIPOS_LECHE = ["Entera", "Deslactosada", "Almendras", "Soya", "Sin leche"]
-NIVELES_AZUCAR = ["Sin azúcar", "Poco", "Normal", "Mucho"]
-
-class ProductoConExtras:
-    """Clase que representa un producto con sus opciones personalizadas"""
-    def __init__(self, producto: 'Producto', cantidad: int = 1, tipo_leche: str = None, 
-                 azucar: str = None, notas: str = ""):
-        self.producto = producto
-        self.cantidad = cantidad
-        self.tipo_leche = tipo_leche
-        self.azucar = azucar
-        self.notas = notas
-    
-    @property
-    def precio_total(self) -> float:
-        """Calcula el precio total considerando la cantidad"""
-        return self.producto.precio * self.cantidad
-    
-    def __str__(self) -> str:
-        """Formatea la información del producto con extras para mostrar"""
-        detalles = []
-        if self.tipo_leche:
-            detalles.append(f"Leche: {self.tipo_leche}")
-        if self.azucar:
-            detalles.append(f"Azúcar: {self.azucar}")
-        if self.notas:
-            detalles.append(f"Notas: {self.notas}")
-        
-        detalles_str = " - " + ", ".join(detalles) if detalles else ""
-        return f"{self.cantidad}x {self.producto.nombre}{detalles_str} - ${self.precio_total:.2f}"
-
-class Persona:
-    """Clase base para personas"""
-    def __init__(self, nombre: str, telefono: str):
-        self.nombre = nombre
-        self.telefono = telefono
-    
-    def contactar(self) -> str:
-        """Método para contactar a la persona"""
-        return f"Contactando a {self.nombre} en {self.telefono}"
-
-class Cliente(Persona):
-    """Clase que representa a un cliente"""
-    def __init__(self, nombre: str, telefono: str, identificacion: str):
-        super().__init__(nombre, telefono)
-        self.identificacion = identificacion
-        self.historial_pedidos: List["Pedido"] = []
-    
-    def realizar_pedido(self, productos: List[ProductoConExtras]) -> "Pedido":
-        """Crea un nuevo pedido para el cliente"""
-        nuevo_pedido = Pedido(self, productos)
-        self.historial_pedidos.append(nuevo_pedido)
-        return nuevo_pedido
-
-class Empleado(Persona):
-    """Clase que representa a un empleado"""
-    def __init__(self, nombre: str, telefono: str, puesto: str, usuario: str, contrasena: str):
-        super().__init__(nombre, telefono)
-        self.puesto = puesto
-        self.usuario = usuario
-        self.contrasena = contrasena
-    
-    def procesar_pedido(self, pedido: "Pedido") -> None:
-        """Cambia el estado del pedido a 'En preparación'"""
-        pedido.estado = "En preparación"
-    
-    def entregar_pedido(self, pedido: "Pedido") -> None:
-        """Cambia el estado del pedido a 'Entregado'"""
-        pedido.estado = "Entregado"
-    
-    def actualizar_inventario(self, producto: "Producto", cantidad: int) -> None:
-        """Actualiza el stock de un producto"""
-        producto.stock += cantidad
-
-class ProductoBase:
-    """Clase base para productos"""
-    def __init__(self, codigo: str, nombre: str, precio: float, stock: int = 0):
-        self.codigo = codigo
-        self.nombre = nombre
-        self.precio = precio
-        self.stock = stock
-    
-    def obtener_precio(self) -> float:
-        """Devuelve el precio del producto"""
-        return self.precio
-    
-    def actualizar_stock(self, cantidad: int) -> None:
-        """Actualiza el stock del producto"""
-        self.stock += cantidad
-        if self.stock < 0:
-            self.stock = 0
-
-class Producto(ProductoBase):
-    """Clase para productos generales"""
-    def __init__(self, codigo: str, nombre: str, precio: float, stock: int = 0, descripcion: str = "", imagen: str = None):
-        super().__init__(codigo, nombre, precio, stock)
-        self.descripcion = descripcion
-        self.imagen = imagen
-    
-    def __str__(self) -> str:
-        """Representación en string del producto"""
-        return f"{self.nombre} - ${self.precio:.2f} ({self.stock} disponibles)"
-
-class Bebida(Producto):
-    """Clase para bebidas"""
-    def __init__(self, codigo: str, nombre: str, precio: float, stock: int = 0, tamano: str = "Mediano", imagen: str = None):
-        super().__init__(codigo, nombre, precio, stock, "", imagen)
-        self.tamano = tamano
-    
-    def cambiar_tamano(self, nuevo_tamano: str) -> None:
-        """Cambia el tamaño de la bebida"""
-        self.tamano = nuevo_tamano
-
-class Postre(Producto):
-    """Clase para postres"""
-    def __init__(self, codigo: str, nombre: str, precio: float, stock: int = 0, ingredientes: List[str] = None, imagen: str = None):
-        super().__init__(codigo, nombre, precio, stock, "", imagen)
-        self.ingredientes = ingredientes if ingredientes else []
-    
-    def mostrar_ingredientes(self) -> str:
-        """Devuelve los ingredientes como string"""
-        return ", ".join(self.ingredientes)
-
-class Pedido:
-    """Clase que representa un pedido"""
-    contador_pedidos = 0
-    
-    def __init__(self, cliente: Cliente, productos: List[ProductoConExtras]):
-        Pedido.contador_pedidos += 1
-        self.numero = Pedido.contador_pedidos
-        self.cliente = cliente
-        self.productos = productos.copy()
-        self.fecha = datetime.datetime.now()
-        self.estado = "Nuevo"
-        self.total = self.calcular_total()
-    
-    def calcular_total(self) -> float:
-        """Calcula el total del pedido"""
-        return sum(item.precio_total for item in self.productos)
-    
-    def agregar_producto(self, producto: ProductoConExtras) -> None:
-        """Agrega un producto al pedido"""
-        self.productos.append(producto)
-        self.total = self.calcular_total()
-    
-    def eliminar_producto(self, producto: ProductoConExtras) -> bool:
-        """Elimina un producto del pedido"""
-        if producto in self.productos:
-            self.productos.remove(producto)
-            self.total = self.calcular_total()
-            return True
-        return False
-    
-    def actualizar_estado(self, nuevo_estado: str) -> None:
-        """Actualiza el estado del pedido"""
-        self.estado = nuevo_estado
-
-class ProcesoBase:
-    """Clase base para procesos"""
-    def __init__(self, fecha: datetime.datetime):
-        self.fecha = fecha
-    
-    def obtener_fecha(self) -> datetime.datetime:
-        """Devuelve la fecha del proceso"""
-        return self.fecha
-
-class ProcesoPedido(ProcesoBase):
-    """Clase para el proceso de preparación de pedidos"""
-    def __init__(self, pedido: Pedido, empleado: Empleado):
-        super().__init__(datetime.datetime.now())
-        self.pedido = pedido
-        self.empleado = empleado
-    
-    def iniciar_proceso(self) -> None:
-        """Inicia el proceso de preparación"""
-        self.pedido.actualizar_estado("En preparación")
-    
-    def finalizar_proceso(self) -> None:
-        """Finaliza el proceso de preparación"""
-        self.pedido.actualizar_estado("Listo para entrega")
-
-class ProcesoEntrega(ProcesoBase):
-    """Clase para el proceso de entrega de pedidos"""
-    def __init__(self, pedido: Pedido, empleado: Empleado):
-        super().__init__(datetime.datetime.now())
-        self.pedido = pedido
-        self.empleado = empleado
-    
-    def entregar(self) -> None:
-        """Marca el pedido como entregado"""
-        self.pedido.actualizar_estado("Entregado")
-    
-    def obtener_detalle(self) -> str:
-        """Devuelve el detalle de la entrega"""
-        return f"Pedido #{self.pedido.numero} entregado por {self.empleado.nombre} en {self.fecha}"
-
-class Inventario:
-    """Clase para gestionar el inventario de productos"""
-    def __init__(self):
-        self.productos: Dict[str, Producto] = {}
-    
-    def agregar_producto(self, producto: Producto) -> None:
-        """Agrega un producto al inventario"""
-        self.productos[producto.codigo] = producto
-    
-    def actualizar_stock(self, codigo: str, cantidad: int) -> bool:
-        """Actualiza el stock de un producto"""
-        if codigo in self.productos:
-            self.productos[codigo].actualizar_stock(cantidad)
-            return True
-        return False
-    
-    def obtener_producto(self, codigo: str) -> Optional[Producto]:
-        """Obtiene un producto por su código"""
-        return self.productos.get(codigo)
-    
-    def listar_productos(self) -> List[Producto]:
-        """Lista todos los productos"""
-        return list(self.productos.values())
-    
-    def listar_bebidas(self) -> List[Bebida]:
-        """Lista todas las bebidas"""
-        return [p for p in self.productos.values() if isinstance(p, Bebida)]
-    
-    def listar_postres(self) -> List[Postre]:
-        """Lista todos los postres"""
-        return [p for p in self.productos.values() if isinstance(p, Postre)]
-
-class SistemaPedidos:
-    """Clase principal del sistema de pedidos"""
-    DATA_FILE = "cafeteria_data.pkl"
-    
-    def __init__(self):
-        self.inventario = Inventario()
-        self.pedidos: List[Pedido] = []
-        self.clientes: Dict[str, Cliente] = {}
-        self.empleados: Dict[str, Empleado] = {}
-        self.cargar_datos()
-    
-    def inicializar_datos_demo(self) -> None:
-        """Inicializa datos de demostración"""
-        # Bebidas
-        bebidas = [
-            Bebida("B001", "Café Americano", 2.50, 50, "Mediano", "☕"),
-            Bebida("B002", "Cappuccino", 3.50, 30, "Mediano", "☕"),
-            Bebida("B003", "Chocolate Caliente", 3.00, 25, "Mediano", "☕"),
-            Bebida("B004", "Té Verde", 2.00, 40, "Mediano", "🍵"),
-            Bebida("B005", "Smoothie de Frutas", 4.00, 20, "Grande", "🥤"),
-            Bebida("B006", "Mocha", 3.75, 35, "Mediano", "☕"),
-            Bebida("B007", "Latte", 3.25, 30, "Grande", "☕"),
-            Bebida("B008", "Té de Manzanilla", 2.25, 25, "Mediano", "🍵"),
-            Bebida("B009", "Jugo Natural", 3.50, 20, "Grande", "🧃"),
-            Bebida("B010", "Frappé de Vainilla", 4.50, 15, "Grande", "🥤")
-        ]
-        
-        # Postres
-        postres = [
-            Postre("P001", "Croissant", 2.00, 20, ["Harina", "Mantequilla", "Azúcar"], "🥐"),
-            Postre("P002", "Donut", 1.50, 15, ["Harina", "Azúcar", "Chocolate"], "🍩"),
-            Postre("P003", "Cheesecake", 3.50, 10, ["Queso crema", "Galleta", "Azúcar"], "🍰"),
-            Postre("P004", "Brownie", 2.50, 12, ["Chocolate", "Nueces", "Harina"], "🍫"),
-            Postre("P005", "Muffin de Arándanos", 2.75, 18, ["Harina", "Arándanos", "Azúcar"], "🧁"),
-            Postre("P006", "Tarta de Manzana", 4.00, 8, ["Manzana", "Masa", "Canela"], "🍎"),
-            Postre("P007", "Galletas de Chocolate", 1.75, 25, ["Harina", "Chocolate", "Mantequilla"], "🍪"),
-            Postre("P008", "Flan", 3.00, 12, ["Huevo", "Leche", "Azúcar"], "🍮"),
-            Postre("P009", "Tiramisú", 4.50, 10, ["Café", "Queso mascarpone", "Bizcochos"], "🍰"),
-            Postre("P010", "Profiteroles", 3.75, 8, ["Crema", "Masa", "Chocolate"], "🧁")
-        ]
-        
-        # Agregar productos al inventario
-        for bebida in bebidas:
-            self.inventario.agregar_producto(bebida)
-        
-        for postre in postres:
-            self.inventario.agregar_producto(postre)
-        
-        # Agregar empleados
-        empleados = [
-            Empleado("Amanda Sanchez", "555-1234", "Barista", "amanda", "amanda"),
-            Empleado("Carlos Castillo", "555-5678", "Cajero", "carlos", "carlos"),
-            Empleado("Guadalupe Mino", "555-0000", "Administrador", "admin", "admin")
-        ]
-        
-        for empleado in empleados:
-            self.empleados[empleado.usuario] = empleado
-    
-    def guardar_datos(self) -> None:
-        """Guarda los datos en un archivo"""
-        with open(self.DATA_FILE, 'wb') as f:
-            pickle.dump((self.inventario, self.pedidos, self.clientes, self.empleados), f)
-    
-    def cargar_datos(self) -> bool:
-        """Carga los datos desde un archivo"""
-        if os.path.exists(self.DATA_FILE):
-            try:
-                with open(self.DATA_FILE, 'rb') as f:
-                    self.inventario, self.pedidos, self.clientes, self.empleados = pickle.load(f)
-                return True
-            except:
-                self.inicializar_datos_demo()
-                return False
-        else:
-            self.inicializar_datos_demo()
-            return False
-    
-    def validar_empleado(self, usuario: str, contrasena: str) -> Optional[Empleado]:
-        """Valida las credenciales de un empleado"""
-        if usuario in self.empleados and self.empleados[usuario].contrasena == contrasena:
-            return self.empleados[usuario]
-        return None
-    
-    def registrar_cliente(self, nombre: str, telefono: str, identificacion: str) -> Cliente:
-        """Registra un nuevo cliente"""
-        nuevo_cliente = Cliente(nombre, telefono, identificacion)
-        self.clientes[identificacion] = nuevo_cliente
-        self.guardar_datos()
-        return nuevo_cliente
-    
-    def buscar_cliente(self, identificacion: str) -> Optional[Cliente]:
-        """Busca un cliente por su identificación"""
-        return self.clientes.get(identificacion)
-    
-    def crear_pedido(self, cliente_id: str, productos: List[ProductoConExtras]) -> Optional[Pedido]:
-        """Crea un nuevo pedido"""
-        cliente = self.buscar_cliente(cliente_id)
-        if not cliente:
-            return None
-        
-        # Verificar stock antes de crear el pedido
-        for item in productos:
-            producto = self.inventario.obtener_producto(item.producto.codigo)
-            if not producto or producto.stock < item.cantidad:
-                messagebox.showwarning("Error", f"No hay suficiente stock de {item.producto.nombre}")
-                return None
-        
-        # Descontar el stock
-        for item in productos:
-            producto = self.inventario.obtener_producto(item.producto.codigo)
-            producto.actualizar_stock(-item.cantidad)
-        
-        pedido = cliente.realizar_pedido(productos)
-        self.pedidos.append(pedido)
-        self.guardar_datos()
-        return pedido
-    
-    def listar_pedidos(self, estado: Optional[str] = None) -> List[Pedido]:
-        """Lista los pedidos según su estado"""
-        if estado:
-            return [p for p in self.pedidos if p.estado == estado]
-        return self.pedidos
-    
-    def modificar_pedido(self, numero_pedido: int, accion: str, producto: ProductoConExtras = None) -> bool:
-        """Modifica un pedido existente"""
-        for pedido in self.pedidos:
-            if pedido.numero == numero_pedido and pedido.estado == "Nuevo":
-                if accion == "agregar":
-                    prod_base = self.inventario.obtener_producto(producto.producto.codigo)
-                    if prod_base and prod_base.stock >= producto.cantidad:
-                        pedido.agregar_producto(producto)
-                        prod_base.actualizar_stock(-producto.cantidad)
-                        self.guardar_datos()
-                        return True
-                elif accion == "eliminar":
-                    for p in pedido.productos:
-                        if p.producto.codigo == producto.producto.codigo:
-                            if pedido.eliminar_producto(p):
-                                prod_base = self.inventario.obtener_producto(p.producto.codigo)
-                                prod_base.actualizar_stock(p.cantidad)
-                                self.guardar_datos()
-                                return True
-        return False
-    
-    def procesar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
-        """Cambia el estado del pedido a 'En preparación'"""
-        empleado = self.empleados.get(empleado_usuario)
-        if not empleado:
-            return False
-        
-        for pedido in self.pedidos:
-            if pedido.numero == numero_pedido and pedido.estado == "Nuevo":
-                proceso = ProcesoPedido(pedido, empleado)
-                proceso.iniciar_proceso()
-                self.guardar_datos()
-                return True
-        return False
-    
-    def entregar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
-        """Marca el pedido como entregado"""
-        empleado = self.empleados.get(empleado_usuario)
-        if not empleado:
-            return False
-        
-        for pedido in self.pedidos:
-            if pedido.numero == numero_pedido and pedido.estado == "En preparación":
-                proceso = ProcesoEntrega(pedido, empleado)
-                proceso.entregar()
-                self.guardar_datos()
-                return True
-        return False
-    
-    def listar_productos_disponibles(self) -> List[Producto]:
-        """Lista los productos con stock disponible"""
-        return [p for p in self.inventario.listar_productos() if p.stock > 0]
-    
-    def generar_reporte_ventas(self) -> Dict:
-        """Genera un reporte de ventas"""
-        total_ventas = sum(p.total for p in self.pedidos if p.estado == "Entregado")
-        productos_vendidos = {}
-        for pedido in self.pedidos:
-            if pedido.estado == "Entregado":
-                for item in pedido.productos:
-                    if item.producto.codigo in productos_vendidos:
-                        productos_vendidos[item.producto.codigo] += item.cantidad
-                    else:
-                        productos_vendidos[item.producto.codigo] = item.cantidad
-        
-        return {
-            "total_ventas": total_ventas,
-            "productos_vendidos": productos_vendidos,
-            "pedidos_completados": len([p for p in self.pedidos if p.estado == "Entregado"])
-        }
-    
-    def agregar_empleado(self, nombre: str, telefono: str, puesto: str, usuario: str, contrasena: str) -> bool:
-        """Agrega un nuevo empleado"""
-        if usuario in self.empleados:
-            return False
-        
-        nuevo_empleado = Empleado(nombre, telefono, puesto, usuario, contrasena)
-        self.empleados[usuario] = nuevo_empleado
-        self.guardar_datos()
-        return True
-    
-    def exportar_clientes_excel(self, filename: str = "clientes_cafeteria.xlsx") -> bool:
-        """Exporta la lista de clientes a un archivo Excel"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font
-            
-            # Crear un nuevo libro de Excel
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Clientes"
-            
-            # Escribir los encabezados
-            headers = ["Identificación", "Nombre", "Teléfono", "Total Pedidos", "Total Gastado"]
-            ws.append(headers)
-            
-            # Estilo para los encabezados
-            for cell in ws[1]:
-                cell.font = Font(bold=True)
-            
-            # Escribir los datos de cada cliente
-            for cliente in self.clientes.values():
-                total_pedidos = len(cliente.historial_pedidos)
-                total_gastado = sum(p.total for p in cliente.historial_pedidos)
-                
-                ws.append([
-                    cliente.identificacion,
-                    cliente.nombre,
-                    cliente.telefono,
-                    total_pedidos,
-                    total_gastado
-                ])
-            
-            # Ajustar el ancho de las columnas
-            for col in ws.columns:
-                max_length = 0
-                column = col[0].column_letter
-                for cell in col:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = (max_length + 2) * 1.2
-                ws.column_dimensions[column].width = adjusted_width
-            
-            # Guardar el archivo
-            wb.save(filename)
-            return True
-            
-        except Exception as e:
-            print(f"Error al exportar a Excel: {e}")
-            return False
-
-class InterfazCafeteria:
-    """Clase para la interfaz gráfica de la cafetería"""
-    def __init__(self, root):
-        self.root = root
-        self.sistema = SistemaPedidos()
-        self.carrito: List[ProductoConExtras] = []
-        self.cliente_actual = None
-        self.empleado_actual = None
-
-        # Configuración de la ventana principal
-        self.root.title("☕ Sistema de Gestión de Pedidos - Cafetería Dulce Aroma")
-        self.root.geometry("1000x700")
-        self.root.resizable(True, True)
-
-        
-        try:
-            # Usar PIL para redimensionar la imagen al tamaño de la ventana
-            original_img = Image.open("E://Programación avanzada//fondo_inicio.jpg")  # Cambia por tu ruta
-            resized_img = original_img.resize((1000, 700), Image.LANCZOS)
-            self.bg_image = ImageTk.PhotoImage(resized_img)
-        except Exception as e:
-            print(f"Error cargando el fondo: {e}. Usando color sólido.")
-            self.bg_image = None
-
-        self.configurar_estilos()
-        self.mostrar_pantalla_inicio()
-    
-    def configurar_estilos(self):
-        """Configura los estilos visuales de la aplicación"""
-        style = ttk.Style()
-        
-        # Configurar tema general
-        style.theme_use('clam')
-        
-        # Configurar colores y fuentes
-        style.configure('.', background=COLORES["fondo"], foreground=COLORES["texto"])
-        style.configure('TFrame', background=COLORES["fondo"])
-        style.configure('TLabel', background=COLORES["fondo"], foreground=COLORES["texto"], font=('Helvetica', 10))
-        style.configure('TButton', background=COLORES["primario"], foreground='white', 
-                       font=('Helvetica', 10, 'bold'), padding=10, borderwidth=0)
-        style.configure('TEntry', fieldbackground='white', foreground=COLORES["texto"])
-        style.configure('TNotebook', background=COLORES["fondo"])
-        style.configure('TNotebook.Tab', background=COLORES["secundario"], foreground='white', 
-                       padding=[10, 5], font=('Helvetica', 10, 'bold'))
-        
-        # Estilos personalizados
-        style.configure('Title.TLabel', font=('Helvetica', 20, 'bold'), foreground=COLORES["primario"])
-        style.configure('Header.TLabel', font=('Helvetica', 14, 'bold'), foreground=COLORES["primario"])
-        style.configure('Success.TLabel', foreground=COLORES["exito"])
-        style.configure('Error.TLabel', foreground=COLORES["error"])
-        
-        # Estilo para botones importantes
-        style.map('Primary.TButton',
-                 background=[('active', COLORES["secundario"]), ('!disabled', COLORES["primario"])],
-                 foreground=[('!disabled', 'white')])
-        
-        # Estilo para botones secundarios
-        style.map('Secondary.TButton',
-                 background=[('active', COLORES["acento"]), ('!disabled', COLORES["secundario"])],
-                 foreground=[('!disabled', 'white')])
-        
-        # Configurar el Listbox
-        self.root.option_add('*Listbox*Background', 'white')
-        self.root.option_add('*Listbox*Foreground', COLORES["texto"])
-        self.root.option_add('*Listbox*selectBackground', COLORES["primario"])
-        self.root.option_add('*Listbox*selectForeground', 'white')
-
-    def limpiar_pantalla(self):
-        """Elimina todos los widgets de la pantalla"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-    def mostrar_pantalla_inicio(self):
-        self.limpiar_pantalla()
-
-        # Crear un Canvas como contenedor principal (para el fondo)
-        canvas = tk.Canvas(self.root, highlightthickness=0)
-        canvas.pack(expand=True, fill=tk.BOTH)
-
-        # Mostrar la imagen de fondo si existe
-        if self.bg_image:
-            canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
-
-        # Frame principal para los widgets (con fondo semitransparente)
-        main_frame = ttk.Frame(canvas, style='TFrame')
-        main_frame.place(relx=0.5, rely=0.5, anchor="center")  # Centrado
-
-        # Logo y título
-        logo_frame = ttk.Frame(main_frame)
-        logo_frame.pack(pady=(20, 10))
-
-        ttk.Label(logo_frame, text="☕", font=('Helvetica', 60), foreground=COLORES["primario"]).pack()
-        ttk.Label(logo_frame, text="Cafetería Dulce Aroma", style="Title.TLabel").pack(pady=10)
-
-        # Botones principales
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(pady=30, fill=tk.X, padx=50)
-
-        ttk.Button(btn_frame, text="Realizar Pedido", command=self.mostrar_identificacion_cliente, 
-              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
-        ttk.Button(btn_frame, text="Ver Pedidos", command=self.mostrar_lista_pedidos, 
-              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
-        ttk.Button(btn_frame, text="Soy Empleado", command=self.mostrar_login_empleado, 
-              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
-        ttk.Button(btn_frame, text="Salir", command=self.root.quit, 
-              style="Secondary.TButton").pack(fill=tk.X, pady=10, ipady=10)
-
-        # Pie de página
-        footer = ttk.Frame(main_frame)
-        footer.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
-        ttk.Label(footer, text="© 2025 Cafetería Dulce Aroma", anchor=tk.CENTER).pack()
-
-    def mostrar_lista_pedidos(self):
-        """Muestra la lista de pedidos del cliente actual"""
-        if not self.cliente_actual:
-            messagebox.showwarning("Error", "Debe identificarse como cliente primero", parent=self.root)
-            self.mostrar_identificacion_cliente()
-            return
-        
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título
-        ttk.Label(
-            main_frame, 
-            text=f"📋 Mis Pedidos - {self.cliente_actual.nombre}", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame contenedor con scroll
-        container = ttk.Frame(main_frame)
-        container.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Layout
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Mostrar pedidos
-        if not self.cliente_actual.historial_pedidos:
-            ttk.Label(
-                scrollable_frame, 
-                text="No hay pedidos registrados", 
-                font=('Helvetica', 12)
-            ).pack(pady=20)
-        else:
-            for pedido in sorted(self.cliente_actual.historial_pedidos, key=lambda p: p.fecha, reverse=True):
-                self.mostrar_resumen_pedido(scrollable_frame, pedido)
-        
-        # Botón volver
-        ttk.Button(
-            main_frame, 
-            text="Volver", 
-            command=self.mostrar_pantalla_inicio,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def mostrar_resumen_pedido(self, parent, pedido: Pedido):
-        """Muestra un resumen del pedido en un frame con opciones adicionales"""
-        pedido_frame = ttk.Frame(
-            parent, 
-            borderwidth=2, 
-            relief="groove", 
-            padding=10
-        )
-        pedido_frame.pack(fill=tk.X, pady=5, padx=5)
-        
-        # Encabezado del pedido
-        estado_color = {
-            "Nuevo": COLORES["info"],
-            "En preparación": COLORES["advertencia"],
-            "Entregado": COLORES["exito"]
-        }.get(pedido.estado, COLORES["texto"])
-        
-        header_frame = ttk.Frame(pedido_frame)
-        header_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        ttk.Label(
-            header_frame, 
-            text=f"Pedido #{pedido.numero} - {pedido.fecha.strftime('%d/%m/%Y %H:%M')}", 
-            font=('Helvetica', 12, 'bold')
-        ).pack(side=tk.LEFT)
-        
-        ttk.Label(
-            header_frame, 
-            text=pedido.estado, 
-            font=('Helvetica', 12, 'bold'),
-            foreground=estado_color
-        ).pack(side=tk.RIGHT)
-        
-        # Productos del pedido
-        productos_frame = ttk.Frame(pedido_frame)
-        productos_frame.pack(fill=tk.X, padx=10)
-        
-        for item in pedido.productos:
-            ttk.Label(
-                productos_frame, 
-                text=f"• {item}", 
-                font=('Helvetica', 10)
-            ).pack(anchor=tk.W, pady=2)
-        
-        # Total del pedido
-        ttk.Label(
-            pedido_frame, 
-            text=f"Total: ${pedido.total:.2f}", 
-            font=('Helvetica', 11, 'bold')
-        ).pack(anchor=tk.E, pady=(5, 0))
-        
-        # Frame para botones de acción
-        btn_frame = ttk.Frame(pedido_frame)
-        btn_frame.pack(pady=(5, 0))
-        
-        # Botón para ver detalles (siempre visible)
-        ttk.Button(
-            btn_frame, 
-            text="Ver Detalles", 
-            command=lambda p=pedido: self.mostrar_detalle_pedido(p),
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        # Botón "Ya lo recibí" solo para pedidos entregados
-        if pedido.estado == "Entregado":
-            ttk.Button(
-                btn_frame, 
-                text="✅ Ya lo recibí", 
-                command=lambda p=pedido: self.confirmar_recepcion(p),
-                style="Success.TButton"
-            ).pack(side=tk.LEFT, padx=5)
-        
-        # Botón para eliminar pedido (visible para todos los estados)
-        ttk.Button(
-            btn_frame, 
-            text="🗑️ Eliminar", 
-            command=lambda p=pedido: self.eliminar_pedido(p),
-            style="Error.TButton"
-        ).pack(side=tk.LEFT, padx=5)
-
-    def confirmar_recepcion(self, pedido: Pedido):
-        """Confirma la recepción de un pedido entregado"""
-        if messagebox.askyesno(
-            "Confirmar recepción", 
-            f"¿Confirmas que has recibido el pedido #{pedido.numero}?", 
-            parent=self.root
-        ):
-            # En un sistema real, aquí podríamos marcar el pedido como recibido
-            # Por ahora simplemente lo eliminaremos
-            self.eliminar_pedido(pedido)
-            messagebox.showinfo(
-                "Confirmado", 
-                f"Pedido #{pedido.numero} marcado como recibido", 
-                parent=self.root
-            )
-
-    def eliminar_pedido(self, pedido: Pedido):
-        """Elimina un pedido del historial del cliente"""
-        if messagebox.askyesno(
-            "Eliminar pedido", 
-            f"¿Estás seguro de eliminar el pedido #{pedido.numero}?\nEsta acción no se puede deshacer.", 
-            parent=self.root
-        ):
-            # Eliminar el pedido del sistema
-            if pedido in self.sistema.pedidos:
-                self.sistema.pedidos.remove(pedido)
-            
-            # Eliminar el pedido del historial del cliente
-            if self.cliente_actual and pedido in self.cliente_actual.historial_pedidos:
-                self.cliente_actual.historial_pedidos.remove(pedido)
-            
-            self.sistema.guardar_datos()
-            messagebox.showinfo(
-                "Éxito", 
-                f"Pedido #{pedido.numero} eliminado correctamente", 
-                parent=self.root
-            )
-            
-            # Actualizar la vista
-            self.mostrar_lista_pedidos()
-
-    def mostrar_detalle_pedido(self, pedido: Pedido):
-        """Muestra el detalle completo de un pedido"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título
-        ttk.Label(
-            main_frame, 
-            text=f"📝 Detalle del Pedido #{pedido.numero}", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame de detalles
-        detalles_frame = ttk.Frame(
-            main_frame, 
-            padding=15, 
-            relief=tk.RAISED, 
-            borderwidth=2
-        )
-        detalles_frame.pack(pady=10, fill=tk.X)
-        
-        # Información del pedido
-        ttk.Label(
-            detalles_frame, 
-            text=f"👤 Cliente: {pedido.cliente.nombre}", 
-            font=('Helvetica', 12)
-        ).pack(anchor=tk.W, pady=5)
-        
-        ttk.Label(
-            detalles_frame, 
-            text=f"📅 Fecha: {pedido.fecha.strftime('%Y-%m-%d %H:%M:%S')}", 
-            font=('Helvetica', 12)
-        ).pack(anchor=tk.W, pady=5)
-        
-        estado_color = {
-            "Nuevo": COLORES["info"],
-            "En preparación": COLORES["advertencia"],
-            "Entregado": COLORES["exito"]
-        }.get(pedido.estado, COLORES["texto"])
-        
-        estado_label = ttk.Label(
-            detalles_frame, 
-            text=f"🔄 Estado: {pedido.estado}", 
-            font=('Helvetica', 12, 'bold'),
-            foreground=estado_color
-        )
-        estado_label.pack(anchor=tk.W, pady=5)
-        
-        # Lista de productos
-        productos_frame = ttk.LabelFrame(
-            main_frame, 
-            text="🍽️ Productos en el Pedido",
-            padding=10
-        )
-        productos_frame.pack(fill=tk.BOTH, pady=10)
-        
-        for item in pedido.productos:
-            producto_frame = ttk.Frame(productos_frame)
-            producto_frame.pack(fill=tk.X, pady=2)
-            
-            ttk.Label(
-                producto_frame, 
-                text=f"• {item.cantidad}x {item.producto.nombre} - ${item.producto.precio:.2f} c/u", 
-                font=('Helvetica', 10, 'bold')
-            ).pack(anchor=tk.W)
-            
-            # Mostrar opciones personalizadas si existen
-            if item.tipo_leche or item.azucar or item.notas:
-                opciones_frame = ttk.Frame(producto_frame, padding=(10, 0))
-                opciones_frame.pack(anchor=tk.W)
-                
-                if item.tipo_leche:
-                    ttk.Label(
-                        opciones_frame, 
-                        text=f"Leche: {item.tipo_leche}", 
-                        font=('Helvetica', 9)
-                    ).pack(side=tk.LEFT, padx=5)
-                
-                if item.azucar:
-                    ttk.Label(
-                        opciones_frame, 
-                        text=f"Azúcar: {item.azucar}", 
-                        font=('Helvetica', 9)
-                    ).pack(side=tk.LEFT, padx=5)
-                
-                if item.notas:
-                    ttk.Label(
-                        opciones_frame, 
-                        text=f"Notas: {item.notas}", 
-                        font=('Helvetica', 9)
-                    ).pack(side=tk.LEFT, padx=5)
-        
-        # Total del pedido
-        ttk.Label(
-            main_frame, 
-            text=f"💰 Total: ${pedido.total:.2f}", 
-            style="Header.TLabel",
-            font=('Helvetica', 14, 'bold')
-        ).pack(anchor=tk.E, pady=10, padx=20)
-        
-        # Botones de acción
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(pady=10)
-        
-        ttk.Button(
-            btn_frame, 
-            text="🔄 Volver al Menú", 
-            command=self.mostrar_menu_productos,
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        ttk.Button(
-            btn_frame, 
-            text="🏠 Volver al Inicio", 
-            command=self.mostrar_pantalla_inicio,
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=5)
-    
-    def mostrar_identificacion_cliente(self):
-        """Muestra la pantalla para identificar al cliente"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título
-        ttk.Label(main_frame, text="Identificación del Cliente", style="Title.TLabel").pack(pady=10)
-        
-        # Frame del formulario
-        form_frame = ttk.Frame(main_frame, padding=20, relief=tk.RAISED, borderwidth=2)
-        form_frame.pack(pady=20, ipadx=20, ipady=20)
-        
-        # Etiqueta y campo de entrada
-        ttk.Label(form_frame, text="Identificación:", font=('Helvetica', 12)).grid(row=0, column=0, pady=10, sticky=tk.W)
-        id_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
-        id_entry.grid(row=0, column=1, pady=10, padx=10)
-        
-        # Botones
-        btn_frame = ttk.Frame(form_frame)
-        btn_frame.grid(row=1, column=0, columnspan=2, pady=20)
-        
-        ttk.Button(btn_frame, text="Buscar", command=lambda: self.buscar_cliente(id_entry.get()), 
-                  style="Primary.TButton").pack(side=tk.LEFT, padx=10)
-        ttk.Button(btn_frame, text="Nuevo Cliente", command=self.mostrar_registro_cliente, 
-                  style="Secondary.TButton").pack(side=tk.LEFT, padx=10)
-        
-        # Botón volver
-        ttk.Button(main_frame, text="Volver", command=self.mostrar_pantalla_inicio, 
-                  style="Secondary.TButton").pack(side=tk.BOTTOM, pady=10)
-    
-    def buscar_cliente(self, id_cliente):
-        """Busca un cliente en el sistema"""
-        if not id_cliente:
-            messagebox.showwarning("Error", "Por favor ingrese una identificación", parent=self.root)
-            return
-        
-        cliente = self.sistema.buscar_cliente(id_cliente)
-        if cliente:
-            self.cliente_actual = cliente
-            messagebox.showinfo("Bienvenido", f"¡Bienvenido/a {cliente.nombre}!", parent=self.root)
-            self.mostrar_menu_productos()
-        else:
-            if messagebox.askyesno("Cliente No Encontrado", 
-                                  "No se encontró el cliente. ¿Desea registrarse?", 
-                                  parent=self.root):
-                self.mostrar_registro_cliente()
-    
-    def mostrar_registro_cliente(self):
-        """Muestra el formulario de registro de cliente"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(main_frame, text="Registro de Cliente", style="Title.TLabel").pack(pady=10)
-        
-        # Frame del formulario
-        form_frame = ttk.Frame(main_frame, padding=20, relief=tk.RAISED, borderwidth=2)
-        form_frame.pack(pady=20, ipadx=20, ipady=20)
-        
-        # Campos del formulario
-        ttk.Label(form_frame, text="Identificación:", font=('Helvetica', 12)).grid(row=0, column=0, pady=10, sticky=tk.W)
-        id_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
-        id_entry.grid(row=0, column=1, pady=10, padx=10)
-        
-        ttk.Label(form_frame, text="Nombre:", font=('Helvetica', 12)).grid(row=1, column=0, pady=10, sticky=tk.W)
-        nombre_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
-        nombre_entry.grid(row=1, column=1, pady=10, padx=10)
-        
-        ttk.Label(form_frame, text="Teléfono:", font=('Helvetica', 12)).grid(row=2, column=0, pady=10, sticky=tk.W)
-        telefono_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
-        telefono_entry.grid(row=2, column=1, pady=10, padx=10)
-        
-        # Botón registrar
-        ttk.Button(form_frame, text="Registrar", 
-                  command=lambda: self.registrar_cliente(
-                      id_entry.get(), nombre_entry.get(), telefono_entry.get()
-                  ), style="Primary.TButton"
-                  ).grid(row=3, column=0, columnspan=2, pady=20, sticky=tk.EW)
-        
-        # Botón volver
-        ttk.Button(main_frame, text="Volver", command=self.mostrar_identificacion_cliente, 
-                  style="Secondary.TButton").pack(side=tk.BOTTOM, pady=10)
-    
-    def registrar_cliente(self, id_cliente, nombre, telefono):
-        """Registra un nuevo cliente en el sistema"""
-        if not id_cliente or not nombre or not telefono:
-            messagebox.showwarning("Error", "Todos los campos son obligatorios", parent=self.root)
-            return
-        
-        if self.sistema.buscar_cliente(id_cliente):
-            messagebox.showwarning("Error", "Ya existe un cliente con esa identificación", parent=self.root)
-            return
-        
-        cliente = self.sistema.registrar_cliente(nombre, telefono, id_cliente)
-        self.cliente_actual = cliente
-        messagebox.showinfo("Éxito", "Cliente registrado correctamente", parent=self.root)
-        self.mostrar_menu_productos()
-    
-    def mostrar_menu_productos(self):
-        """Muestra el menú de productos disponibles"""
-        self.limpiar_pantalla()
-        self.carrito = []
-        
-        main_frame = ttk.Frame(self.root, padding=10)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título y info del cliente
-        ttk.Label(main_frame, text="Menú de Productos", style="Title.TLabel").pack(pady=5)
-        ttk.Label(main_frame, text=f"Cliente: {self.cliente_actual.nombre}", style="Header.TLabel").pack()
-        
-        # Notebook para pestañas de productos
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(expand=True, fill=tk.BOTH, pady=10)
-        
-        # Pestaña Bebidas
-        bebidas_tab = ttk.Frame(notebook)
-        notebook.add(bebidas_tab, text="☕ Bebidas")
-        self.crear_productos_tab(bebidas_tab, self.sistema.inventario.listar_bebidas())
-        
-        # Pestaña Postres
-        postres_tab = ttk.Frame(notebook)
-        notebook.add(postres_tab, text="🍰 Postres")
-        self.crear_productos_tab(postres_tab, self.sistema.inventario.listar_postres())
-        
-        # Frame para carrito
-        carrito_frame = ttk.LabelFrame(main_frame, text="🛒 Carrito de Compras", padding=10)
-        carrito_frame.pack(fill=tk.X, pady=10)
-        
-        # Listbox para el carrito con scrollbar
-        self.carrito_listbox = tk.Listbox(
-            carrito_frame, 
-            height=5, 
-            font=('Helvetica', 10),
-            selectbackground=COLORES["primario"],
-            selectforeground='white'
-        )
-        self.carrito_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        scrollbar = ttk.Scrollbar(carrito_frame, orient=tk.VERTICAL, command=self.carrito_listbox.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.carrito_listbox.config(yscrollcommand=scrollbar.set)
-        
-        # Label para el total
-        self.total_label = ttk.Label(
-            main_frame, 
-            text="Total: $0.00", 
-            style="Header.TLabel",
-            font=('Helvetica', 12, 'bold')
-        )
-        self.total_label.pack(anchor=tk.E, padx=20)
-        
-        # Botones de acción
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(pady=10, fill=tk.X, padx=20)
-        
-        ttk.Button(
-            btn_frame, 
-            text="❌ Eliminar Seleccionado", 
-            command=self.eliminar_del_carrito,
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        ttk.Button(
-            btn_frame, 
-            text="✅ Realizar Pedido", 
-            command=self.finalizar_pedido,
-            style="Primary.TButton"
-        ).pack(side=tk.RIGHT, padx=5)
-        
-        ttk.Button(
-            btn_frame, 
-            text="↩️ Volver", 
-            command=self.mostrar_pantalla_inicio,
-            style="Secondary.TButton"
-        ).pack(side=tk.RIGHT, padx=5)
-    
-    def crear_productos_tab(self, tab, productos):
-        """Crea una pestaña con los productos disponibles"""
-        # Frame contenedor con scroll
-        container = ttk.Frame(tab)
-        container.pack(fill=tk.BOTH, expand=True)
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Layout
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Crear grid de productos
-        row, col = 0, 0
-        max_cols = 3
-        
-        for producto in productos:
-            if producto.stock > 0:
-                producto_frame = ttk.Frame(
-                    scrollable_frame, 
-                    borderwidth=2, 
-                    relief="solid", 
-                    padding=10,
-                    style='TFrame'
-                )
-                
-                # Nombre y precio
-                ttk.Label(
-                    producto_frame, 
-                    text=producto.nombre, 
-                    style="Header.TLabel",
-                    font=('Helvetica', 12, 'bold')
-                ).pack()
-                
-                # "Imagen" (emoji)
-                img_label = ttk.Label(
-                    producto_frame, 
-                    text=producto.imagen if hasattr(producto, 'imagen') and producto.imagen else "☕" if isinstance(producto, Bebida) else "🍰",
-                    font=('Helvetica', 36),
-                    foreground=COLORES["primario"]
-                )
-                img_label.pack(pady=5)
-                
-                # Detalles específicos
-                detalles_frame = ttk.Frame(producto_frame)
-                detalles_frame.pack(fill=tk.X, pady=5)
-                
-                if isinstance(producto, Bebida):
-                    ttk.Label(detalles_frame, text=f"Tamaño: {producto.tamano}").pack(anchor=tk.W)
-                elif isinstance(producto, Postre):
-                    ttk.Label(detalles_frame, text=f"Ingredientes: {producto.mostrar_ingredientes()}").pack(anchor=tk.W)
-                
-                ttk.Label(detalles_frame, text=f"💲 Precio: ${producto.precio:.2f}", font=('Helvetica', 11, 'bold')).pack(anchor=tk.W)
-                ttk.Label(detalles_frame, text=f"📦 Disponible: {producto.stock}", 
-                         foreground=COLORES["exito"] if producto.stock > 5 else COLORES["advertencia"] if producto.stock > 0 else COLORES["error"],
-                         font=('Helvetica', 10)).pack(anchor=tk.W)
-                
-                # Botón agregar con opciones
-                self.crear_boton_agregar(producto_frame, producto)
-                
-                # Posicionamiento en el grid
-                producto_frame.grid(
-                    row=row, 
-                    column=col, 
-                    padx=10, 
-                    pady=10, 
-                    sticky="nsew"
-                )
-                
-                # Configurar columnas para expansión
-                scrollable_frame.columnconfigure(col, weight=1)
-                
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-        
-        # Configurar filas para expansión
-        for r in range(row + 1):
-            scrollable_frame.rowconfigure(r, weight=1)
-    
-    def crear_boton_agregar(self, parent, producto):
-        """Crea el botón de agregar con opciones para el producto"""
-        def mostrar_opciones():
-            opciones_window = tk.Toplevel(self.root)
-            opciones_window.title(f"Opciones para {producto.nombre}")
-            opciones_window.geometry("400x300")
-            opciones_window.resizable(False, False)
-            
-            # Variables para las opciones
-            cantidad = tk.IntVar(value=1)
-            tipo_leche = tk.StringVar(value=TIPOS_LECHE[0] if isinstance(producto, Bebida) else "")
-            nivel_azucar = tk.StringVar(value=NIVELES_AZUCAR[2] if isinstance(producto, Bebida) else "")
-            notas = tk.StringVar()
-            
-            # Frame principal
-            main_frame = ttk.Frame(opciones_window, padding=10)
-            main_frame.pack(expand=True, fill=tk.BOTH)
-            
-            # Cantidad
-            ttk.Label(main_frame, text="Cantidad:").grid(row=0, column=0, sticky=tk.W, pady=5)
-            ttk.Spinbox(main_frame, from_=1, to=10, textvariable=cantidad, width=5).grid(row=0, column=1, sticky=tk.W, pady=5)
-            
-            # Opciones específicas para bebidas
-            if isinstance(producto, Bebida):
-                # Tipo de leche
-                ttk.Label(main_frame, text="Tipo de leche:").grid(row=1, column=0, sticky=tk.W, pady=5)
-                ttk.Combobox(
-                    main_frame, 
-                    textvariable=tipo_leche, 
-                    values=TIPOS_LECHE,
-                    state="readonly"
-                ).grid(row=1, column=1, sticky=tk.W, pady=5)
-                
-                # Nivel de azúcar
-                ttk.Label(main_frame, text="Nivel de azúcar:").grid(row=2, column=0, sticky=tk.W, pady=5)
-                ttk.Combobox(
-                    main_frame, 
-                    textvariable=nivel_azucar, 
-                    values=NIVELES_AZUCAR,
-                    state="readonly"
-                ).grid(row=2, column=1, sticky=tk.W, pady=5)
-            
-            # Notas adicionales
-            ttk.Label(main_frame, text="Notas adicionales:").grid(row=3, column=0, sticky=tk.W, pady=5)
-            ttk.Entry(main_frame, textvariable=notas).grid(row=3, column=1, sticky=tk.W, pady=5)
-            
-            # Botones
-            btn_frame = ttk.Frame(main_frame)
-            btn_frame.grid(row=4, column=0, columnspan=2, pady=10)
-            
-            ttk.Button(
-                btn_frame, 
-                text="Agregar al Carrito", 
-                command=lambda: self.agregar_con_opciones(
-                    producto, 
-                    cantidad.get(),
-                    tipo_leche.get() if isinstance(producto, Bebida) else None,
-                    nivel_azucar.get() if isinstance(producto, Bebida) else None,
-                    notas.get(),
-                    opciones_window
-                ),
-                style="Primary.TButton"
-            ).pack(side=tk.LEFT, padx=5)
-            
-            ttk.Button(
-                btn_frame, 
-                text="Cancelar", 
-                command=opciones_window.destroy,
-                style="Secondary.TButton"
-            ).pack(side=tk.LEFT, padx=5)
-        
-        ttk.Button(
-            parent, 
-            text="➕ Agregar al Carrito", 
-            command=mostrar_opciones,
-            style="Primary.TButton"
-        ).pack(fill=tk.X, pady=5, ipady=5)
-    
-    def agregar_con_opciones(self, producto, cantidad, tipo_leche, azucar, notas, ventana):
-        """Agrega un producto al carrito con las opciones seleccionadas"""
-        if cantidad < 1:
-            messagebox.showwarning("Error", "La cantidad debe ser al menos 1", parent=ventana)
-            return
-        
-        if producto.stock >= cantidad:
-            item = ProductoConExtras(
-                producto=producto,
-                cantidad=cantidad,
-                tipo_leche=tipo_leche,
-                azucar=azucar,
-                notas=notas
-            )
-            self.carrito.append(item)
-            self.actualizar_carrito()
-            ventana.destroy()
-            messagebox.showinfo("Éxito", f"{cantidad}x {producto.nombre} agregado al carrito", parent=self.root)
-        else:
-            messagebox.showwarning("Error", "No hay suficiente stock", parent=ventana)
-    
-    def eliminar_del_carrito(self):
-        """Elimina un producto seleccionado del carrito"""
-        try:
-            seleccion = self.carrito_listbox.curselection()[0]
-            item = self.carrito.pop(seleccion)
-            self.actualizar_carrito()
-        except IndexError:
-            messagebox.showwarning("Error", "Seleccione un producto para eliminar", parent=self.root)
-    
-    def actualizar_carrito(self):
-        """Actualiza la visualización del carrito y el total"""
-        self.carrito_listbox.delete(0, tk.END)
-        total = 0.0
-        
-        for item in self.carrito:
-            self.carrito_listbox.insert(tk.END, str(item))
-            total += item.precio_total
-        
-        self.total_label.config(text=f"Total: ${total:.2f}")
-    
-    def finalizar_pedido(self):
-        """Finaliza el pedido y lo registra en el sistema"""
-        if not self.carrito:
-            messagebox.showwarning("Error", "El carrito está vacío", parent=self.root)
-            return
-        
-        # Crear pedido
-        pedido = self.sistema.crear_pedido(self.cliente_actual.identificacion, self.carrito)
-        
-        if pedido:
-            messagebox.showinfo(
-                "Éxito", 
-                f"Pedido #{pedido.numero} creado con éxito.\nTotal: ${pedido.total:.2f}", 
-                parent=self.root
-            )
-            self.carrito = []
-            self.actualizar_carrito()
-            self.mostrar_detalle_pedido(pedido)
-        else:
-            messagebox.showerror("Error", "No se pudo crear el pedido", parent=self.root)
-    
-    def mostrar_login_empleado(self):
-        """Muestra el formulario de inicio de sesión para empleados"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(
-            main_frame, 
-            text="🔐 Inicio de Sesión para Empleados", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame del formulario
-        form_frame = ttk.Frame(
-            main_frame, 
-            padding=20, 
-            relief=tk.RAISED, 
-            borderwidth=2
-        )
-        form_frame.pack(pady=20, ipadx=20, ipady=20)
-        
-        # Campos del formulario
-        ttk.Label(
-            form_frame, 
-            text="👤 Usuario:", 
-            font=('Helvetica', 12)
-        ).grid(row=0, column=0, pady=10, sticky=tk.W)
-        
-        self.usuario_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30
-        )
-        self.usuario_entry.grid(row=0, column=1, pady=10, padx=10)
-        
-        ttk.Label(
-            form_frame, 
-            text="🔒 Contraseña:", 
-            font=('Helvetica', 12)
-        ).grid(row=1, column=0, pady=10, sticky=tk.W)
-        
-        self.contrasena_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30, 
-            show="*"
-        )
-        self.contrasena_entry.grid(row=1, column=1, pady=10, padx=10)
-        
-        # Botones
-        btn_frame = ttk.Frame(form_frame)
-        btn_frame.grid(row=2, column=0, columnspan=2, pady=20)
-        
-        ttk.Button(
-            btn_frame, 
-            text="Iniciar Sesión", 
-            command=self.validar_empleado,
-            style="Primary.TButton"
-        ).pack(side=tk.LEFT, padx=10)
-        
-        ttk.Button(
-            btn_frame, 
-            text="Volver", 
-            command=self.mostrar_pantalla_inicio,
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=10)
-    
-    def validar_empleado(self):
-        """Valida las credenciales del empleado"""
-        usuario = self.usuario_entry.get()
-        contrasena = self.contrasena_entry.get()
-        
-        empleado = self.sistema.validar_empleado(usuario, contrasena)
-        if empleado:
-            self.empleado_actual = empleado
-            messagebox.showinfo(
-                "Bienvenido", 
-                f"Bienvenido/a {empleado.nombre} ({empleado.puesto})", 
-                parent=self.root
-            )
-            self.mostrar_panel_empleado()
-        else:
-            messagebox.showerror(
-                "Error", 
-                "Usuario o contraseña incorrectos", 
-                parent=self.root
-            )
-    
-    def mostrar_panel_empleado(self):
-        """Muestra el panel de control para empleados"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título
-        ttk.Label(
-            main_frame, 
-            text=f"👨‍💼 Panel de Empleado - {self.empleado_actual.nombre}", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Información del empleado
-        info_frame = ttk.Frame(main_frame, padding=10, relief=tk.RAISED, borderwidth=1)
-        info_frame.pack(pady=10, fill=tk.X)
-        
-        ttk.Label(
-            info_frame, 
-            text=f"Puesto: {self.empleado_actual.puesto}", 
-            font=('Helvetica', 12)
-        ).pack(anchor=tk.W)
-        
-        ttk.Label(
-            info_frame, 
-            text=f"Teléfono: {self.empleado_actual.telefono}", 
-            font=('Helvetica', 12)
-        ).pack(anchor=tk.W)
-        
-        # Botones de acciones
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(pady=20)
-        
-        ttk.Button(
-            btn_frame, 
-            text="➕ Agregar Producto", 
-            command=self.mostrar_agregar_producto,
-            style="Primary.TButton"
-        ).grid(row=0, column=0, padx=5, pady=5, sticky=tk.EW)
-        
-        ttk.Button(
-            btn_frame, 
-            text="📦 Actualizar Stock", 
-            command=self.mostrar_actualizar_stock,
-            style="Primary.TButton"
-        ).grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
-        
-        ttk.Button(
-            btn_frame, 
-            text="📋 Ver Inventario", 
-            command=self.mostrar_inventario,
-            style="Primary.TButton"
-        ).grid(row=1, column=0, padx=5, pady=5, sticky=tk.EW)
-        
-        ttk.Button(
-            btn_frame, 
-            text="📊 Reporte de Ventas", 
-            command=self.mostrar_reporte_ventas,
-            style="Primary.TButton"
-        ).grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
-        
-        ttk.Button(
-            btn_frame, 
-            text="📝 Gestionar Pedidos", 
-            command=self.mostrar_gestion_pedidos,
-            style="Primary.TButton"
-        ).grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky=tk.EW)
-
-        # Botón para exportar clientes a Excel
-        ttk.Button(
-            btn_frame,
-            text="Exportar Clientes a Excel",
-            command=self.exportar_clientes_excel,
-            style="Primary.TButton"
-            ).grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky=tk.EW)
-        
-        # Botón cerrar sesión
-        ttk.Button(
-            main_frame, 
-            text="🚪 Cerrar Sesión", 
-            command=self.cerrar_sesion_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def mostrar_gestion_pedidos(self):
-        """Muestra la interfaz para gestionar pedidos (empleados)"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Título
-        ttk.Label(
-            main_frame, 
-            text="📝 Gestión de Pedidos", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Notebook para pestañas de estados
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(expand=True, fill=tk.BOTH, pady=10)
-        
-        # Pestaña de pedidos nuevos
-        nuevos_tab = ttk.Frame(notebook)
-        notebook.add(nuevos_tab, text="🆕 Nuevos")
-        self.crear_lista_pedidos_empleado(nuevos_tab, "Nuevo")
-        
-        # Pestaña de pedidos en preparación
-        preparacion_tab = ttk.Frame(notebook)
-        notebook.add(preparacion_tab, text="👨‍🍳 En Preparación")
-        self.crear_lista_pedidos_empleado(preparacion_tab, "En preparación")
-        
-        # Pestaña de pedidos entregados
-        entregados_tab = ttk.Frame(notebook)
-        notebook.add(entregados_tab, text="✅ Entregados")
-        self.crear_lista_pedidos_empleado(entregados_tab, "Entregado")
-        
-        # Botón volver
-        ttk.Button(
-            main_frame, 
-            text="Volver", 
-            command=self.mostrar_panel_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def crear_lista_pedidos_empleado(self, parent, estado: str):
-        """Crea una lista de pedidos para el panel de empleados"""
-        # Frame contenedor con scroll
-        container = ttk.Frame(parent)
-        container.pack(fill=tk.BOTH, expand=True)
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Layout
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Obtener pedidos según estado
-        pedidos = self.sistema.listar_pedidos(estado)
-        
-        if not pedidos:
-            ttk.Label(
-                scrollable_frame, 
-                text=f"No hay pedidos {estado.lower()}", 
-                font=('Helvetica', 12)
-            ).pack(pady=20)
-        else:
-            for pedido in pedidos:
-                self.mostrar_pedido_empleado(scrollable_frame, pedido)
-    
-    def mostrar_pedido_empleado(self, parent, pedido: Pedido):
-        """Muestra un pedido en el panel de empleados"""
-        pedido_frame = ttk.Frame(
-            parent, 
-            borderwidth=2, 
-            relief="groove", 
-            padding=10
-        )
-        pedido_frame.pack(fill=tk.X, pady=5, padx=5)
-        
-        # Encabezado del pedido
-        header_frame = ttk.Frame(pedido_frame)
-        header_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        ttk.Label(
-            header_frame, 
-            text=f"Pedido #{pedido.numero} - Cliente: {pedido.cliente.nombre}", 
-            font=('Helvetica', 12, 'bold')
-        ).pack(side=tk.LEFT)
-        
-        ttk.Label(
-            header_frame, 
-            text=f"Fecha: {pedido.fecha.strftime('%d/%m/%Y %H:%M')}", 
-            font=('Helvetica', 10)
-        ).pack(side=tk.RIGHT)
-        
-        # Productos del pedido
-        productos_frame = ttk.Frame(pedido_frame)
-        productos_frame.pack(fill=tk.X, padx=10)
-        
-        for item in pedido.productos:
-            ttk.Label(
-                productos_frame, 
-                text=f"• {item}", 
-                font=('Helvetica', 10)
-            ).pack(anchor=tk.W, pady=2)
-        
-        # Total del pedido
-        ttk.Label(
-            pedido_frame, 
-            text=f"Total: ${pedido.total:.2f}", 
-            font=('Helvetica', 11, 'bold')
-        ).pack(anchor=tk.E, pady=(5, 0))
-        
-        # Botones de acción según estado
-        btn_frame = ttk.Frame(pedido_frame)
-        btn_frame.pack(pady=(5, 0))
-        
-        if pedido.estado == "Nuevo":
-            ttk.Button(
-                btn_frame, 
-                text="Iniciar Preparación", 
-                command=lambda p=pedido: self.procesar_pedido(p),
-                style="Primary.TButton"
-            ).pack(side=tk.LEFT, padx=5)
-        
-        elif pedido.estado == "En preparación":
-            ttk.Button(
-                btn_frame, 
-                text="Marcar como Entregado", 
-                command=lambda p=pedido: self.entregar_pedido(p),
-                style="Primary.TButton"
-            ).pack(side=tk.LEFT, padx=5)
-    
-    def procesar_pedido(self, pedido: Pedido):
-        """Cambia el estado del pedido a 'En preparación'"""
-        if self.sistema.procesar_pedido(pedido.numero, self.empleado_actual.usuario):
-            messagebox.showinfo(
-                "Éxito", 
-                f"Pedido #{pedido.numero} en preparación", 
-                parent=self.root
-            )
-            self.mostrar_gestion_pedidos()
-        else:
-            messagebox.showerror(
-                "Error", 
-                "No se pudo procesar el pedido", 
-                parent=self.root
-            )
-    
-    def entregar_pedido(self, pedido: Pedido):
-        """Marca el pedido como entregado"""
-        if self.sistema.entregar_pedido(pedido.numero, self.empleado_actual.usuario):
-            messagebox.showinfo(
-                "Éxito", 
-                f"Pedido #{pedido.numero} marcado como entregado", 
-                parent=self.root
-            )
-            self.mostrar_gestion_pedidos()
-        else:
-            messagebox.showerror(
-                "Error", 
-                "No se pudo marcar el pedido como entregado", 
-                parent=self.root
-            )
-    
-    def mostrar_agregar_producto(self):
-        """Muestra el formulario para agregar un nuevo producto"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(
-            main_frame, 
-            text="➕ Agregar Producto", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame del formulario
-        form_frame = ttk.Frame(
-            main_frame, 
-            padding=20, 
-            relief=tk.RAISED, 
-            borderwidth=2
-        )
-        form_frame.pack(pady=20, ipadx=20, ipady=20)
-        
-        # Campos del formulario
-        ttk.Label(
-            form_frame, 
-            text="🆔 Código:", 
-            font=('Helvetica', 12)
-        ).grid(row=0, column=0, pady=10, sticky=tk.W)
-        
-        codigo_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30
-        )
-        codigo_entry.grid(row=0, column=1, pady=10, padx=10)
-        
-        ttk.Label(
-            form_frame, 
-            text="📛 Nombre:", 
-            font=('Helvetica', 12)
-        ).grid(row=1, column=0, pady=10, sticky=tk.W)
-        
-        nombre_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30
-        )
-        nombre_entry.grid(row=1, column=1, pady=10, padx=10)
-        
-        ttk.Label(
-            form_frame, 
-            text="💲 Precio:", 
-            font=('Helvetica', 12)
-        ).grid(row=2, column=0, pady=10, sticky=tk.W)
-        
-        precio_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30
-        )
-        precio_entry.grid(row=2, column=1, pady=10, padx=10)
-        
-        ttk.Label(
-            form_frame, 
-            text="📦 Stock:", 
-            font=('Helvetica', 12)
-        ).grid(row=3, column=0, pady=10, sticky=tk.W)
-        
-        stock_entry = ttk.Entry(
-            form_frame, 
-            font=('Helvetica', 12), 
-            width=30
-        )
-        stock_entry.grid(row=3, column=1, pady=10, padx=10)
-        
-        ttk.Label(
-            form_frame, 
-            text="📌 Tipo:", 
-            font=('Helvetica', 12)
-        ).grid(row=4, column=0, pady=10, sticky=tk.W)
-        
-        tipo_var = tk.StringVar(value="Bebida")
-        
-        ttk.Radiobutton(
-            form_frame, 
-            text="☕ Bebida", 
-            variable=tipo_var, 
-            value="Bebida",
-            style='TRadiobutton'
-        ).grid(row=4, column=1, pady=5, sticky=tk.W)
-        
-        ttk.Radiobutton(
-            form_frame, 
-            text="🍰 Postre", 
-            variable=tipo_var, 
-            value="Postre",
-            style='TRadiobutton'
-        ).grid(row=5, column=1, pady=5, sticky=tk.W)
-        
-        # Botones
-        btn_frame = ttk.Frame(form_frame)
-        btn_frame.grid(row=6, column=0, columnspan=2, pady=20)
-        
-        ttk.Button(
-            btn_frame, 
-            text="Agregar", 
-            command=lambda: self.agregar_producto(
-                codigo_entry.get(), 
-                nombre_entry.get(), 
-                precio_entry.get(), 
-                stock_entry.get(), 
-                tipo_var.get()
-            ),
-            style="Primary.TButton"
-        ).pack(side=tk.LEFT, padx=10)
-        
-        ttk.Button(
-            btn_frame, 
-            text="Volver", 
-            command=self.mostrar_panel_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.LEFT, padx=10)
-    
-    def agregar_producto(self, codigo, nombre, precio, stock, tipo):
-        """Agrega un nuevo producto al inventario"""
-        if not codigo or not nombre or not precio or not stock:
-            messagebox.showwarning("Error", "Todos los campos son obligatorios", parent=self.root)
-            return
-        
-        try:
-            precio = float(precio)
-            stock = int(stock)
-            if precio <= 0 or stock < 0:
-                raise ValueError
-        except ValueError:
-            messagebox.showwarning("Error", "Precio y stock deben ser números válidos", parent=self.root)
-            return
-        
-        if tipo == "Bebida":
-            producto = Bebida(codigo, nombre, precio, stock)
-        elif tipo == "Postre":
-            producto = Postre(codigo, nombre, precio, stock)
-        
-        self.sistema.inventario.agregar_producto(producto)
-        self.sistema.guardar_datos()
-        messagebox.showinfo("Éxito", "Producto agregado correctamente", parent=self.root)
-        self.mostrar_panel_empleado()
-    
-    def mostrar_actualizar_stock(self):
-        """Muestra la lista de productos para actualizar stock"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(
-            main_frame, 
-            text="📦 Actualizar Stock", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame contenedor con scroll
-        container = ttk.Frame(main_frame)
-        container.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Layout
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Lista de productos
-        for producto in self.sistema.inventario.listar_productos():
-            producto_frame = ttk.Frame(
-                scrollable_frame, 
-                borderwidth=1, 
-                relief="solid", 
-                padding=10
-            )
-            producto_frame.pack(fill=tk.X, pady=5, padx=5)
-            
-            # Información del producto
-            ttk.Label(
-                producto_frame, 
-                text=f"{producto.nombre} (Código: {producto.codigo})", 
-                font=('Helvetica', 11, 'bold')
-            ).pack(anchor=tk.W)
-            
-            ttk.Label(
-                producto_frame, 
-                text=f"Stock actual: {producto.stock}", 
-                font=('Helvetica', 10)
-            ).pack(anchor=tk.W)
-            
-            # Botón actualizar
-            ttk.Button(
-                producto_frame, 
-                text="Actualizar Stock", 
-                command=lambda p=producto: self.actualizar_stock_producto(p),
-                style="Primary.TButton"
-            ).pack(side=tk.RIGHT, padx=5)
-        
-        # Botón volver
-        ttk.Button(
-            main_frame, 
-            text="Volver", 
-            command=self.mostrar_panel_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def actualizar_stock_producto(self, producto):
-        """Actualiza el stock de un producto específico"""
-        nuevo_stock = simpledialog.askinteger(
-            "Actualizar Stock", 
-            f"Ingrese el nuevo stock para {producto.nombre}:", 
-            parent=self.root,
-            minvalue=0
-        )
-        
-        if nuevo_stock is not None:
-            producto.actualizar_stock(nuevo_stock - producto.stock)
-            self.sistema.guardar_datos()
-            messagebox.showinfo("Éxito", "Stock actualizado correctamente", parent=self.root)
-            self.mostrar_actualizar_stock()
-    
-    def mostrar_inventario(self):
-        """Muestra el inventario completo"""
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(
-            main_frame, 
-            text="📋 Inventario Completo", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame contenedor con scroll
-        container = ttk.Frame(main_frame)
-        container.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Layout
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Lista de productos
-        for producto in self.sistema.inventario.listar_productos():
-            producto_frame = ttk.Frame(
-                scrollable_frame, 
-                borderwidth=1, 
-                relief="solid", 
-                padding=10
-            )
-            producto_frame.pack(fill=tk.X, pady=5, padx=5)
-            
-            # Tipo de producto (icono)
-            tipo_icono = "☕" if isinstance(producto, Bebida) else "🍰"
-            ttk.Label(
-                producto_frame, 
-                text=tipo_icono, 
-                font=('Helvetica', 14)
-            ).pack(side=tk.LEFT, padx=5)
-            
-            # Información del producto
-            info_frame = ttk.Frame(producto_frame)
-            info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-            ttk.Label(
-                info_frame, 
-                text=f"{producto.nombre} (Código: {producto.codigo})", 
-                font=('Helvetica', 11, 'bold')
-            ).pack(anchor=tk.W)
-            
-            ttk.Label(
-                info_frame, 
-                text=f"Precio: ${producto.precio:.2f} | Stock: {producto.stock}", 
-                font=('Helvetica', 10)
-            ).pack(anchor=tk.W)
-            
-            # Detalles específicos
-            if isinstance(producto, Bebida):
-                ttk.Label(
-                    info_frame, 
-                    text=f"Tamaño: {producto.tamano}", 
-                    font=('Helvetica', 10)
-                ).pack(anchor=tk.W)
-            elif isinstance(producto, Postre):
-                ttk.Label(
-                    info_frame, 
-                    text=f"Ingredientes: {producto.mostrar_ingredientes()}", 
-                    font=('Helvetica', 10)
-                ).pack(anchor=tk.W)
-        
-        # Botón volver
-        ttk.Button(
-            main_frame, 
-            text="Volver", 
-            command=self.mostrar_panel_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def mostrar_reporte_ventas(self):
-        """Muestra un reporte de ventas"""
-        reporte = self.sistema.generar_reporte_ventas()
-        
-        self.limpiar_pantalla()
-        
-        main_frame = ttk.Frame(self.root, padding=20)
-        main_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(
-            main_frame, 
-            text="📊 Reporte de Ventas", 
-            style="Title.TLabel"
-        ).pack(pady=10)
-        
-        # Frame de información
-        info_frame = ttk.Frame(
-            main_frame, 
-            padding=15, 
-            relief=tk.RAISED, 
-            borderwidth=2
-        )
-        info_frame.pack(pady=10, fill=tk.X)
-        
-        # Total de ventas
-        ttk.Label(
-            info_frame, 
-            text=f"💰 Total de ventas: ${reporte['total_ventas']:.2f}", 
-            font=('Helvetica', 12, 'bold')
-        ).pack(anchor=tk.W, pady=5)
-        
-        ttk.Label(
-            info_frame, 
-            text=f"📦 Pedidos completados: {reporte['pedidos_completados']}", 
-            font=('Helvetica', 12)
-        ).pack(anchor=tk.W, pady=5)
-        
-        # Productos más vendidos
-        productos_vendidos = sorted(
-            reporte['productos_vendidos'].items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:5]  # Top 5
-        
-        ttk.Label(
-            info_frame, 
-            text="🏆 Productos más vendidos:", 
-            font=('Helvetica', 12, 'bold')
-        ).pack(anchor=tk.W, pady=(15, 5))
-        
-        for codigo, cantidad in productos_vendidos:
-            producto = self.sistema.inventario.obtener_producto(codigo)
-            if producto:
-                ttk.Label(
-                    info_frame, 
-                    text=f"• {producto.nombre}: {cantidad} unidades", 
-                    font=('Helvetica', 11)
-                ).pack(anchor=tk.W, padx=20)
-        
-        # Botón volver
-        ttk.Button(
-            main_frame, 
-            text="Volver", 
-            command=self.mostrar_panel_empleado,
-            style="Secondary.TButton"
-        ).pack(side=tk.BOTTOM, pady=10)
-    
-    def cerrar_sesion_empleado(self):
-        """Cierra la sesión del empleado"""
-        self.empleado_actual = None
-        self.mostrar_pantalla_inicio()
-    
-    def exportar_clientes_excel(self):
-        """Exporta los datos de clientes a un archivo Excel"""
-        if self.sistema.exportar_clientes_excel():
-            messagebox.showinfo(
-                "Éxito",
-                "Datos de clientes exportados correctamente a 'clientes_cafeteria.xlsx'",
-                parent=self.root
-            )
-        else:
-            messagebox.showerror(
-                "Error",
-                "No se pudo exportar los datos. Asegúrate de tener instalado openpyxl (pip install openpyxl)",
-                parent=self.root
-            )
-
-    def cerrar_sesion_empleado(self):
-        """Cierra la sesión del empleado"""
-        self.empleado_actual = None
-        self.mostrar_pantalla_inicio()
-# Iniciar la aplicación
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = InterfazCafeteria(root)
-    root.mainloop()
\ No newline at end of file
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, font
+import argparse
+import asyncio
+import base64
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import copy
+import csv
+import datetime
+import decimal
+import functools
+import json
+from typing import List, Dict, Optional, Tuple
+import os
+import pickle
+import queue
+import socket
+import sqlite3
+import tempfile
+import threading
+import zlib
+from PIL import Image, ImageTk  
+
+# Configuración de colores
+COLORES = {
+    "fondo": "#f8f4e9",  # Beige claro
+    "primario": "#a68a64",  # Café claro
+    "secundario": "#d4b483",  # Café muy claro
+    "acento": "#e8d9c5",  # Beige
+    "texto": "#5a4a3a",  # Café oscuro para texto
+    "exito": "#7cb342",  # Verde claro
+    "error": "#e53935",  # Rojo
+    "advertencia": "#ffb74d",  # Naranja claro
+    "info": "#64b5f6"  # Azul claro
+}
+
+# Las imágenes que acompañan al programa se buscan junto a este archivo
+DIRECTORIO_PROGRAMA = os.path.dirname(os.path.abspath(__file__))
+FONDO_INICIO = os.path.join(DIRECTORIO_PROGRAMA, "fondo_inicio.jpg")
+# Producto.imagen puede ser un emoji o el nombre de un archivo con una de estas extensiones
+EXTENSIONES_IMAGEN = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+# Opciones adicionales para productos
+TIPOS_LECHE = ["Entera", "Deslactosada", "Almendras", "Soya", "Sin leche"]
+NIVELES_AZUCAR = ["Sin azúcar", "Poco", "Normal", "Mucho"]
+# En las líneas de pedido se guarda el índice de la opción (-1 si no hay)
+CODIGOS_LECHE = {nombre: i for i, nombre in enumerate(TIPOS_LECHE)}
+CODIGOS_AZUCAR = {nombre: i for i, nombre in enumerate(NIVELES_AZUCAR)}
+
+# Estados por los que pasa un pedido, en orden
+ESTADOS_PEDIDO = ["Nuevo", "En preparación", "Listo para entrega", "Entregado"]
+
+# Eventos que publica SistemaPedidos y los datos que lleva cada uno
+TIPOS_EVENTO = {
+    "pedido_creado": ("pedido",),
+    "pedido_modificado": ("pedido",),
+    "pedido_eliminado": ("pedido",),
+    "estado_cambiado": ("pedido", "anterior"),
+    "stock_cambiado": ("producto",),
+    "cliente_registrado": ("cliente",),
+}
+
+def a_centimos(importe) -> int:
+    """Convierte un importe en unidades (2.5, "2.50") a céntimos enteros.
+    
+    Solo se usa donde entran importes desde fuera (formularios, datos
+    antiguos); dentro del sistema el dinero siempre va en céntimos.
+    """
+    try:
+        # Se admite la coma decimal de los formularios ("2,50")
+        centimos = decimal.Decimal(str(importe).strip().replace(",", ".")) * 100
+        return int(centimos.quantize(decimal.Decimal(1), rounding=decimal.ROUND_HALF_UP))
+    except (decimal.InvalidOperation, ValueError):
+        raise ValueError(f"Importe no válido: {importe}") from None
+
+def a_unidades(centimos: int) -> float:
+    """Importe en unidades para mostrarlo o exportarlo (250 -> 2.5)"""
+    return centimos / 100
+
+def formatear_dinero(centimos: int) -> str:
+    """Texto de un importe en céntimos (250 -> "$2.50")"""
+    signo = "-" if centimos < 0 else ""
+    unidades, resto = divmod(abs(centimos), 100)
+    return f"{signo}${unidades}.{resto:02d}"
+
+def _codificar_opcion(valor: Optional[str], codigos: Dict[str, int]):
+    """Convierte una opción en su código; un texto desconocido se guarda tal cual"""
+    if valor is None:
+        return -1
+    return codigos.get(valor, valor)
+
+def _decodificar_opcion(codigo, opciones: List[str]) -> Optional[str]:
+    """Convierte un código de opción en su texto"""
+    if isinstance(codigo, str):
+        return codigo
+    return opciones[codigo] if codigo >= 0 else None
+
+class Compacto:
+    """Base de las clases del modelo con __slots__.
+    
+    Sin __dict__ cada objeto ocupa bastante menos, que es lo que importa con
+    cientos de miles de líneas de pedido. Se guardan como una tupla con los
+    campos en orden, y siguen cargando objetos guardados por versiones con __dict__.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def _campos(cls) -> List[str]:
+        """Los slots de la clase y de sus bases, de la base a la subclase"""
+        campos = cls.__dict__.get("_campos_cache")
+        if campos is None:
+            campos = [campo for clase in reversed(cls.__mro__)
+                      for campo in clase.__dict__.get("__slots__", ())]
+            cls._campos_cache = campos
+        return campos
+    
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, campo, None) for campo in self._campos())
+    
+    def __setstate__(self, estado) -> None:
+        if isinstance(estado, dict):
+            # Objeto guardado con __dict__: los nombres antiguos pasan por las propiedades
+            for nombre, valor in estado.items():
+                setattr(self, nombre, valor)
+        else:
+            for campo, valor in zip(self._campos(), estado):
+                setattr(self, campo, valor)
+
+class ProductoConExtras(Compacto):
+    """Clase que representa un producto con sus opciones personalizadas"""
+    __slots__ = ("producto", "cantidad", "codigo_leche", "codigo_azucar", "notas")
+    
+    def __init__(self, producto: 'Producto', cantidad: int = 1, tipo_leche: str = None, 
+                 azucar: str = None, notas: str = ""):
+        self.producto = producto
+        self.cantidad = cantidad
+        self.tipo_leche = tipo_leche
+        self.azucar = azucar
+        self.notas = notas
+    
+    @property
+    def tipo_leche(self) -> Optional[str]:
+        """Tipo de leche elegido"""
+        return _decodificar_opcion(self.codigo_leche, TIPOS_LECHE)
+    
+    @tipo_leche.setter
+    def tipo_leche(self, valor: Optional[str]) -> None:
+        self.codigo_leche = _codificar_opcion(valor, CODIGOS_LECHE)
+    
+    @property
+    def azucar(self) -> Optional[str]:
+        """Nivel de azúcar elegido"""
+        return _decodificar_opcion(self.codigo_azucar, NIVELES_AZUCAR)
+    
+    @azucar.setter
+    def azucar(self, valor: Optional[str]) -> None:
+        self.codigo_azucar = _codificar_opcion(valor, CODIGOS_AZUCAR)
+    
+    @property
+    def precio_total(self) -> int:
+        """Calcula el precio total en céntimos considerando la cantidad"""
+        return self.producto.precio * self.cantidad
+    
+    def __str__(self) -> str:
+        """Formatea la información del producto con extras para mostrar"""
+        detalles = []
+        if self.tipo_leche:
+            detalles.append(f"Leche: {self.tipo_leche}")
+        if self.azucar:
+            detalles.append(f"Azúcar: {self.azucar}")
+        if self.notas:
+            detalles.append(f"Notas: {self.notas}")
+        
+        detalles_str = " - " + ", ".join(detalles) if detalles else ""
+        return f"{self.cantidad}x {self.producto.nombre}{detalles_str} - {formatear_dinero(self.precio_total)}"
+
+class Persona(Compacto):
+    """Clase base para personas"""
+    __slots__ = ("nombre", "telefono")
+    
+    def __init__(self, nombre: str, telefono: str):
+        self.nombre = nombre
+        self.telefono = telefono
+    
+    def contactar(self) -> str:
+        """Método para contactar a la persona"""
+        return f"Contactando a {self.nombre} en {self.telefono}"
+
+class Cliente(Persona):
+    """Clase que representa a un cliente"""
+    __slots__ = ("identificacion", "_historial")
+    
+    def __init__(self, nombre: str, telefono: str, identificacion: str):
+        super().__init__(nombre, telefono)
+        self.identificacion = identificacion
+        # Pedido -> None: conserva el orden de llegada y quitar un pedido no recorre el historial
+        self._historial: Dict["Pedido", None] = {}
+    
+    @property
+    def historial_pedidos(self) -> List["Pedido"]:
+        """Pedidos del cliente en el orden en que se hicieron"""
+        return list(self._historial)
+    
+    @historial_pedidos.setter
+    def historial_pedidos(self, pedidos: List["Pedido"]) -> None:
+        self._historial = dict.fromkeys(pedidos)
+    
+    def __setstate__(self, estado) -> None:
+        super().__setstate__(estado)
+        if isinstance(self._historial, list):
+            # Guardado por una versión que tenía el historial en una lista
+            self._historial = dict.fromkeys(self._historial)
+    
+    def realizar_pedido(self, productos: List[ProductoConExtras], numero: Optional[int] = None) -> "Pedido":
+        """Crea un nuevo pedido para el cliente"""
+        nuevo_pedido = Pedido(self, productos, numero)
+        self._historial[nuevo_pedido] = None
+        return nuevo_pedido
+    
+    def quitar_pedido(self, pedido: "Pedido") -> bool:
+        """Quita un pedido del historial; devuelve si estaba"""
+        if pedido not in self._historial:
+            return False
+        del self._historial[pedido]
+        return True
+    
+    def restaurar_pedido(self, pedido: "Pedido") -> None:
+        """Vuelve a poner en el historial un pedido quitado, en su sitio por número"""
+        self._historial[pedido] = None
+        if any(p.numero > pedido.numero for p in self._historial):
+            self._historial = dict.fromkeys(sorted(self._historial, key=lambda p: p.numero))
+
+class Empleado(Persona):
+    """Clase que representa a un empleado"""
+    __slots__ = ("puesto", "usuario", "contrasena")
+    
+    def __init__(self, nombre: str, telefono: str, puesto: str, usuario: str, contrasena: str):
+        super().__init__(nombre, telefono)
+        self.puesto = puesto
+        self.usuario = usuario
+        self.contrasena = contrasena
+    
+    def procesar_pedido(self, pedido: "Pedido") -> None:
+        """Cambia el estado del pedido a 'En preparación'"""
+        pedido.estado = "En preparación"
+    
+    def entregar_pedido(self, pedido: "Pedido") -> None:
+        """Cambia el estado del pedido a 'Entregado'"""
+        pedido.estado = "Entregado"
+    
+    def actualizar_inventario(self, producto: "Producto", cantidad: int) -> None:
+        """Actualiza el stock de un producto"""
+        producto.stock += cantidad
+
+class ProductoBase(Compacto):
+    """Clase base para productos; el precio va en céntimos"""
+    __slots__ = ("codigo", "nombre", "precio", "stock")
+    
+    def __init__(self, codigo: str, nombre: str, precio: int, stock: int = 0):
+        self.codigo = codigo
+        self.nombre = nombre
+        self.precio = precio
+        self.stock = stock
+    
+    def obtener_precio(self) -> int:
+        """Devuelve el precio del producto en céntimos"""
+        return self.precio
+    
+    def __setstate__(self, estado) -> None:
+        super().__setstate__(estado)
+        if isinstance(self.precio, float):
+            # Guardado por una versión que usaba precios en unidades
+            self.precio = a_centimos(self.precio)
+    
+    def actualizar_stock(self, cantidad: int) -> None:
+        """Actualiza el stock del producto"""
+        self.stock += cantidad
+        if self.stock < 0:
+            self.stock = 0
+
+class Producto(ProductoBase):
+    """Clase para productos generales"""
+    __slots__ = ("descripcion", "imagen")
+    
+    def __init__(self, codigo: str, nombre: str, precio: int, stock: int = 0, descripcion: str = "", imagen: str = None):
+        super().__init__(codigo, nombre, precio, stock)
+        self.descripcion = descripcion
+        self.imagen = imagen
+    
+    def __str__(self) -> str:
+        """Representación en string del producto"""
+        return f"{self.nombre} - {formatear_dinero(self.precio)} ({self.stock} disponibles)"
+
+class Bebida(Producto):
+    """Clase para bebidas"""
+    __slots__ = ("tamano",)
+    
+    def __init__(self, codigo: str, nombre: str, precio: int, stock: int = 0, tamano: str = "Mediano", imagen: str = None):
+        super().__init__(codigo, nombre, precio, stock, "", imagen)
+        self.tamano = tamano
+    
+    def cambiar_tamano(self, nuevo_tamano: str) -> None:
+        """Cambia el tamaño de la bebida"""
+        self.tamano = nuevo_tamano
+
+class Postre(Producto):
+    """Clase para postres"""
+    __slots__ = ("ingredientes",)
+    
+    def __init__(self, codigo: str, nombre: str, precio: int, stock: int = 0, ingredientes: List[str] = None, imagen: str = None):
+        super().__init__(codigo, nombre, precio, stock, "", imagen)
+        self.ingredientes = ingredientes if ingredientes else []
+    
+    def mostrar_ingredientes(self) -> str:
+        """Devuelve los ingredientes como string"""
+        return ", ".join(self.ingredientes)
+
+class Pedido(Compacto):
+    """Clase que representa un pedido"""
+    __slots__ = ("numero", "cliente", "productos", "instante", "estado", "total")
+    # Solo para pedidos creados sin número; SistemaPedidos los numera con SecuenciaPedidos
+    contador_pedidos = 0
+    EPOCA = datetime.datetime(1970, 1, 1)
+    
+    def __init__(self, cliente: Cliente, productos: List[ProductoConExtras], numero: Optional[int] = None):
+        if numero is None:
+            Pedido.contador_pedidos += 1
+            numero = Pedido.contador_pedidos
+        self.numero = numero
+        self.cliente = cliente
+        self.productos = productos.copy()
+        self.fecha = datetime.datetime.now()
+        self.estado = "Nuevo"
+        self.total = self.calcular_total()
+    
+    @property
+    def fecha(self) -> datetime.datetime:
+        """Fecha de creación; se guarda como microsegundos desde 1970 en hora local"""
+        return self.EPOCA + datetime.timedelta(microseconds=self.instante)
+    
+    @fecha.setter
+    def fecha(self, valor: datetime.datetime) -> None:
+        self.instante = (valor - self.EPOCA) // datetime.timedelta(microseconds=1)
+    
+    def __setstate__(self, estado) -> None:
+        super().__setstate__(estado)
+        if isinstance(self.total, float):
+            # Guardado en unidades: se conserva el importe que se cobró
+            self.total = a_centimos(self.total)
+    
+    def calcular_total(self) -> int:
+        """Calcula el total del pedido en céntimos recorriendo todas las líneas"""
+        return sum(item.precio_total for item in self.productos)
+    
+    def agregar_producto(self, producto: ProductoConExtras, posicion: Optional[int] = None) -> None:
+        """Agrega un producto al pedido (al final o en la posición indicada)"""
+        if posicion is None:
+            self.productos.append(producto)
+        else:
+            self.productos.insert(posicion, producto)
+        # El total se ajusta con la diferencia en vez de volver a sumar el pedido
+        self.total += producto.precio_total
+    
+    def eliminar_producto(self, producto: ProductoConExtras) -> bool:
+        """Elimina un producto del pedido"""
+        if producto in self.productos:
+            self.productos.remove(producto)
+            self.total -= producto.precio_total
+            return True
+        return False
+    
+    def actualizar_estado(self, nuevo_estado: str) -> None:
+        """Actualiza el estado del pedido"""
+        self.estado = nuevo_estado
+
+class Carrito:
+    """Productos elegidos por el cliente antes de realizar el pedido.
+    
+    Las líneas iguales (mismo producto, leche, azúcar y notas) se juntan en una
+    sola con más cantidad, y el total y las unidades por producto se ajustan en
+    cada cambio en lugar de recorrer el carrito.
+    """
+    def __init__(self):
+        self.vaciar()
+    
+    def vaciar(self) -> None:
+        """Deja el carrito sin productos"""
+        self.lineas: List[ProductoConExtras] = []
+        self.total = 0
+        self._posiciones: Dict[tuple, int] = {}  # Clave de la línea -> posición
+        self._unidades: Dict[str, int] = {}  # Código de producto -> unidades en el carrito
+    
+    @staticmethod
+    def _clave(item: ProductoConExtras) -> tuple:
+        return (item.producto.codigo, item.codigo_leche, item.codigo_azucar, item.notas)
+    
+    def unidades(self, codigo: str) -> int:
+        """Unidades de un producto que ya hay en el carrito, sumando todas sus líneas"""
+        return self._unidades.get(codigo, 0)
+    
+    def agregar(self, item: ProductoConExtras) -> Tuple[int, bool]:
+        """Agrega un producto; devuelve la posición de su línea y si la línea es nueva"""
+        clave = self._clave(item)
+        posicion = self._posiciones.get(clave)
+        nueva = posicion is None
+        if nueva:
+            posicion = len(self.lineas)
+            self.lineas.append(item)
+            self._posiciones[clave] = posicion
+        else:
+            self.lineas[posicion].cantidad += item.cantidad
+        
+        codigo = item.producto.codigo
+        self._unidades[codigo] = self._unidades.get(codigo, 0) + item.cantidad
+        self.total += item.precio_total
+        return posicion, nueva
+    
+    def quitar(self, posicion: int) -> ProductoConExtras:
+        """Quita la línea de una posición; las posteriores suben un puesto"""
+        item = self.lineas.pop(posicion)
+        del self._posiciones[self._clave(item)]
+        for siguiente in self.lineas[posicion:]:
+            self._posiciones[self._clave(siguiente)] -= 1
+        
+        codigo = item.producto.codigo
+        self._unidades[codigo] -= item.cantidad
+        if not self._unidades[codigo]:
+            del self._unidades[codigo]
+        self.total -= item.precio_total
+        return item
+    
+    def __len__(self) -> int:
+        return len(self.lineas)
+    
+    def __iter__(self):
+        return iter(self.lineas)
+
+class ProcesoBase:
+    """Clase base para procesos"""
+    def __init__(self, fecha: datetime.datetime):
+        self.fecha = fecha
+    
+    def obtener_fecha(self) -> datetime.datetime:
+        """Devuelve la fecha del proceso"""
+        return self.fecha
+
+class ProcesoPedido(ProcesoBase):
+    """Clase para el proceso de preparación de pedidos"""
+    def __init__(self, pedido: Pedido, empleado: Empleado):
+        super().__init__(datetime.datetime.now())
+        self.pedido = pedido
+        self.empleado = empleado
+    
+    def iniciar_proceso(self) -> None:
+        """Inicia el proceso de preparación"""
+        self.pedido.actualizar_estado("En preparación")
+    
+    def finalizar_proceso(self) -> None:
+        """Finaliza el proceso de preparación"""
+        self.pedido.actualizar_estado("Listo para entrega")
+
+class ProcesoEntrega(ProcesoBase):
+    """Clase para el proceso de entrega de pedidos"""
+    def __init__(self, pedido: Pedido, empleado: Empleado):
+        super().__init__(datetime.datetime.now())
+        self.pedido = pedido
+        self.empleado = empleado
+    
+    def entregar(self) -> None:
+        """Marca el pedido como entregado"""
+        self.pedido.actualizar_estado("Entregado")
+    
+    def obtener_detalle(self) -> str:
+        """Devuelve el detalle de la entrega"""
+        return f"Pedido #{self.pedido.numero} entregado por {self.empleado.nombre} en {self.fecha}"
+
+class Inventario:
+    """Clase para gestionar el inventario de productos.
+    
+    Mantiene índices por clase de producto y de productos con stock que se
+    actualizan al agregar productos o cambiar su stock, de modo que los
+    listados del menú no recorren todo el catálogo.
+    
+    Cada producto tiene su propio cerrojo (ver `bloquear`) para que varias
+    terminales puedan comprobar y reservar stock de productos distintos a la vez.
+    """
+    def __init__(self):
+        self.productos: Dict[str, Producto] = {}
+        self._cerrojos: Dict[str, threading.Lock] = {}
+        self._reconstruir_indices()
+    
+    def __getstate__(self) -> dict:
+        """Los índices no se guardan: se reconstruyen al cargar"""
+        return {"productos": self.productos}
+    
+    def __setstate__(self, estado: dict) -> None:
+        """Restaura el inventario (también de versiones sin índices)"""
+        self.productos = estado["productos"]
+        self._cerrojos = {}
+        self._reconstruir_indices()
+    
+    def _reconstruir_indices(self) -> None:
+        """Recalcula los índices a partir de los productos"""
+        self._por_tipo: Dict[type, Dict[str, Producto]] = {}
+        self._disponibles_por_tipo: Dict[type, Dict[str, Producto]] = {}
+        for producto in self.productos.values():
+            self._indexar(producto)
+    
+    def _indexar(self, producto: Producto) -> None:
+        """Añade un producto a los índices"""
+        self._por_tipo.setdefault(type(producto), {})[producto.codigo] = producto
+        self._actualizar_disponibilidad(producto)
+    
+    def _actualizar_disponibilidad(self, producto: Producto) -> None:
+        """Refleja en el índice de disponibles el stock actual del producto"""
+        disponibles = self._disponibles_por_tipo.setdefault(type(producto), {})
+        if producto.stock > 0:
+            disponibles[producto.codigo] = producto
+        else:
+            disponibles.pop(producto.codigo, None)
+    
+    def _cerrojo_producto(self, codigo: str) -> threading.Lock:
+        """Devuelve el cerrojo de un producto, creándolo la primera vez"""
+        cerrojo = self._cerrojos.get(codigo)
+        if cerrojo is None:
+            cerrojo = self._cerrojos.setdefault(codigo, threading.Lock())
+        return cerrojo
+    
+    @contextlib.contextmanager
+    def bloquear(self, codigos):
+        """Adquiere los cerrojos de varios productos, siempre en orden de código para evitar interbloqueos"""
+        cerrojos = [self._cerrojo_producto(codigo) for codigo in sorted(set(codigos))]
+        for cerrojo in cerrojos:
+            cerrojo.acquire()
+        try:
+            yield
+        finally:
+            for cerrojo in reversed(cerrojos):
+                cerrojo.release()
+    
+    def faltante(self, demanda: Dict[str, int]) -> Optional[str]:
+        """Devuelve el código del primer producto sin stock suficiente para la demanda, o None.
+        
+        Para que el resultado siga siendo válido al descontar, hay que llamarlo
+        con los productos de la demanda bloqueados.
+        """
+        for codigo, cantidad in demanda.items():
+            producto = self.productos.get(codigo)
+            if not producto or producto.stock < cantidad:
+                return codigo
+        return None
+    
+    def agregar_producto(self, producto: Producto) -> None:
+        """Agrega un producto al inventario"""
+        anterior = self.productos.get(producto.codigo)
+        if anterior is not None:
+            self._por_tipo[type(anterior)].pop(anterior.codigo, None)
+            self._disponibles_por_tipo[type(anterior)].pop(anterior.codigo, None)
+        self.productos[producto.codigo] = producto
+        self._indexar(producto)
+    
+    def quitar_producto(self, codigo: str) -> None:
+        """Quita un producto del inventario"""
+        producto = self.productos.pop(codigo, None)
+        if producto is not None:
+            self._por_tipo[type(producto)].pop(codigo, None)
+            self._disponibles_por_tipo[type(producto)].pop(codigo, None)
+    
+    def actualizar_stock(self, codigo: str, cantidad: int) -> bool:
+        """Actualiza el stock de un producto"""
+        if codigo in self.productos:
+            producto = self.productos[codigo]
+            producto.actualizar_stock(cantidad)
+            self._actualizar_disponibilidad(producto)
+            return True
+        return False
+    
+    def obtener_producto(self, codigo: str) -> Optional[Producto]:
+        """Obtiene un producto por su código"""
+        return self.productos.get(codigo)
+    
+    def listar_productos(self) -> List[Producto]:
+        """Lista todos los productos"""
+        return list(self.productos.values())
+    
+    def listar_categoria(self, categoria: type, solo_disponibles: bool = False) -> List[Producto]:
+        """Lista los productos de una clase (incluidas sus subclases)"""
+        indice = self._disponibles_por_tipo if solo_disponibles else self._por_tipo
+        resultado = []
+        # Se copian las vistas porque otra terminal puede estar cambiando el stock
+        for tipo, productos in list(indice.items()):
+            if issubclass(tipo, categoria):
+                resultado.extend(list(productos.values()))
+        return resultado
+    
+    def listar_disponibles(self) -> List[Producto]:
+        """Lista los productos con stock disponible"""
+        return self.listar_categoria(ProductoBase, solo_disponibles=True)
+    
+    def listar_bebidas(self, solo_disponibles: bool = False) -> List[Bebida]:
+        """Lista todas las bebidas"""
+        return self.listar_categoria(Bebida, solo_disponibles)
+    
+    def listar_postres(self, solo_disponibles: bool = False) -> List[Postre]:
+        """Lista todos los postres"""
+        return self.listar_categoria(Postre, solo_disponibles)
+
+class SecuenciaPedidos:
+    """Números de pedido persistentes, repartidos en bloques reservados de antemano.
+    
+    Cada bloque se reserva en el almacén (`reservar_numeros`) antes de usar sus
+    números, así que tras un reinicio nunca se repite uno. Dentro del bloque los
+    números se dan en memoria sin tocar el disco; varias terminales o procesos
+    sobre la misma base de datos reservan bloques distintos. Los números de un
+    bloque que no llegó a usarse se pierden, salvo que se devuelvan al cerrar.
+    Si una transacción que reservó un bloque se deshace, la reserva sigue en el
+    almacén (no se devuelve) y el bloque se abandona en memoria: el siguiente
+    número reserva un bloque nuevo, y los del abandonado, incluidos los que usó
+    la transacción, se saltan sin volver a darse.
+    """
+    BLOQUE = 50
+    
+    def __init__(self, sistema: "SistemaPedidos", bloque: int = BLOQUE):
+        self.sistema = sistema
+        self.bloque = bloque
+        self.siguiente = 1  # Próximo número a entregar
+        self.limite = 1     # Primer número fuera del bloque reservado
+        self._cerrojo = threading.Lock()
+    
+    def obtener(self) -> int:
+        """Devuelve un número de pedido nuevo, reservando otro bloque si se acabó el actual"""
+        with self._cerrojo:
+            if self.siguiente >= self.limite:
+                anterior = (self.siguiente, self.limite)
+                inicio = self.sistema.almacen.reservar_numeros(self.sistema, self.bloque, self.siguiente)
+                self.siguiente, self.limite = inicio, inicio + self.bloque
+                self.sistema._al_deshacer(lambda: self._abandonar_bloque(anterior))
+            numero = self.siguiente
+            self.siguiente += 1
+            return numero
+    
+    def _abandonar_bloque(self, anterior: Tuple[int, int]) -> None:
+        """Vuelve al estado previo a reservar; el siguiente número reservará otro bloque"""
+        with self._cerrojo:
+            self.siguiente, self.limite = anterior
+    
+    def asegurar_mayor_que(self, numero: int) -> None:
+        """Evita entregar números iguales o menores que uno ya existente"""
+        with self._cerrojo:
+            if numero >= self.siguiente:
+                self.siguiente = numero + 1
+                self.limite = max(self.limite, self.siguiente)
+    
+    def liberar(self) -> None:
+        """Devuelve al almacén los números sin usar del bloque actual"""
+        with self._cerrojo:
+            if self.siguiente < self.limite:
+                self.sistema.almacen.devolver_numeros(self.sistema, self.siguiente, self.limite)
+                self.limite = self.siguiente
+
+class ErrorDatosCorruptos(Exception):
+    """No se pudo leer ninguna instantánea válida de los datos guardados"""
+    pass
+
+class AlmacenPickle:
+    """Persistencia en un archivo pickle con instantáneas y journal de mutaciones.
+    
+    Cada instantánea se escribe en un archivo temporal, se sincroniza a disco y
+    se renombra de forma atómica, conservando las `GENERACIONES` más recientes
+    (`datos.pkl`, `datos.pkl.1`, ...). El journal guarda los registros
+    posteriores a la generación más antigua, de modo que cualquiera de ellas
+    puede ponerse al día si las más nuevas resultan ilegibles.
+    
+    Tras cada instantánea el journal activo se renombra a un segmento
+    (`datos.journal.<último registro>`) y se empieza uno vacío; los segmentos
+    cuyos registros ya están en todas las generaciones se borran enteros. Así
+    ningún escritor espera a que se reescriba el journal.
+    """
+    LIMITE_JOURNAL = 1000  # Registros en el journal antes de compactar en una instantánea
+    GENERACIONES = 3
+    
+    def __init__(self, ruta_datos: str, ruta_journal: str, usar_journal: bool = True):
+        self.ruta_datos = ruta_datos
+        self.ruta_journal = ruta_journal
+        self.usar_journal = usar_journal
+        self.secuencia_journal = 0  # Número del último registro asignado
+        self.secuencia_escrita = 0  # Número del último registro escrito en el journal
+        self._maximo_activo = 0  # Mayor número de registro escrito en el journal activo
+        self.secuencia_instantanea = 0  # Número del último registro incluido en una instantánea
+        self._cerrojo_journal = threading.Lock()
+        self._cerrojo_instantanea = threading.Lock()
+        self._compactacion: Optional[threading.Thread] = None
+        self.numeros_reservados = 1  # Primer número de pedido sin reservar (ver SecuenciaPedidos)
+    
+    def _ruta_generacion(self, n: int) -> str:
+        """Ruta de la instantánea número n (0 es la más reciente)"""
+        return self.ruta_datos if n == 0 else f"{self.ruta_datos}.{n}"
+    
+    def guardar(self, sistema: "SistemaPedidos") -> None:
+        """Guarda una instantánea completa de forma atómica y recorta el journal"""
+        # Solo la serialización necesita un estado consistente; la escritura va fuera del cerrojo
+        with sistema.cerrojo:
+            secuencia = self.secuencia_journal
+            contenido = pickle.dumps((sistema.inventario, sistema.pedidos, sistema.clientes,
+                                      sistema.empleados, self.numeros_reservados))
+        cabecera = {"secuencia": secuencia, "crc": zlib.crc32(contenido), "longitud": len(contenido)}
+        
+        with self._cerrojo_instantanea:
+            temporal = self.ruta_datos + ".tmp"
+            with open(temporal, 'wb') as f:
+                pickle.dump(cabecera, f)
+                f.write(contenido)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Rotar generaciones: .1 -> .2, actual -> .1, temporal -> actual
+            for n in range(self.GENERACIONES - 1, 0, -1):
+                if os.path.exists(self._ruta_generacion(n - 1)):
+                    os.replace(self._ruta_generacion(n - 1), self._ruta_generacion(n))
+            os.replace(temporal, self.ruta_datos)
+            self._sincronizar_directorio()
+            self.secuencia_instantanea = secuencia
+            self._recortar_journal()
+    
+    def compactar(self, sistema: "SistemaPedidos") -> None:
+        """Integra el journal en una nueva instantánea desde un hilo de fondo"""
+        if self._compactacion and self._compactacion.is_alive():
+            return
+        
+        def tarea():
+            try:
+                self.guardar(sistema)
+            except Exception as e:
+                print(f"Error al compactar los datos: {e}")
+        
+        self._compactacion = threading.Thread(target=tarea, name="Compactacion", daemon=True)
+        self._compactacion.start()
+    
+    def cargar(self, sistema: "SistemaPedidos") -> bool:
+        """Carga la generación válida más reciente y reaplica el journal encima"""
+        errores = []
+        for n in range(self.GENERACIONES):
+            ruta = self._ruta_generacion(n)
+            if not os.path.exists(ruta):
+                continue
+            try:
+                datos, secuencia = self._leer_generacion(ruta)
+            except Exception as e:
+                errores.append(f"{ruta}: {e}")
+                continue
+            sistema.inventario, sistema.pedidos, sistema.clientes, sistema.empleados = datos[:4]
+            self.numeros_reservados = datos[4] if len(datos) > 4 else 1
+            self.secuencia_journal = self.secuencia_escrita = self.secuencia_instantanea = secuencia
+            self.reproducir_journal(sistema)
+            # Los números reservados antes de cerrar no se reutilizan aunque no llegaran a usarse
+            sistema.secuencia.asegurar_mayor_que(self.numeros_reservados - 1)
+            return True
+        
+        # Nunca se sustituyen datos reales por los de demostración
+        if errores:
+            raise ErrorDatosCorruptos("No hay ninguna instantánea válida:\n" + "\n".join(errores))
+        if self._segmentos() or (os.path.exists(self.ruta_journal) and os.path.getsize(self.ruta_journal) > 0):
+            raise ErrorDatosCorruptos(f"Existe {self.ruta_journal} pero falta la instantánea {self.ruta_datos}")
+        
+        sistema.inicializar_datos_demo()
+        self.guardar(sistema)
+        return False
+    
+    def _leer_generacion(self, ruta: str) -> Tuple[tuple, int]:
+        """Lee y valida una instantánea; devuelve sus datos y su número de secuencia"""
+        with open(ruta, 'rb') as f:
+            cabecera = pickle.load(f)
+            if not isinstance(cabecera, dict):
+                # Formato anterior: una sola tupla sin cabecera ni suma de comprobación
+                return cabecera[:4], (cabecera[4] if len(cabecera) > 4 else 0)
+            contenido = f.read()
+        if len(contenido) != cabecera["longitud"] or zlib.crc32(contenido) != cabecera["crc"]:
+            raise ValueError("la suma de comprobación no coincide")
+        return pickle.loads(contenido), cabecera["secuencia"]
+    
+    def _leer_secuencia(self, ruta: str) -> int:
+        """Devuelve el número de secuencia de una instantánea leyendo solo su cabecera"""
+        with open(ruta, 'rb') as f:
+            cabecera = pickle.load(f)
+        if isinstance(cabecera, dict):
+            return cabecera["secuencia"]
+        return cabecera[4] if len(cabecera) > 4 else 0
+    
+    def _sincronizar_directorio(self) -> None:
+        """Asegura en disco los renombrados del directorio de datos (solo POSIX)"""
+        if os.name != "posix":
+            return
+        descriptor = os.open(os.path.dirname(os.path.abspath(self.ruta_datos)), os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+    
+    def _leer_journal(self, f) -> Tuple[list, int]:
+        """Lee los registros válidos de un journal abierto y la posición donde terminan"""
+        registros = []
+        fin_valido = f.tell()
+        while True:
+            try:
+                registros.append(pickle.load(f))
+            except EOFError:
+                break
+            except Exception:
+                # Registro incompleto (p. ej. cierre inesperado a mitad de escritura)
+                break
+            fin_valido = f.tell()
+        return registros, fin_valido
+    
+    def _segmentos(self) -> List[Tuple[int, str]]:
+        """Segmentos cerrados del journal como (último registro, ruta), de más antiguo a más nuevo"""
+        directorio = os.path.dirname(os.path.abspath(self.ruta_journal))
+        prefijo = os.path.basename(self.ruta_journal) + "."
+        segmentos = []
+        for nombre in os.listdir(directorio):
+            if nombre.startswith(prefijo) and nombre[len(prefijo):].isdigit():
+                segmentos.append((int(nombre[len(prefijo):]), os.path.join(directorio, nombre)))
+        return sorted(segmentos)
+    
+    def _recortar_journal(self) -> None:
+        """Cierra el journal activo y borra los segmentos que ya están en todas las generaciones.
+        
+        Con el cerrojo del journal solo se renombra el archivo; el borrado de
+        segmentos se hace fuera, sin hacer esperar a los escritores.
+        """
+        corte = self.secuencia_instantanea
+        for n in range(self.GENERACIONES - 1, 0, -1):
+            try:
+                corte = min(corte, self._leer_secuencia(self._ruta_generacion(n)))
+                break
+            except Exception:
+                # Generación inexistente o ilegible: se mira la siguiente más nueva
+                continue
+        
+        with self._cerrojo_journal:
+            if self._maximo_activo and os.path.exists(self.ruta_journal):
+                os.replace(self.ruta_journal, f"{self.ruta_journal}.{self._maximo_activo}")
+                self._maximo_activo = 0
+        
+        for ultimo, ruta in self._segmentos():
+            if ultimo <= corte:
+                os.remove(ruta)
+        self._sincronizar_directorio()
+    
+    def reproducir_journal(self, sistema: "SistemaPedidos") -> int:
+        """Aplica los registros del journal posteriores a la instantánea cargada"""
+        registros = []
+        for _, ruta in self._segmentos():
+            with open(ruta, 'rb') as f:
+                registros += self._leer_journal(f)[0]
+        if os.path.exists(self.ruta_journal):
+            with open(self.ruta_journal, 'r+b') as f:
+                activos, fin_valido = self._leer_journal(f)
+                # Lo que venga detrás de un registro incompleto se descarta
+                f.truncate(fin_valido)
+            registros += activos
+            self._maximo_activo = max((r[0] for r in activos), default=0)
+        
+        aplicados = 0
+        for secuencia, operacion, datos in registros:
+            if secuencia <= self.secuencia_journal:
+                continue
+            if operacion == "secuencia":
+                self.numeros_reservados = datos[0]
+            else:
+                sistema._aplicar_registro(operacion, datos)
+            self.secuencia_journal = self.secuencia_escrita = secuencia
+            aplicados += 1
+        return aplicados
+    
+    def preparar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple):
+        """Numera una mutación para el journal; None si solo se guardan instantáneas"""
+        if not self.usar_journal:
+            return None
+        self.secuencia_journal += 1
+        return (self.secuencia_journal, operacion, datos)
+    
+    def escribir(self, sistema: "SistemaPedidos", registros: list) -> None:
+        """Añade un lote de registros al journal con una sola sincronización a disco"""
+        if not self.usar_journal:
+            self.guardar(sistema)
+            return
+        
+        with self._cerrojo_journal:
+            with open(self.ruta_journal, 'ab') as f:
+                for registro in registros:
+                    pickle.dump(registro, f)
+                f.flush()
+                os.fsync(f.fileno())
+            self.secuencia_escrita = registros[-1][0]
+            self._maximo_activo = max(self._maximo_activo, max(r[0] for r in registros))
+        
+        if self.secuencia_escrita - self.secuencia_instantanea >= self.LIMITE_JOURNAL:
+            self.compactar(sistema)
+    
+    def registrar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple) -> None:
+        """Persiste una mutación como un registro del journal"""
+        self.escribir(sistema, [self.preparar(sistema, operacion, datos)])
+    
+    def registrar_lote(self, sistema: "SistemaPedidos", mutaciones: List[Tuple[str, tuple]]) -> None:
+        """Persiste varias mutaciones con una sola escritura (o una sola instantánea)"""
+        if mutaciones:
+            self.escribir(sistema, [self.preparar(sistema, operacion, datos) for operacion, datos in mutaciones])
+    
+    def reservar_numeros(self, sistema: "SistemaPedidos", cantidad: int, minimo: int) -> int:
+        """Reserva `cantidad` números de pedido a partir de `minimo` como poco; devuelve el primero.
+        
+        La reserva va al journal como cualquier mutación; se llama con `sistema.cerrojo` adquirido.
+        """
+        inicio = max(self.numeros_reservados, minimo)
+        self.numeros_reservados = inicio + cantidad
+        sistema._registrar("secuencia", self.numeros_reservados)
+        return inicio
+    
+    def devolver_numeros(self, sistema: "SistemaPedidos", desde: int, hasta: int) -> None:
+        """Devuelve los números [desde, hasta) si son los últimos reservados"""
+        if self.numeros_reservados == hasta:
+            self.numeros_reservados = desde
+            sistema._registrar("secuencia", desde)
+    
+    def cerrar(self) -> None:
+        """Espera a que termine una compactación en curso"""
+        if self._compactacion:
+            self._compactacion.join()
+
+class AlmacenSQLite:
+    """Persistencia en una base de datos SQLite con una fila por entidad"""
+    # Los importes (productos.precio, pedidos.total, lineas_pedido.precio) van en céntimos enteros
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS productos (
+            codigo TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            nombre TEXT NOT NULL,
+            precio INTEGER NOT NULL,
+            stock INTEGER NOT NULL,
+            objeto BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS clientes (
+            identificacion TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            telefono TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS empleados (
+            usuario TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            telefono TEXT NOT NULL,
+            puesto TEXT NOT NULL,
+            contrasena TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pedidos (
+            numero INTEGER PRIMARY KEY,
+            cliente_id TEXT NOT NULL REFERENCES clientes(identificacion),
+            fecha TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            total INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS secuencias (
+            nombre TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS lineas_pedido (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pedido INTEGER NOT NULL REFERENCES pedidos(numero),
+            codigo TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            tipo_leche TEXT,
+            azucar TEXT,
+            notas TEXT NOT NULL DEFAULT '',
+            precio INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_pedidos_estado ON pedidos(estado);
+        CREATE INDEX IF NOT EXISTS idx_pedidos_fecha ON pedidos(fecha);
+        CREATE INDEX IF NOT EXISTS idx_pedidos_cliente ON pedidos(cliente_id);
+        CREATE INDEX IF NOT EXISTS idx_lineas_pedido ON lineas_pedido(pedido);
+    """
+    # precio es el precio unitario cobrado, en céntimos, para no reescribir el historial
+    INSERTAR_LINEA = ("INSERT INTO lineas_pedido (pedido, codigo, cantidad, tipo_leche, azucar, notas, precio) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)")
+    
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        # La conexión puede usarse desde el hilo de AlmacenDiferido
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(self.ESQUEMA)
+        # Las transacciones de la conexión no deben mezclarse entre hilos
+        self._cerrojo = threading.Lock()
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos"""
+        self.conexion.close()
+    
+    def guardar(self, sistema: "SistemaPedidos") -> None:
+        """Reescribe todas las tablas con el estado actual del sistema"""
+        with sistema.cerrojo:
+            sentencias = [(f"DELETE FROM {tabla}", ())
+                          for tabla in ("lineas_pedido", "pedidos", "productos", "clientes", "empleados")]
+            for producto in sistema.inventario.listar_productos():
+                sentencias.append(self._sentencia_producto(producto))
+            for c in sistema.clientes.values():
+                sentencias.append(("INSERT INTO clientes VALUES (?, ?, ?)",
+                                   (c.identificacion, c.nombre, c.telefono)))
+            for e in sistema.empleados.values():
+                sentencias.append(("INSERT INTO empleados VALUES (?, ?, ?, ?, ?)",
+                                   (e.usuario, e.nombre, e.telefono, e.puesto, e.contrasena)))
+            for pedido in sistema._pedidos.values():
+                sentencias.extend(self._sentencias_pedido(pedido))
+            # La secuencia no se borra: solo avanza, por si otro proceso ya reservó más
+            sentencias.append(("INSERT INTO secuencias VALUES ('pedidos', ?) ON CONFLICT(nombre) "
+                               "DO UPDATE SET valor = MAX(valor, excluded.valor)",
+                               (sistema.secuencia.limite,)))
+        self.escribir(sistema, [sentencias])
+    
+    def cargar(self, sistema: "SistemaPedidos") -> bool:
+        """Construye el estado del sistema a partir de las tablas"""
+        if not self.conexion.execute("SELECT 1 FROM empleados LIMIT 1").fetchone():
+            sistema.inicializar_datos_demo()
+            self.guardar(sistema)
+            return False
+        
+        for stock, objeto in self.conexion.execute("SELECT stock, objeto FROM productos"):
+            producto = pickle.loads(objeto)
+            producto.stock = stock
+            sistema.inventario.agregar_producto(producto)
+        
+        for identificacion, nombre, telefono in self.conexion.execute("SELECT * FROM clientes"):
+            sistema.clientes[identificacion] = Cliente(nombre, telefono, identificacion)
+        
+        for usuario, nombre, telefono, puesto, contrasena in self.conexion.execute("SELECT * FROM empleados"):
+            sistema.empleados[usuario] = Empleado(nombre, telefono, puesto, usuario, contrasena)
+        
+        lineas: Dict[int, List[ProductoConExtras]] = {}
+        for pedido, codigo, cantidad, tipo_leche, azucar, notas, precio in self.conexion.execute(
+                "SELECT pedido, codigo, cantidad, tipo_leche, azucar, notas, precio "
+                "FROM lineas_pedido ORDER BY id"):
+            item = sistema._crear_item((codigo, cantidad, tipo_leche, azucar, notas))
+            if precio is not None and item.producto is not None and item.producto.precio != precio:
+                # El precio cambió después del pedido: la línea conserva el que se cobró
+                item.producto = copy.copy(item.producto)
+                item.producto.precio = precio
+            lineas.setdefault(pedido, []).append(item)
+        
+        for numero, cliente_id, fecha, estado, total in self.conexion.execute(
+                "SELECT numero, cliente_id, fecha, estado, total FROM pedidos ORDER BY numero"):
+            pedido = sistema.clientes[cliente_id].realizar_pedido(lineas.get(numero, []), numero)
+            pedido.fecha = datetime.datetime.fromisoformat(fecha)
+            pedido.estado = estado
+            # El total es el que se cobró, no se recalcula con los precios actuales
+            pedido.total = total
+            sistema._indexar_pedido(pedido)
+        return True
+    
+    def reservar_numeros(self, sistema: "SistemaPedidos", cantidad: int, minimo: int) -> int:
+        """Reserva `cantidad` números de pedido a partir de `minimo` como poco; devuelve el primero.
+        
+        La reserva se confirma en su propia transacción, independiente de las
+        escrituras pendientes, y BEGIN IMMEDIATE la hace atómica entre procesos.
+        """
+        with self._cerrojo:
+            self.conexion.execute("BEGIN IMMEDIATE")
+            try:
+                fila = self.conexion.execute(
+                    "SELECT valor FROM secuencias WHERE nombre = 'pedidos'").fetchone()
+                if fila is None:
+                    # Base de datos anterior a la secuencia
+                    fila = self.conexion.execute("SELECT COALESCE(MAX(numero), 0) + 1 FROM pedidos").fetchone()
+                inicio = max(fila[0], minimo)
+                self.conexion.execute("INSERT OR REPLACE INTO secuencias VALUES ('pedidos', ?)",
+                                      (inicio + cantidad,))
+                self.conexion.commit()
+            except BaseException:
+                self.conexion.rollback()
+                raise
+        return inicio
+    
+    def devolver_numeros(self, sistema: "SistemaPedidos", desde: int, hasta: int) -> None:
+        """Devuelve los números [desde, hasta) si nadie ha reservado después"""
+        with self._cerrojo, self.conexion:
+            self.conexion.execute("UPDATE secuencias SET valor = ? WHERE nombre = 'pedidos' AND valor = ?",
+                                  (desde, hasta))
+    
+    def preparar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple) -> list:
+        """Traduce una mutación a sentencias de filas sueltas con los valores actuales"""
+        if operacion == "cliente":
+            nombre, telefono, identificacion = datos
+            return [("INSERT OR REPLACE INTO clientes VALUES (?, ?, ?)",
+                     (identificacion, nombre, telefono))]
+        elif operacion == "empleado":
+            nombre, telefono, puesto, usuario, contrasena = datos
+            return [("INSERT OR REPLACE INTO empleados VALUES (?, ?, ?, ?, ?)",
+                     (usuario, nombre, telefono, puesto, contrasena))]
+        elif operacion == "producto":
+            return [self._sentencia_producto(datos[0])]
+        elif operacion == "stock":
+            return self._sentencias_stock(sistema, [datos[0]])
+        elif operacion == "pedido":
+            return (self._sentencias_pedido(sistema.buscar_pedido(datos[0]))
+                    + self._sentencias_stock(sistema, [linea[0] for linea in datos[3]]))
+        elif operacion == "estado":
+            numero, estado = datos
+            return [("UPDATE pedidos SET estado = ? WHERE numero = ?", (estado, numero))]
+        elif operacion == "agregar_linea":
+            numero, linea = datos
+            precio = sistema.inventario.obtener_producto(linea[0]).precio
+            return ([(self.INSERTAR_LINEA, (numero,) + tuple(linea) + (precio,)),
+                     self._sentencia_total(sistema, numero)]
+                    + self._sentencias_stock(sistema, [linea[0]]))
+        elif operacion == "eliminar_linea":
+            numero, codigo = datos
+            return ([("DELETE FROM lineas_pedido WHERE id = "
+                      "(SELECT id FROM lineas_pedido WHERE pedido = ? AND codigo = ? ORDER BY id LIMIT 1)",
+                      (numero, codigo)),
+                     self._sentencia_total(sistema, numero)]
+                    + self._sentencias_stock(sistema, [codigo]))
+        elif operacion == "eliminar_pedido":
+            return [("DELETE FROM lineas_pedido WHERE pedido = ?", datos),
+                    ("DELETE FROM pedidos WHERE numero = ?", datos)]
+        return []
+    
+    def escribir(self, sistema: "SistemaPedidos", registros: list) -> None:
+        """Ejecuta las sentencias de varias mutaciones en una sola transacción"""
+        with self._cerrojo, self.conexion:
+            for sentencias in registros:
+                for sql, parametros in sentencias:
+                    self.conexion.execute(sql, parametros)
+    
+    def registrar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple) -> None:
+        """Aplica una mutación como inserciones/actualizaciones de filas sueltas"""
+        self.escribir(sistema, [self.preparar(sistema, operacion, datos)])
+    
+    def registrar_lote(self, sistema: "SistemaPedidos", mutaciones: List[Tuple[str, tuple]]) -> None:
+        """Aplica varias mutaciones en una sola transacción"""
+        self.escribir(sistema, [self.preparar(sistema, operacion, datos) for operacion, datos in mutaciones])
+    
+    def _sentencia_producto(self, producto: Producto) -> tuple:
+        """Inserta o reemplaza la fila de un producto"""
+        return ("INSERT OR REPLACE INTO productos VALUES (?, ?, ?, ?, ?, ?)",
+                (producto.codigo, type(producto).__name__, producto.nombre, producto.precio,
+                 producto.stock, pickle.dumps(producto)))
+    
+    def _sentencias_pedido(self, pedido: Pedido) -> list:
+        """Inserta la fila de un pedido junto con sus líneas"""
+        sentencias = [("INSERT INTO pedidos VALUES (?, ?, ?, ?, ?)",
+                       (pedido.numero, pedido.cliente.identificacion, pedido.fecha.isoformat(),
+                        pedido.estado, pedido.total))]
+        for item in pedido.productos:
+            sentencias.append((self.INSERTAR_LINEA,
+                               (pedido.numero,) + SistemaPedidos._serializar_item(item)
+                               + (item.producto.precio,)))
+        return sentencias
+    
+    def _sentencia_total(self, sistema: "SistemaPedidos", numero: int) -> tuple:
+        """Sincroniza el total guardado de un pedido"""
+        pedido = sistema.buscar_pedido(numero)
+        return ("UPDATE pedidos SET total = ? WHERE numero = ?", (pedido.total, numero))
+    
+    def _sentencias_stock(self, sistema: "SistemaPedidos", codigos: List[str]) -> list:
+        """Sincroniza el stock guardado de los productos indicados"""
+        return [("UPDATE productos SET stock = ? WHERE codigo = ?",
+                 (sistema.inventario.obtener_producto(codigo).stock, codigo))
+                for codigo in set(codigos)]
+
+class AlmacenDiferido:
+    """Envoltorio que persiste en un hilo de fondo agrupando las escrituras.
+    
+    Las mutaciones solo se encolan; el hilo escribe como mucho un lote por
+    intervalo, así que ante un cierre inesperado se pierden a lo sumo los
+    cambios de los últimos `intervalo` segundos o `max_pendientes` mutaciones.
+    """
+    def __init__(self, almacen, intervalo: float = 2.0, max_pendientes: int = 500):
+        self.almacen = almacen
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self._sistema: Optional["SistemaPedidos"] = None
+        self._pendientes: list = []
+        self._instantanea_pendiente = False
+        self._escritos = 0  # Lotes completados, para que flush() sepa cuándo terminar
+        self._solicitados = 0
+        self._detener = False
+        self.ultimo_error: Optional[Exception] = None
+        self._condicion = threading.Condition()
+        self._hilo = threading.Thread(target=self._bucle, name="AlmacenDiferido", daemon=True)
+    
+    def cargar(self, sistema: "SistemaPedidos") -> bool:
+        """Carga los datos de forma síncrona y arranca el hilo de escritura"""
+        resultado = self.almacen.cargar(sistema)
+        self._sistema = sistema
+        self._hilo.start()
+        return resultado
+    
+    def guardar(self, sistema: "SistemaPedidos") -> None:
+        """Solicita una instantánea completa en el siguiente lote"""
+        with self._condicion:
+            self._instantanea_pendiente = True
+            self._condicion.notify()
+    
+    def registrar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple) -> None:
+        """Encola una mutación sin tocar el disco"""
+        registro = self.almacen.preparar(sistema, operacion, datos)
+        with self._condicion:
+            if registro is None:
+                self._instantanea_pendiente = True
+            else:
+                self._pendientes.append(registro)
+            if len(self._pendientes) >= self.max_pendientes:
+                self._condicion.notify()
+    
+    def registrar_lote(self, sistema: "SistemaPedidos", mutaciones: List[Tuple[str, tuple]]) -> None:
+        """Encola varias mutaciones de una vez"""
+        self.escribir(sistema, [self.almacen.preparar(sistema, operacion, datos) for operacion, datos in mutaciones])
+    
+    def preparar(self, sistema: "SistemaPedidos", operacion: str, datos: tuple):
+        """Prepara una mutación con el almacén subyacente"""
+        return self.almacen.preparar(sistema, operacion, datos)
+    
+    def reservar_numeros(self, sistema: "SistemaPedidos", cantidad: int, minimo: int) -> int:
+        """Reserva números de pedido con el almacén subyacente"""
+        return self.almacen.reservar_numeros(sistema, cantidad, minimo)
+    
+    def devolver_numeros(self, sistema: "SistemaPedidos", desde: int, hasta: int) -> None:
+        """Devuelve números de pedido al almacén subyacente"""
+        self.almacen.devolver_numeros(sistema, desde, hasta)
+    
+    def escribir(self, sistema: "SistemaPedidos", registros: list) -> None:
+        """Encola registros ya preparados"""
+        with self._condicion:
+            if any(registro is None for registro in registros):
+                self._instantanea_pendiente = True
+            self._pendientes.extend(registro for registro in registros if registro is not None)
+            if len(self._pendientes) >= self.max_pendientes:
+                self._condicion.notify()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Bloquea hasta que todo lo encolado esté en disco.
+        
+        No debe llamarse con `sistema.cerrojo` adquirido: el hilo lo necesita para las instantáneas.
+        """
+        with self._condicion:
+            if not self._hilo.is_alive():
+                self._escribir_lote()
+                return self.ultimo_error is None
+            self._solicitados += 1
+            objetivo = self._solicitados
+            self._condicion.notify()
+            terminado = self._condicion.wait_for(lambda: self._escritos >= objetivo, timeout)
+            return terminado and self.ultimo_error is None
+    
+    def cerrar(self) -> None:
+        """Escribe lo pendiente, detiene el hilo y cierra el almacén subyacente"""
+        self.flush()
+        with self._condicion:
+            self._detener = True
+            self._condicion.notify()
+        if self._hilo.is_alive():
+            self._hilo.join()
+        self.almacen.cerrar()
+    
+    def _bucle(self) -> None:
+        """Escribe un lote por intervalo, o antes si se pide flush o hay demasiados pendientes"""
+        with self._condicion:
+            while not self._detener:
+                self._condicion.wait_for(
+                    lambda: (self._detener or self._solicitados > self._escritos
+                             or len(self._pendientes) >= self.max_pendientes),
+                    self.intervalo)
+                self._escribir_lote()
+    
+    def _escribir_lote(self) -> None:
+        """Escribe lo acumulado; se llama con la condición adquirida"""
+        registros, self._pendientes = self._pendientes, []
+        instantanea, self._instantanea_pendiente = self._instantanea_pendiente, False
+        objetivo = self._solicitados
+        # El disco se toca sin la condición para no bloquear a quien encola
+        self._condicion.release()
+        error = None
+        try:
+            if registros:
+                self.almacen.escribir(self._sistema, registros)
+            if instantanea:
+                self.almacen.guardar(self._sistema)
+        except Exception as e:
+            error = e
+            print(f"Error al guardar los datos: {e}")
+        finally:
+            self._condicion.acquire()
+        if error is not None:
+            # Se reintentará en el siguiente lote
+            self._pendientes = registros + self._pendientes
+            self._instantanea_pendiente = self._instantanea_pendiente or instantanea
+        self.ultimo_error = error
+        self._escritos = max(self._escritos, objetivo)
+        self._condicion.notify_all()
+
+def migrar_pickle_a_sqlite(ruta_pickle: str, ruta_sqlite: str, ruta_journal: Optional[str] = None) -> bool:
+    """Copia los datos de un archivo .pkl (y su journal) a una base de datos SQLite"""
+    if not os.path.exists(ruta_pickle):
+        return False
+    
+    if ruta_journal is None:
+        ruta_journal = os.path.splitext(ruta_pickle)[0] + ".journal"
+    sistema = SistemaPedidos(almacen=AlmacenPickle(ruta_pickle, ruta_journal))
+    destino = AlmacenSQLite(ruta_sqlite)
+    try:
+        destino.guardar(sistema)
+    finally:
+        destino.cerrar()
+    return True
+
+class Evento:
+    """Notificación de un cambio en el sistema"""
+    def __init__(self, tipo: str, **datos):
+        if tipo not in TIPOS_EVENTO:
+            raise ValueError(f"Tipo de evento desconocido: {tipo}")
+        self.tipo = tipo
+        self.datos = datos
+
+class BusEventos:
+    """Reparte los eventos del sistema entre sus suscriptores.
+    
+    Los suscriptores se llaman en el hilo que hizo el cambio y con el sistema
+    bloqueado, así que deben ser rápidos; para la interfaz se usa DespachadorTk.
+    """
+    def __init__(self):
+        self._suscriptores: Dict[str, list] = {tipo: [] for tipo in TIPOS_EVENTO}
+        self._cerrojo = threading.Lock()
+    
+    def suscribir(self, tipo: str, funcion) -> None:
+        """Llama a `funcion(evento)` cada vez que se publique un evento de ese tipo"""
+        with self._cerrojo:
+            # Se sustituye la lista para que publicar pueda recorrerla sin cerrojo
+            self._suscriptores[tipo] = self._suscriptores[tipo] + [funcion]
+    
+    def cancelar(self, tipo: str, funcion) -> None:
+        """Deja de avisar a `funcion` de los eventos de ese tipo"""
+        with self._cerrojo:
+            self._suscriptores[tipo] = [f for f in self._suscriptores[tipo] if f != funcion]
+    
+    def publicar(self, tipo: str, **datos) -> None:
+        """Avisa a los suscriptores del tipo de evento"""
+        suscriptores = self._suscriptores[tipo]
+        if not suscriptores:
+            return
+        evento = Evento(tipo, **datos)
+        for funcion in suscriptores:
+            try:
+                funcion(evento)
+            except Exception as e:
+                print(f"Error al notificar el evento {tipo}: {e}")
+
+def mutacion(metodo):
+    """Marca una operación que modifica el sistema.
+    
+    Si otro hilo tiene una transacción abierta, la operación espera a que termine.
+    """
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with self._operacion():
+            return metodo(self, *args, **kwargs)
+    return envoltorio
+
+class SistemaPedidos:
+    """Clase principal del sistema de pedidos"""
+    DATA_FILE = "cafeteria_data.pkl"
+    JOURNAL_FILE = "cafeteria_data.journal"
+    GRANULARIDADES = ("hora", "dia", "mes")
+    CABECERAS_CLIENTES = ["Identificación", "Nombre", "Teléfono", "Total Pedidos", "Total Gastado"]
+    PASO_PROGRESO = 1000  # Filas exportadas entre dos avisos de progreso
+    MAX_VERSIONES = 10000  # Cambios de pedidos que se recuerdan; quien se quede atrás recibe todo
+    
+    def __init__(self, almacen=None, usar_journal: bool = True):
+        self.inventario = Inventario()
+        self._pedidos: Dict[int, Pedido] = {}  # Índice numero -> Pedido en orden de creación
+        # Colas por estado, en el orden en que cada pedido llegó a ese estado
+        self._pedidos_por_estado: Dict[str, Dict[int, Pedido]] = {estado: {} for estado in ESTADOS_PEDIDO}
+        self._reiniciar_ventas()
+        self.clientes: Dict[str, Cliente] = {}
+        self.empleados: Dict[str, Empleado] = {}
+        # Identificación -> [número de pedidos, total gastado], y ancho máximo de cada columna exportada
+        self._totales_clientes: Dict[str, list] = {}
+        self._anchos_clientes: List[int] = [len(c) for c in self.CABECERAS_CLIENTES]
+        # Orden de adquisición de cerrojos: pedido -> productos (por código) -> `cerrojo`.
+        # `cerrojo` protege índices, acumulados y el orden del journal, y solo se retiene
+        # lo justo para aplicar y registrar un cambio; las comprobaciones se hacen antes
+        # con los cerrojos de pedido o de producto, así que operaciones independientes
+        # no se esperan entre sí.
+        self.cerrojo = threading.RLock()
+        self._cerrojos_pedidos: Dict[int, threading.Lock] = {}
+        # Aviso de stock insuficiente; otras terminales pueden sustituirlo (p. ej. por print)
+        self.avisar = messagebox.showwarning
+        # Transacción en curso (ver `transaccion`): hilo dueño, acciones para deshacer
+        # y registros preparados que se escriben al confirmar
+        self._compuerta = threading.Condition()
+        self._operaciones_activas = 0
+        self._dueno_transaccion: Optional[int] = None
+        self._deshacer: list = []
+        self._registros_transaccion: list = []
+        self._deshaciendo = False
+        # Avisos de cambios para las vistas (ver TIPOS_EVENTO)
+        self.eventos = BusEventos()
+        # Versión de los pedidos: sube con cada cambio y recuerda el último de cada pedido,
+        # para que las vistas pidan solo lo cambiado (ver pedidos_cambiados_desde)
+        self.version_pedidos = 0
+        self._versiones_pedidos: "collections.OrderedDict[int, int]" = collections.OrderedDict()
+        self._version_minima = 0  # Última versión olvidada: desde antes ya no se puede dar la diferencia
+        self._cerrojo_versiones = threading.Lock()
+        # Sube cada vez que la cola de entregados cambia de otro modo que añadiendo al final
+        # (un pedido sale de ella o se reemplazan todos); AnaliticaPedidos reconstruye entonces
+        self._version_entregados = 0
+        for tipo in ("pedido_creado", "pedido_modificado", "pedido_eliminado", "estado_cambiado"):
+            self.eventos.suscribir(tipo, self._anotar_cambio_pedido)
+        self.secuencia = SecuenciaPedidos(self)
+        # Por defecto se usa el formato pickle; AlmacenSQLite es la alternativa
+        self.almacen = almacen if almacen is not None else AlmacenPickle(
+            self.DATA_FILE, self.JOURNAL_FILE, usar_journal)
+        self.cargar_datos()
+    
+    def inicializar_datos_demo(self) -> None:
+        """Inicializa datos de demostración"""
+        # Bebidas
+        bebidas = [
+            Bebida("B001", "Café Americano", 250, 50, "Mediano", "☕"),
+            Bebida("B002", "Cappuccino", 350, 30, "Mediano", "☕"),
+            Bebida("B003", "Chocolate Caliente", 300, 25, "Mediano", "☕"),
+            Bebida("B004", "Té Verde", 200, 40, "Mediano", "🍵"),
+            Bebida("B005", "Smoothie de Frutas", 400, 20, "Grande", "🥤"),
+            Bebida("B006", "Mocha", 375, 35, "Mediano", "☕"),
+            Bebida("B007", "Latte", 325, 30, "Grande", "☕"),
+            Bebida("B008", "Té de Manzanilla", 225, 25, "Mediano", "🍵"),
+            Bebida("B009", "Jugo Natural", 350, 20, "Grande", "🧃"),
+            Bebida("B010", "Frappé de Vainilla", 450, 15, "Grande", "🥤")
+        ]
+        
+        # Postres
+        postres = [
+            Postre("P001", "Croissant", 200, 20, ["Harina", "Mantequilla", "Azúcar"], "🥐"),
+            Postre("P002", "Donut", 150, 15, ["Harina", "Azúcar", "Chocolate"], "🍩"),
+            Postre("P003", "Cheesecake", 350, 10, ["Queso crema", "Galleta", "Azúcar"], "🍰"),
+            Postre("P004", "Brownie", 250, 12, ["Chocolate", "Nueces", "Harina"], "🍫"),
+            Postre("P005", "Muffin de Arándanos", 275, 18, ["Harina", "Arándanos", "Azúcar"], "🧁"),
+            Postre("P006", "Tarta de Manzana", 400, 8, ["Manzana", "Masa", "Canela"], "🍎"),
+            Postre("P007", "Galletas de Chocolate", 175, 25, ["Harina", "Chocolate", "Mantequilla"], "🍪"),
+            Postre("P008", "Flan", 300, 12, ["Huevo", "Leche", "Azúcar"], "🍮"),
+            Postre("P009", "Tiramisú", 450, 10, ["Café", "Queso mascarpone", "Bizcochos"], "🍰"),
+            Postre("P010", "Profiteroles", 375, 8, ["Crema", "Masa", "Chocolate"], "🧁")
+        ]
+        
+        # Agregar productos al inventario
+        for bebida in bebidas:
+            self.inventario.agregar_producto(bebida)
+        
+        for postre in postres:
+            self.inventario.agregar_producto(postre)
+        
+        # Agregar empleados
+        empleados = [
+            Empleado("Amanda Sanchez", "555-1234", "Barista", "amanda", "amanda"),
+            Empleado("Carlos Castillo", "555-5678", "Cajero", "carlos", "carlos"),
+            Empleado("Guadalupe Mino", "555-0000", "Administrador", "admin", "admin")
+        ]
+        
+        for empleado in empleados:
+            self.empleados[empleado.usuario] = empleado
+    
+    def guardar_datos(self) -> None:
+        """Guarda una instantánea completa de los datos"""
+        self.almacen.guardar(self)
+    
+    def cargar_datos(self) -> bool:
+        """Carga los datos desde el almacén configurado"""
+        resultado = self.almacen.cargar(self)
+        self._reconstruir_totales_clientes()
+        return resultado
+    
+    def _registrar(self, operacion: str, *datos) -> None:
+        """Persiste una mutación en el almacén configurado"""
+        if self._en_transaccion():
+            # Se prepara ya, con los valores actuales, pero se escribe al confirmar
+            self._registros_transaccion.append(self.almacen.preparar(self, operacion, datos))
+        else:
+            self.almacen.registrar(self, operacion, datos)
+    
+    def _registrar_lote(self, mutaciones: List[Tuple[str, tuple]]) -> None:
+        """Persiste varias mutaciones de una vez en el almacén configurado"""
+        if self._en_transaccion():
+            self._registros_transaccion.extend(self.almacen.preparar(self, operacion, datos)
+                                               for operacion, datos in mutaciones)
+        else:
+            self.almacen.registrar_lote(self, mutaciones)
+    
+    def _en_transaccion(self) -> bool:
+        """Indica si el hilo actual tiene una transacción abierta"""
+        return self._dueno_transaccion == threading.get_ident()
+    
+    def _al_deshacer(self, accion) -> None:
+        """Apunta cómo revertir un cambio si la transacción en curso falla"""
+        if self._en_transaccion() and not self._deshaciendo:
+            self._deshacer.append(accion)
+    
+    @contextlib.contextmanager
+    def _operacion(self):
+        """Cuenta una operación en curso; espera si otro hilo tiene una transacción abierta"""
+        if self._en_transaccion():
+            yield
+            return
+        with self._compuerta:
+            self._compuerta.wait_for(lambda: self._dueno_transaccion is None)
+            self._operaciones_activas += 1
+        try:
+            yield
+        finally:
+            with self._compuerta:
+                self._operaciones_activas -= 1
+                self._compuerta.notify_all()
+    
+    @contextlib.contextmanager
+    def transaccion(self):
+        """Agrupa varias operaciones en un único cambio persistente.
+        
+        Dentro del bloque las operaciones se aplican en memoria y sus registros se
+        escriben de una vez al salir. Si escapa una excepción, los cambios en
+        memoria se revierten y no se escribe nada. Las operaciones de otros hilos
+        esperan a que termine la transacción; se pueden anidar, y una anidada que
+        falla solo revierte lo suyo.
+        """
+        anidada = self._en_transaccion()
+        if not anidada:
+            with self._compuerta:
+                self._compuerta.wait_for(lambda: self._dueno_transaccion is None)
+                self._dueno_transaccion = threading.get_ident()
+                # Se espera a que acaben las operaciones que ya estaban en curso
+                self._compuerta.wait_for(lambda: self._operaciones_activas == 0)
+            # Impide que una instantánea de fondo capture cambios sin confirmar
+            self.cerrojo.acquire()
+        marca_deshacer = len(self._deshacer)
+        marca_registros = len(self._registros_transaccion)
+        try:
+            yield self
+            if not anidada and self._registros_transaccion:
+                self.almacen.escribir(self, self._registros_transaccion)
+        except BaseException:
+            self._deshaciendo = True
+            try:
+                while len(self._deshacer) > marca_deshacer:
+                    self._deshacer.pop()()
+            finally:
+                self._deshaciendo = False
+            del self._registros_transaccion[marca_registros:]
+            raise
+        finally:
+            if not anidada:
+                self._deshacer = []
+                self._registros_transaccion = []
+                self.cerrojo.release()
+                with self._compuerta:
+                    self._dueno_transaccion = None
+                    self._compuerta.notify_all()
+    
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y libera el almacén; llamar al salir de la aplicación"""
+        with self.cerrojo:
+            self.secuencia.liberar()
+        self.almacen.cerrar()
+    
+    def _aplicar_registro(self, operacion: str, datos: tuple) -> None:
+        """Reaplica una mutación leída del journal"""
+        if operacion == "cliente":
+            nombre, telefono, identificacion = datos
+            self.clientes[identificacion] = Cliente(nombre, telefono, identificacion)
+        elif operacion == "empleado":
+            nombre, telefono, puesto, usuario, contrasena = datos
+            self.empleados[usuario] = Empleado(nombre, telefono, puesto, usuario, contrasena)
+        elif operacion == "producto":
+            self.inventario.agregar_producto(datos[0])
+        elif operacion == "stock":
+            codigo, stock = datos
+            producto = self.inventario.obtener_producto(codigo)
+            if producto:
+                self.inventario.actualizar_stock(codigo, stock - producto.stock)
+        elif operacion == "pedido":
+            numero, cliente_id, fecha, lineas = datos
+            cliente = self.buscar_cliente(cliente_id)
+            if not cliente:
+                return
+            items = [self._crear_item(linea) for linea in lineas]
+            for item in items:
+                self.inventario.actualizar_stock(item.producto.codigo, -item.cantidad)
+            pedido = cliente.realizar_pedido(items, numero)
+            pedido.fecha = fecha
+            self._indexar_pedido(pedido)
+        elif operacion == "estado":
+            numero, estado = datos
+            pedido = self.buscar_pedido(numero)
+            if pedido:
+                self._cambiar_estado(pedido, lambda: pedido.actualizar_estado(estado))
+        elif operacion == "agregar_linea":
+            numero, linea = datos
+            pedido = self.buscar_pedido(numero)
+            if pedido:
+                item = self._crear_item(linea)
+                pedido.agregar_producto(item)
+                self.inventario.actualizar_stock(item.producto.codigo, -item.cantidad)
+        elif operacion == "eliminar_linea":
+            numero, codigo = datos
+            pedido = self.buscar_pedido(numero)
+            if pedido:
+                for p in pedido.productos:
+                    if p.producto.codigo == codigo and pedido.eliminar_producto(p):
+                        self.inventario.actualizar_stock(codigo, p.cantidad)
+                        break
+        elif operacion == "eliminar_pedido":
+            pedido = self.buscar_pedido(datos[0])
+            if pedido:
+                self._quitar_pedido(pedido)
+    
+    @staticmethod
+    def _serializar_item(item: ProductoConExtras) -> tuple:
+        """Convierte una línea de pedido en una tupla apta para el journal"""
+        return (item.producto.codigo, item.cantidad, item.tipo_leche, item.azucar, item.notas)
+    
+    def _crear_item(self, linea: tuple) -> ProductoConExtras:
+        """Reconstruye una línea de pedido a partir de su tupla serializada"""
+        codigo, cantidad, tipo_leche, azucar, notas = linea
+        return ProductoConExtras(self.inventario.obtener_producto(codigo), cantidad,
+                                 tipo_leche, azucar, notas)
+    
+    @property
+    def pedidos(self) -> List[Pedido]:
+        """Copia de todos los pedidos en orden de creación; dentro de la clase se recorre `_pedidos`"""
+        return list(self._pedidos.values())
+    
+    @pedidos.setter
+    def pedidos(self, pedidos: List[Pedido]) -> None:
+        """Reemplaza los pedidos (p. ej. al cargar) y reconstruye el índice por número"""
+        self._pedidos = {}
+        self._pedidos_por_estado = {estado: {} for estado in ESTADOS_PEDIDO}
+        self._version_entregados += 1
+        self._reiniciar_ventas()
+        # Versiones anteriores reiniciaban el contador al arrancar y podían repetir números;
+        # los duplicados se renumeran para que el índice no pierda pedidos
+        ultimo = max([0] + [p.numero for p in pedidos])
+        for pedido in pedidos:
+            if pedido.numero in self._pedidos:
+                ultimo += 1
+                pedido.numero = ultimo
+            self._pedidos[pedido.numero] = pedido
+            self._pedidos_por_estado.setdefault(pedido.estado, {})[pedido.numero] = pedido
+            if pedido.estado == "Entregado":
+                self._acumular_ventas(pedido, 1)
+        self.secuencia.asegurar_mayor_que(ultimo)
+    
+    def _indexar_pedido(self, pedido: Pedido) -> None:
+        """Añade un pedido al sistema y al índice por número"""
+        self._pedidos[pedido.numero] = pedido
+        self._pedidos_por_estado.setdefault(pedido.estado, {})[pedido.numero] = pedido
+        if pedido.estado == "Entregado":
+            self._acumular_ventas(pedido, 1)
+        # Evita que los pedidos nuevos reutilicen números de pedidos cargados
+        self.secuencia.asegurar_mayor_que(pedido.numero)
+        self._al_deshacer(lambda: self._quitar_pedido(pedido))
+        self.eventos.publicar("pedido_creado", pedido=pedido)
+    
+    def _cerrojo_pedido(self, numero_pedido: int) -> threading.Lock:
+        """Devuelve el cerrojo de un pedido, creándolo la primera vez"""
+        cerrojo = self._cerrojos_pedidos.get(numero_pedido)
+        if cerrojo is None:
+            cerrojo = self._cerrojos_pedidos.setdefault(numero_pedido, threading.Lock())
+        return cerrojo
+    
+    @staticmethod
+    def _demanda(productos: List[ProductoConExtras]) -> Dict[str, int]:
+        """Suma las cantidades pedidas de cada producto"""
+        demanda: Dict[str, int] = {}
+        for item in productos:
+            demanda[item.producto.codigo] = demanda.get(item.producto.codigo, 0) + item.cantidad
+        return demanda
+    
+    def buscar_pedido(self, numero_pedido: int) -> Optional[Pedido]:
+        """Busca un pedido por su número"""
+        return self._pedidos.get(numero_pedido)
+    
+    def _quitar_pedido(self, pedido: Pedido) -> None:
+        """Quita un pedido del sistema y del historial de su cliente"""
+        self._pedidos.pop(pedido.numero, None)
+        if self._pedidos_por_estado.get(pedido.estado, {}).pop(pedido.numero, None) and pedido.estado == "Entregado":
+            self._acumular_ventas(pedido, -1)
+            self._version_entregados += 1
+        self._cerrojos_pedidos.pop(pedido.numero, None)
+        cliente = pedido.cliente
+        if cliente.quitar_pedido(pedido):
+            self._al_deshacer(lambda: cliente.restaurar_pedido(pedido))
+        self._al_deshacer(lambda: self._restaurar_pedido(pedido))
+        self.eventos.publicar("pedido_eliminado", pedido=pedido)
+    
+    def _restaurar_pedido(self, pedido: Pedido) -> None:
+        """Vuelve a indexar un pedido quitado conservando el orden por número"""
+        self._indexar_pedido(pedido)
+        if max(self._pedidos) != pedido.numero:
+            self._pedidos = dict(sorted(self._pedidos.items()))
+    
+    def _cambiar_estado(self, pedido: Pedido, transicion) -> None:
+        """Ejecuta una transición de estado y mueve el pedido a la cola correspondiente"""
+        anterior = pedido.estado
+        transicion()
+        self._al_deshacer(lambda: self._cambiar_estado(pedido, lambda: pedido.actualizar_estado(anterior)))
+        if pedido.estado != anterior:
+            self._pedidos_por_estado.get(anterior, {}).pop(pedido.numero, None)
+            self._pedidos_por_estado.setdefault(pedido.estado, {})[pedido.numero] = pedido
+            if anterior == "Entregado":
+                self._acumular_ventas(pedido, -1)
+                self._version_entregados += 1
+            elif pedido.estado == "Entregado":
+                self._acumular_ventas(pedido, 1)
+            self.eventos.publicar("estado_cambiado", pedido=pedido, anterior=anterior)
+    
+    def _reconstruir_totales_clientes(self) -> None:
+        """Recalcula los totales por cliente; después se mantienen de forma incremental"""
+        self._totales_clientes = {}
+        self._anchos_clientes = [len(c) for c in self.CABECERAS_CLIENTES]
+        for cliente in self.clientes.values():
+            self._ajustar_totales_cliente(cliente, len(cliente._historial),
+                                          sum(p.total for p in cliente._historial))
+    
+    def _ajustar_totales_cliente(self, cliente: Cliente, pedidos: int, gastado: int) -> None:
+        """Suma al número de pedidos y al gasto (en céntimos) de un cliente y amplía los anchos de columna"""
+        totales = self._totales_clientes.setdefault(cliente.identificacion, [0, 0])
+        totales[0] += pedidos
+        totales[1] += gastado
+        self._al_deshacer(lambda: self._ajustar_totales_cliente(cliente, -pedidos, -gastado))
+        fila = (cliente.identificacion, cliente.nombre, cliente.telefono, totales[0], a_unidades(totales[1]))
+        # Los anchos solo crecen: como mucho una columna queda algo más ancha de lo necesario
+        self._anchos_clientes = [max(ancho, len(str(valor)))
+                                 for ancho, valor in zip(self._anchos_clientes, fila)]
+    
+    def _cambiar_stock(self, codigo: str, cantidad: int) -> bool:
+        """Cambia el stock de un producto apuntando cómo revertirlo"""
+        producto = self.inventario.obtener_producto(codigo)
+        if producto is None:
+            return False
+        anterior = producto.stock
+        self.inventario.actualizar_stock(codigo, cantidad)
+        # El stock no baja de cero, así que se revierte la diferencia real
+        self._al_deshacer(lambda: self._cambiar_stock(codigo, anterior - producto.stock))
+        self.eventos.publicar("stock_cambiado", producto=producto)
+        return True
+    
+    def _reiniciar_ventas(self) -> None:
+        """Pone a cero los acumulados de ventas"""
+        # Los importes van en céntimos, así que las sumas son exactas
+        self._total_ventas = 0
+        self._pedidos_completados = 0
+        self._unidades_vendidas: Dict[str, int] = {}
+        self._ingresos_producto: Dict[str, int] = {}
+        # Por granularidad: inicio del intervalo -> [ingresos, unidades, pedidos], y sus claves ordenadas
+        self._rollups: Dict[str, Dict[datetime.datetime, list]] = {g: {} for g in self.GRANULARIDADES}
+        self._claves_rollup: Dict[str, List[datetime.datetime]] = {g: [] for g in self.GRANULARIDADES}
+    
+    def _acumular_ventas(self, pedido: Pedido, signo: int) -> None:
+        """Suma (signo 1) o resta (signo -1) un pedido entregado de los acumulados de ventas"""
+        self._total_ventas += signo * pedido.total
+        self._pedidos_completados += signo
+        for item in pedido.productos:
+            codigo = item.producto.codigo
+            unidades = self._unidades_vendidas.get(codigo, 0) + signo * item.cantidad
+            if unidades:
+                self._unidades_vendidas[codigo] = unidades
+                self._ingresos_producto[codigo] = self._ingresos_producto.get(codigo, 0) + signo * item.precio_total
+            else:
+                self._unidades_vendidas.pop(codigo, None)
+                self._ingresos_producto.pop(codigo, None)
+        
+        unidades = sum(item.cantidad for item in pedido.productos)
+        for granularidad, rollup in self._rollups.items():
+            inicio = self._truncar_fecha(pedido.fecha, granularidad)
+            acumulado = rollup.get(inicio)
+            if acumulado is None:
+                acumulado = rollup[inicio] = [0, 0, 0]
+                bisect.insort(self._claves_rollup[granularidad], inicio)
+            acumulado[0] += signo * pedido.total
+            acumulado[1] += signo * unidades
+            acumulado[2] += signo
+            if acumulado[2] == 0:
+                del rollup[inicio]
+                claves = self._claves_rollup[granularidad]
+                del claves[bisect.bisect_left(claves, inicio)]
+    
+    @staticmethod
+    def _truncar_fecha(fecha: datetime.datetime, granularidad: str) -> datetime.datetime:
+        """Devuelve el inicio de la hora, día o mes que contiene la fecha"""
+        if granularidad == "hora":
+            return fecha.replace(minute=0, second=0, microsecond=0)
+        if granularidad == "dia":
+            return fecha.replace(hour=0, minute=0, second=0, microsecond=0)
+        return fecha.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    def validar_empleado(self, usuario: str, contrasena: str) -> Optional[Empleado]:
+        """Valida las credenciales de un empleado"""
+        if usuario in self.empleados and self.empleados[usuario].contrasena == contrasena:
+            return self.empleados[usuario]
+        return None
+    
+    @mutacion
+    def registrar_cliente(self, nombre: str, telefono: str, identificacion: str) -> Optional[Cliente]:
+        """Registra un nuevo cliente; devuelve None si ya existe uno con esa identificación"""
+        nuevo_cliente = Cliente(nombre, telefono, identificacion)
+        with self.cerrojo:
+            # Sustituirlo dejaría su historial y sus totales acumulados a nombre de otro
+            if identificacion in self.clientes:
+                return None
+            self.clientes[identificacion] = nuevo_cliente
+            self._al_deshacer(lambda: self._totales_clientes.pop(identificacion, None))
+            self._al_deshacer(lambda: self.clientes.pop(identificacion, None))
+            self._ajustar_totales_cliente(nuevo_cliente, 0, 0)
+            self._registrar("cliente", nombre, telefono, identificacion)
+            self.eventos.publicar("cliente_registrado", cliente=nuevo_cliente)
+        return nuevo_cliente
+    
+    def buscar_cliente(self, identificacion: str) -> Optional[Cliente]:
+        """Busca un cliente por su identificación"""
+        return self.clientes.get(identificacion)
+    
+    def historial_cliente(self, identificacion: str) -> List[Pedido]:
+        """Devuelve los pedidos de un cliente (vacío si no existe)"""
+        cliente = self.clientes.get(identificacion)
+        return list(cliente.historial_pedidos) if cliente else []
+    
+    @mutacion
+    def crear_pedido(self, cliente_id: str, productos: List[ProductoConExtras]) -> Optional[Pedido]:
+        """Crea un nuevo pedido.
+        
+        La comprobación y el descuento del stock son atómicos: se hacen con los
+        productos del pedido bloqueados, así que dos terminales no pueden vender
+        las mismas unidades.
+        """
+        cliente = self.buscar_cliente(cliente_id)
+        if not cliente:
+            return None
+        
+        demanda = self._demanda(productos)
+        with self.inventario.bloquear(demanda):
+            # Verificar stock antes de crear el pedido (sumando las líneas del mismo producto)
+            sin_stock = self.inventario.faltante(demanda)
+            
+            if sin_stock is None:
+                with self.cerrojo:
+                    # Descontar el stock
+                    for codigo, cantidad in demanda.items():
+                        self._cambiar_stock(codigo, -cantidad)
+                    
+                    pedido = cliente.realizar_pedido(productos, self.secuencia.obtener())
+                    self._indexar_pedido(pedido)
+                    self._ajustar_totales_cliente(cliente, 1, pedido.total)
+                    self._registrar("pedido", pedido.numero, cliente_id, pedido.fecha,
+                                    [self._serializar_item(item) for item in pedido.productos])
+                return pedido
+        
+        nombre = next(item.producto.nombre for item in productos if item.producto.codigo == sin_stock)
+        self.avisar("Error", f"No hay suficiente stock de {nombre}")
+        return None
+    
+    @mutacion
+    def crear_pedidos_lote(self, lote: List[Tuple[str, List[ProductoConExtras]]]) -> List[Optional[Pedido]]:
+        """Crea varios pedidos (cliente_id, productos) a la vez con una sola escritura.
+        
+        El stock se valida contra la demanda sumada de todo el lote. Si no alcanza
+        para todo, los pedidos se aceptan en orden mientras quede stock. Devuelve,
+        para cada entrada, el pedido creado o None si el cliente no existe o falta stock.
+        """
+        demandas = [self._demanda(productos) for _, productos in lote]
+        total: Dict[str, int] = {}
+        for demanda in demandas:
+            for codigo, cantidad in demanda.items():
+                total[codigo] = total.get(codigo, 0) + cantidad
+        
+        resultados: List[Optional[Pedido]] = [None] * len(lote)
+        with self.inventario.bloquear(total):
+            # Caso habitual: el lote entero cabe y no hace falta comprobar pedido a pedido
+            cabe_todo = self.inventario.faltante(total) is None
+            restante = {codigo: producto.stock for codigo in total
+                        if (producto := self.inventario.obtener_producto(codigo))}
+            aceptados = []
+            vendido: Dict[str, int] = {}
+            for i, ((cliente_id, productos), demanda) in enumerate(zip(lote, demandas)):
+                cliente = self.buscar_cliente(cliente_id)
+                if not cliente:
+                    continue
+                if not cabe_todo:
+                    if any(restante.get(codigo, 0) < cantidad for codigo, cantidad in demanda.items()):
+                        continue
+                    for codigo, cantidad in demanda.items():
+                        restante[codigo] -= cantidad
+                for codigo, cantidad in demanda.items():
+                    vendido[codigo] = vendido.get(codigo, 0) + cantidad
+                aceptados.append((i, cliente, productos))
+            
+            mutaciones = []
+            with self.cerrojo:
+                # Descontar el stock de todos los pedidos aceptados
+                for codigo, cantidad in vendido.items():
+                    self._cambiar_stock(codigo, -cantidad)
+                for i, cliente, productos in aceptados:
+                    pedido = cliente.realizar_pedido(productos, self.secuencia.obtener())
+                    self._indexar_pedido(pedido)
+                    self._ajustar_totales_cliente(cliente, 1, pedido.total)
+                    mutaciones.append(("pedido", (pedido.numero, cliente.identificacion, pedido.fecha,
+                                                  [self._serializar_item(item) for item in pedido.productos])))
+                    resultados[i] = pedido
+                self._registrar_lote(mutaciones)
+        return resultados
+    
+    def listar_pedidos(self, estado: Optional[str] = None) -> List[Pedido]:
+        """Lista los pedidos según su estado"""
+        if estado:
+            return list(self._pedidos_por_estado.get(estado, {}).values())
+        return list(self._pedidos.values())
+    
+    def _anotar_cambio_pedido(self, evento: Evento) -> None:
+        """Da una versión nueva al pedido del evento y lo pone el último de la lista de cambios"""
+        numero = evento.datos["pedido"].numero
+        with self._cerrojo_versiones:
+            self.version_pedidos += 1
+            self._versiones_pedidos[numero] = self.version_pedidos
+            self._versiones_pedidos.move_to_end(numero)
+            # Se olvidan los cambios más antiguos, incluidos los de pedidos ya eliminados
+            while len(self._versiones_pedidos) > self.MAX_VERSIONES:
+                _, self._version_minima = self._versiones_pedidos.popitem(last=False)
+    
+    def pedidos_cambiados_desde(self, version: Optional[int]) -> Tuple[int, List[Pedido], List[int], bool]:
+        """Pedidos creados, modificados o eliminados después de `version`.
+        
+        Devuelve la versión actual, los pedidos cambiados que siguen existiendo,
+        los números de los eliminados, del cambio más antiguo al más reciente, y
+        si la respuesta es completa. Solo se recorren los cambios posteriores, no
+        todos los pedidos. Con `version=None`, o si `version` es anterior a los
+        últimos MAX_VERSIONES cambios, devuelve todos los pedidos, agrupados por
+        estado en el orden en que llegaron a él, y completa=True: quien la recibe
+        debe sustituir lo que tenía.
+        """
+        with self.cerrojo:
+            with self._cerrojo_versiones:
+                actual = self.version_pedidos
+                completa = version is None or version < self._version_minima
+                numeros = []
+                if not completa:
+                    for numero, version_pedido in reversed(self._versiones_pedidos.items()):
+                        if version_pedido <= version:
+                            break
+                        numeros.append(numero)
+            
+            if completa:
+                return actual, [p for cola in self._pedidos_por_estado.values() for p in cola.values()], [], True
+            
+            cambiados, eliminados = [], []
+            for numero in reversed(numeros):
+                pedido = self._pedidos.get(numero)
+                if pedido is None:
+                    eliminados.append(numero)
+                else:
+                    cambiados.append(pedido)
+            return actual, cambiados, eliminados, False
+    
+    @mutacion
+    def modificar_pedido(self, numero_pedido: int, accion: str, producto: ProductoConExtras = None) -> bool:
+        """Modifica un pedido existente"""
+        pedido = self.buscar_pedido(numero_pedido)
+        if not pedido:
+            return False
+        
+        # El cerrojo del pedido impide que cambie de estado mientras se modifica
+        with self._cerrojo_pedido(numero_pedido), self.inventario.bloquear([producto.producto.codigo]):
+            if pedido.estado == "Nuevo" and self.buscar_pedido(numero_pedido) is pedido:
+                if accion == "agregar":
+                    prod_base = self.inventario.obtener_producto(producto.producto.codigo)
+                    if prod_base and prod_base.stock >= producto.cantidad:
+                        with self.cerrojo:
+                            pedido.agregar_producto(producto)
+                            self._al_deshacer(lambda: self._quitar_linea(pedido, producto))
+                            self._ajustar_totales_cliente(pedido.cliente, 0, producto.precio_total)
+                            self._cambiar_stock(prod_base.codigo, -producto.cantidad)
+                            self._registrar("agregar_linea", pedido.numero, self._serializar_item(producto))
+                            self.eventos.publicar("pedido_modificado", pedido=pedido)
+                        return True
+                elif accion == "eliminar":
+                    for p in pedido.productos:
+                        if p.producto.codigo == producto.producto.codigo:
+                            with self.cerrojo:
+                                posicion = pedido.productos.index(p)
+                                if pedido.eliminar_producto(p):
+                                    self._al_deshacer(lambda: self._reinsertar_linea(pedido, posicion, p))
+                                    self._ajustar_totales_cliente(pedido.cliente, 0, -p.precio_total)
+                                    self._cambiar_stock(p.producto.codigo, p.cantidad)
+                                    self._registrar("eliminar_linea", pedido.numero, p.producto.codigo)
+                                    self.eventos.publicar("pedido_modificado", pedido=pedido)
+                                    return True
+        return False
+    
+    def _quitar_linea(self, pedido: Pedido, item: ProductoConExtras) -> None:
+        """Quita una línea añadida (al deshacer una modificación)"""
+        pedido.eliminar_producto(item)
+        self.eventos.publicar("pedido_modificado", pedido=pedido)
+    
+    def _reinsertar_linea(self, pedido: Pedido, posicion: int, item: ProductoConExtras) -> None:
+        """Devuelve una línea eliminada a su posición original"""
+        pedido.agregar_producto(item, posicion)
+        self.eventos.publicar("pedido_modificado", pedido=pedido)
+    
+    @mutacion
+    def procesar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
+        """Cambia el estado del pedido a 'En preparación'"""
+        empleado = self.empleados.get(empleado_usuario)
+        if not empleado:
+            return False
+        
+        pedido = self.buscar_pedido(numero_pedido)
+        if not pedido:
+            return False
+        
+        with self._cerrojo_pedido(numero_pedido):
+            if pedido.estado == "Nuevo" and self.buscar_pedido(numero_pedido) is pedido:
+                proceso = ProcesoPedido(pedido, empleado)
+                with self.cerrojo:
+                    self._cambiar_estado(pedido, proceso.iniciar_proceso)
+                    self._registrar("estado", pedido.numero, pedido.estado)
+                return True
+        return False
+    
+    @mutacion
+    def entregar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
+        """Marca el pedido como entregado"""
+        empleado = self.empleados.get(empleado_usuario)
+        if not empleado:
+            return False
+        
+        pedido = self.buscar_pedido(numero_pedido)
+        if not pedido:
+            return False
+        
+        with self._cerrojo_pedido(numero_pedido):
+            if pedido.estado == "En preparación" and self.buscar_pedido(numero_pedido) is pedido:
+                proceso = ProcesoEntrega(pedido, empleado)
+                with self.cerrojo:
+                    self._cambiar_estado(pedido, proceso.entregar)
+                    self._registrar("estado", pedido.numero, pedido.estado)
+                return True
+        return False
+    
+    @mutacion
+    def eliminar_pedido(self, pedido: Pedido) -> None:
+        """Elimina un pedido del sistema y del historial del cliente"""
+        with self._cerrojo_pedido(pedido.numero):
+            with self.cerrojo:
+                if self.buscar_pedido(pedido.numero) is not pedido:
+                    return
+                self._quitar_pedido(pedido)
+                self._ajustar_totales_cliente(pedido.cliente, -1, -pedido.total)
+                self._registrar("eliminar_pedido", pedido.numero)
+    
+    @mutacion
+    def agregar_producto(self, producto: Producto) -> None:
+        """Agrega un producto al inventario"""
+        with self.inventario.bloquear([producto.codigo]), self.cerrojo:
+            anterior = self.inventario.obtener_producto(producto.codigo)
+            self.inventario.agregar_producto(producto)
+            self._al_deshacer(lambda: self.inventario.agregar_producto(anterior) if anterior
+                              else self.inventario.quitar_producto(producto.codigo))
+            self.eventos.publicar("stock_cambiado", producto=producto)
+            self._registrar("producto", producto)
+    
+    @mutacion
+    def actualizar_stock(self, codigo: str, cantidad: int) -> bool:
+        """Actualiza el stock de un producto del inventario"""
+        with self.inventario.bloquear([codigo]), self.cerrojo:
+            if not self._cambiar_stock(codigo, cantidad):
+                return False
+            self._registrar("stock", codigo, self.inventario.obtener_producto(codigo).stock)
+        return True
+    
+    @mutacion
+    def fijar_stock(self, codigo: str, stock: int) -> bool:
+        """Pone el stock de un producto a un valor, sin importar lo vendido entretanto"""
+        with self.inventario.bloquear([codigo]), self.cerrojo:
+            producto = self.inventario.obtener_producto(codigo)
+            # La diferencia se calcula con el cerrojo del producto tomado: ninguna venta se cuela en medio
+            if producto is None or not self._cambiar_stock(codigo, stock - producto.stock):
+                return False
+            self._registrar("stock", codigo, producto.stock)
+        return True
+    
+    def listar_productos_disponibles(self) -> List[Producto]:
+        """Lista los productos con stock disponible"""
+        return self.inventario.listar_disponibles()
+    
+    def generar_reporte_ventas(self) -> Dict:
+        """Genera un reporte de ventas a partir de los acumulados"""
+        with self.cerrojo:
+            nombres = {}
+            for codigo in self._unidades_vendidas:
+                producto = self.inventario.obtener_producto(codigo)
+                if producto:
+                    nombres[codigo] = producto.nombre
+            # Con los nombres, una terminal remota muestra el reporte con una sola petición
+            return {
+                "total_ventas": self._total_ventas,
+                "productos_vendidos": dict(self._unidades_vendidas),
+                "ingresos_por_producto": dict(self._ingresos_producto),
+                "pedidos_completados": self._pedidos_completados,
+                "nombres_productos": nombres
+            }
+    
+    def ventas_por_rango(self, desde: datetime.datetime, hasta: datetime.datetime,
+                         granularidad: str = "dia", horas: Optional[Tuple[int, int]] = None) -> Dict:
+        """Ventas de pedidos entregados con fecha en [desde, hasta), agrupadas por hora, día o mes.
+        
+        Solo recorre los intervalos del rango. Un intervalo cuenta si su inicio cae dentro
+        del rango, así que los límites se redondean a la granularidad. Con `horas=(7, 10)`
+        y granularidad "hora" se limita además a esa franja de cada día; con otra
+        granularidad, o con una franja fuera de 0-24, lanza ValueError.
+        """
+        if granularidad not in self.GRANULARIDADES:
+            raise ValueError(f"Granularidad desconocida: {granularidad}")
+        if horas is not None:
+            if granularidad != "hora":
+                raise ValueError("La franja de horas solo se admite con granularidad 'hora'")
+            if not 0 <= horas[0] < horas[1] <= 24:
+                raise ValueError(f"Franja de horas no válida: {horas[0]}-{horas[1]}")
+        
+        detalle = []
+        total_ventas, unidades, pedidos = 0, 0, 0
+        with self.cerrojo:
+            claves = self._claves_rollup[granularidad]
+            rollup = self._rollups[granularidad]
+            for i in range(bisect.bisect_left(claves, desde), bisect.bisect_left(claves, hasta)):
+                inicio = claves[i]
+                if horas is not None and not horas[0] <= inicio.hour < horas[1]:
+                    continue
+                ingresos, cantidad, numero = rollup[inicio]
+                detalle.append((inicio, ingresos, cantidad, numero))
+                total_ventas += ingresos
+                unidades += cantidad
+                pedidos += numero
+        
+        return {
+            "granularidad": granularidad,
+            "total_ventas": total_ventas,
+            "unidades": unidades,
+            "pedidos": pedidos,
+            "detalle": detalle
+        }
+    
+    def verificar_reporte_ventas(self) -> bool:
+        """Comprueba los acumulados de ventas contra un recorrido completo de los pedidos"""
+        total_ventas = 0
+        productos_vendidos = {}
+        ingresos_por_producto = {}
+        with self.cerrojo:
+            entregados = list(self._pedidos_por_estado.get("Entregado", {}).values())
+            completados = sum(1 for p in self._pedidos.values() if p.estado == "Entregado")
+            reporte = self.generar_reporte_ventas()
+        for pedido in entregados:
+            total_ventas += pedido.total
+            for item in pedido.productos:
+                codigo = item.producto.codigo
+                productos_vendidos[codigo] = productos_vendidos.get(codigo, 0) + item.cantidad
+                ingresos_por_producto[codigo] = ingresos_por_producto.get(codigo, 0) + item.precio_total
+        
+        return (completados == len(entregados) == reporte["pedidos_completados"]
+                and total_ventas == reporte["total_ventas"]
+                and productos_vendidos == reporte["productos_vendidos"]
+                and ingresos_por_producto == reporte["ingresos_por_producto"])
+    
+    @mutacion
+    def agregar_empleado(self, nombre: str, telefono: str, puesto: str, usuario: str, contrasena: str) -> bool:
+        """Agrega un nuevo empleado"""
+        with self.cerrojo:
+            if usuario in self.empleados:
+                return False
+            nuevo_empleado = Empleado(nombre, telefono, puesto, usuario, contrasena)
+            self.empleados[usuario] = nuevo_empleado
+            self._al_deshacer(lambda: self.empleados.pop(usuario, None))
+            self._registrar("empleado", nombre, telefono, puesto, usuario, contrasena)
+        return True
+    
+    def _filas_clientes(self, progreso=None):
+        """Genera una fila de exportación por cliente a partir de los totales acumulados.
+        
+        Si se da `progreso`, se llama con (clientes hechos, total) cada PASO_PROGRESO filas y al final.
+        """
+        # Solo se copian las claves; cada fila se construye cuando se escribe
+        identificaciones = list(self.clientes)
+        for hechos, identificacion in enumerate(identificaciones, start=1):
+            cliente = self.clientes.get(identificacion)
+            if cliente is not None:
+                total_pedidos, total_gastado = self._totales_clientes.get(identificacion, (0, 0))
+                yield [cliente.identificacion, cliente.nombre, cliente.telefono, total_pedidos,
+                       a_unidades(total_gastado)]
+            if progreso is not None and hechos % self.PASO_PROGRESO == 0:
+                progreso(hechos, len(identificaciones))
+        if progreso is not None:
+            progreso(len(identificaciones), len(identificaciones))
+    
+    def exportar_clientes_excel(self, filename: str = "clientes_cafeteria.xlsx", progreso=None) -> bool:
+        """Exporta la lista de clientes a un archivo Excel fila a fila (ver _filas_clientes para `progreso`)"""
+        try:
+            import openpyxl
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font
+            from openpyxl.utils import get_column_letter
+            
+            # En modo de solo escritura las filas van directas al archivo sin quedarse en memoria
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("Clientes")
+            
+            # Los anchos deben fijarse antes de escribir filas; ya se conocen de antemano
+            for i, max_length in enumerate(self._anchos_clientes, start=1):
+                ws.column_dimensions[get_column_letter(i)].width = (max_length + 2) * 1.2
+            
+            # Escribir los encabezados en negrita
+            headers = []
+            for titulo in self.CABECERAS_CLIENTES:
+                cell = WriteOnlyCell(ws, value=titulo)
+                cell.font = Font(bold=True)
+                headers.append(cell)
+            ws.append(headers)
+            
+            # Escribir los datos de cada cliente
+            for fila in self._filas_clientes(progreso):
+                ws.append(fila)
+            
+            # Guardar el archivo
+            wb.save(filename)
+            return True
+            
+        except Exception as e:
+            print(f"Error al exportar a Excel: {e}")
+            return False
+    
+    def exportar_clientes_csv(self, filename: str = "clientes_cafeteria.csv", progreso=None) -> bool:
+        """Exporta la lista de clientes a un archivo CSV fila a fila (ver _filas_clientes para `progreso`)"""
+        try:
+            # utf-8-sig para que Excel reconozca los acentos al abrirlo
+            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.CABECERAS_CLIENTES)
+                for fila in self._filas_clientes(progreso):
+                    writer.writerow(fila)
+            return True
+        
+        except Exception as e:
+            print(f"Error al exportar a CSV: {e}")
+            return False
+
+class AnaliticaPedidos:
+    """Copia en columnas NumPy de las líneas de los pedidos entregados para análisis.
+    
+    Cada línea de pedido es una fila: pedido, instante, cliente, producto,
+    cantidad, precio unitario en céntimos y códigos de leche y azúcar. `actualizar()`
+    solo añade las entregas nuevas; los informes son operaciones vectorizadas
+    sobre esas columnas; si la cola de entregados cambió de otro modo (un pedido
+    eliminado o devuelto a otro estado, una recarga), se reconstruye todo.
+    Requiere numpy (pip install numpy), igual que la exportación a Excel requiere openpyxl.
+    """
+    COLUMNAS = {
+        "pedido": "int32",        # Índice denso del pedido (ver self.numeros)
+        "instante": "int64",      # Segundos desde 1970-01-01 en hora local
+        "cliente": "int32",
+        "producto": "int32",
+        "cantidad": "int32",
+        "precio": "int64",        # Céntimos
+        "leche": "int8",          # Índice en TIPOS_LECHE o -1
+        "azucar": "int8"          # Índice en NIVELES_AZUCAR o -1
+    }
+    
+    def __init__(self, sistema: "SistemaPedidos"):
+        import numpy as np
+        self.np = np
+        self.sistema = sistema
+        self.reconstruir()
+    
+    def reconstruir(self) -> None:
+        """Vuelve a materializar todo el historial de pedidos entregados"""
+        self._version = None
+        self.filas = 0
+        self._columnas = {nombre: self.np.empty(1024, dtype=tipo) for nombre, tipo in self.COLUMNAS.items()}
+        self.numeros: List[int] = []  # Número de pedido de cada índice denso
+        self._materializados: set = set()
+        self.codigos_producto: List[str] = []
+        self._indice_producto: Dict[str, int] = {}
+        self.clientes: List[str] = []
+        self._indice_cliente: Dict[str, int] = {}
+        self.actualizar()
+    
+    def columna(self, nombre: str):
+        """Vista de una columna con solo las filas ocupadas"""
+        return self._columnas[nombre][:self.filas]
+    
+    def actualizar(self) -> int:
+        """Añade los pedidos entregados desde la última llamada; devuelve cuántos"""
+        with self.sistema.cerrojo:
+            if self._version is not None and self._version != self.sistema._version_entregados:
+                # La cola no solo creció: lo materializado puede no coincidir ya con ella
+                self.reconstruir()
+                return len(self.numeros)
+            self._version = self.sistema._version_entregados
+            entregados = self.sistema._pedidos_por_estado.get("Entregado", {})
+            # Desde la última llamada solo se añadió al final: basta leer desde ahí
+            nuevos = []
+            for pedido in reversed(entregados.values()):
+                if pedido.numero in self._materializados:
+                    break
+                nuevos.append(pedido)
+            
+            filas = []
+            for pedido in reversed(nuevos):
+                indice_pedido = len(self.numeros)
+                self.numeros.append(pedido.numero)
+                self._materializados.add(pedido.numero)
+                instante = pedido.instante // 1_000_000
+                cliente = self._indexar(pedido.cliente.identificacion, self.clientes, self._indice_cliente)
+                for item in pedido.productos:
+                    filas.append((
+                        indice_pedido,
+                        instante,
+                        cliente,
+                        self._indexar(item.producto.codigo, self.codigos_producto, self._indice_producto),
+                        item.cantidad,
+                        item.producto.precio,
+                        item.codigo_leche if isinstance(item.codigo_leche, int) else -1,
+                        item.codigo_azucar if isinstance(item.codigo_azucar, int) else -1
+                    ))
+        
+        self._agregar_filas(filas)
+        return len(nuevos)
+    
+    @staticmethod
+    def _indexar(clave: str, claves: List[str], indice: Dict[str, int]) -> int:
+        """Devuelve el índice denso de una clave, asignándole uno nuevo si hace falta"""
+        if clave not in indice:
+            indice[clave] = len(claves)
+            claves.append(clave)
+        return indice[clave]
+    
+    def _agregar_filas(self, filas: list) -> None:
+        """Copia filas al final de las columnas, duplicando la capacidad si no caben"""
+        if not filas:
+            return
+        necesarias = self.filas + len(filas)
+        capacidad = len(self._columnas["pedido"])
+        if necesarias > capacidad:
+            while capacidad < necesarias:
+                capacidad *= 2
+            for nombre, datos in self._columnas.items():
+                ampliada = self.np.empty(capacidad, dtype=datos.dtype)
+                ampliada[:self.filas] = datos[:self.filas]
+                self._columnas[nombre] = ampliada
+        
+        for nombre, valores in zip(self.COLUMNAS, zip(*filas)):
+            self._columnas[nombre][self.filas:necesarias] = valores
+        self.filas = necesarias
+    
+    def distribucion_tamano_cesta(self):
+        """Número de pedidos según las unidades que contienen (índice = unidades)"""
+        np = self.np
+        unidades = np.bincount(self.columna("pedido"), weights=self.columna("cantidad"),
+                               minlength=len(self.numeros))
+        return np.bincount(unidades.astype(np.int64))
+    
+    def ingresos_por_hora_semana(self):
+        """Ingresos en céntimos por hora de la semana: 168 valores, índice = día (lunes = 0) * 24 + hora"""
+        np = self.np
+        instante = self.columna("instante")
+        # El 1 de enero de 1970 fue jueves (día 3 contando desde el lunes)
+        hora_semana = ((instante // 86400 + 3) % 7) * 24 + (instante // 3600) % 24
+        return np.bincount(hora_semana, weights=self.columna("cantidad") * self.columna("precio"),
+                           minlength=168)
+    
+    def coocurrencia_productos(self, bloque: int = 1024):
+        """Matriz productos x productos con el número de pedidos que contienen ambos.
+        
+        Los índices son los de `codigos_producto`; la diagonal es el número de pedidos
+        con cada producto. Se procesa en bloques de pedidos para acotar la memoria.
+        """
+        np = self.np
+        n_productos = len(self.codigos_producto)
+        pedido = self.columna("pedido")
+        producto = self.columna("producto")
+        resultado = np.zeros((n_productos, n_productos), dtype=np.int64)
+        # Las filas se añaden pedido a pedido, así que la columna está ordenada
+        for inicio in range(0, len(self.numeros), bloque):
+            desde, hasta = np.searchsorted(pedido, [inicio, inicio + bloque])
+            presencia = np.zeros((min(bloque, len(self.numeros) - inicio), n_productos), dtype=np.float32)
+            presencia[pedido[desde:hasta] - inicio, producto[desde:hasta]] = 1
+            resultado += (presencia.T @ presencia).astype(np.int64)
+        return resultado
+
+# Puerto por defecto del servicio de pedidos
+PUERTO_SERVICIO = 8765
+# Tamaño máximo de un mensaje del protocolo (16 MiB)
+MAX_MENSAJE = 16 * 1024 * 1024
+
+class ErrorServicio(Exception):
+    """Error devuelto por el servicio de pedidos al ejecutar una operación"""
+
+def _producto_a_datos(producto: Producto) -> list:
+    """Convierte un producto en una lista compacta apta para JSON"""
+    if isinstance(producto, Bebida):
+        extra = producto.tamano
+    elif isinstance(producto, Postre):
+        extra = producto.ingredientes
+    else:
+        extra = None
+    return [type(producto).__name__, producto.codigo, producto.nombre, producto.precio, producto.stock,
+            getattr(producto, "descripcion", ""), getattr(producto, "imagen", None), extra]
+
+def _producto_desde_datos(datos: list) -> Producto:
+    """Reconstruye un producto a partir de su lista compacta"""
+    tipo, codigo, nombre, precio, stock, descripcion, imagen, extra = datos
+    if tipo == "Bebida":
+        return Bebida(codigo, nombre, precio, stock, extra, imagen)
+    if tipo == "Postre":
+        return Postre(codigo, nombre, precio, stock, extra, imagen)
+    return Producto(codigo, nombre, precio, stock, descripcion, imagen)
+
+def _pedido_a_datos(pedido: Pedido) -> list:
+    """Convierte un pedido en una lista compacta apta para JSON"""
+    cliente = pedido.cliente
+    return [pedido.numero, cliente.identificacion, cliente.nombre, cliente.telefono,
+            pedido.fecha.isoformat(), pedido.estado, pedido.total,
+            [[_producto_a_datos(item.producto), item.cantidad, item.tipo_leche, item.azucar, item.notas]
+             for item in pedido.productos]]
+
+class ServicioPedidos:
+    """Servicio asyncio que comparte un SistemaPedidos entre varias terminales.
+    
+    Escucha en un puerto TCP local o en un socket Unix. Cada mensaje es la
+    longitud en 4 bytes (big-endian) seguida de JSON compacto:
+    petición `[id, método, argumentos]` y respuesta `[id, ok, resultado, aviso]`,
+    donde `aviso` es el (título, mensaje) que el sistema habría mostrado.
+    Las consultas de EN_BUCLE se ejecutan en el propio bucle; el resto (mutaciones,
+    que pueden esperar por el cerrojo o por una transacción, listados, informes y
+    exportaciones) va a un grupo de hilos para no detener a las demás conexiones.
+    La escritura a disco la hace el almacén (conviene usar AlmacenDiferido).
+    """
+    # Búsquedas O(1) que no toman sistema.cerrojo; cualquier listado va al grupo de hilos
+    EN_BUCLE = frozenset({"validar_empleado", "buscar_cliente", "buscar_pedido", "obtener_producto"})
+    
+    def __init__(self, sistema: SistemaPedidos, host: str = "127.0.0.1",
+                 puerto: int = PUERTO_SERVICIO, ruta_unix: Optional[str] = None, hilos: int = 4):
+        self.sistema = sistema
+        self.host = host
+        self.puerto = puerto
+        self.ruta_unix = ruta_unix
+        self.servidor = None
+        self._bucle = None
+        self._ejecutor = concurrent.futures.ThreadPoolExecutor(hilos, thread_name_prefix="ServicioPedidos")
+        # Cada petición guarda su aviso en el hilo que la ejecuta
+        self._local = threading.local()
+        # El servicio no tiene ventana: los avisos viajan en la respuesta
+        sistema.avisar = self._avisar
+        self.metodos = {
+            "validar_empleado": self._validar_empleado,
+            "agregar_empleado": sistema.agregar_empleado,
+            "buscar_cliente": self._buscar_cliente,
+            "registrar_cliente": self._registrar_cliente,
+            "pedidos_cliente": self._pedidos_cliente,
+            "crear_pedido": self._crear_pedido,
+            "crear_pedidos_lote": self._crear_pedidos_lote,
+            "buscar_pedido": self._buscar_pedido,
+            "listar_pedidos": self._listar_pedidos,
+            "pedidos_cambiados_desde": self._pedidos_cambiados_desde,
+            "modificar_pedido": self._modificar_pedido,
+            "procesar_pedido": sistema.procesar_pedido,
+            "entregar_pedido": sistema.entregar_pedido,
+            "eliminar_pedido": self._eliminar_pedido,
+            "agregar_producto": self._agregar_producto,
+            "actualizar_stock": sistema.actualizar_stock,
+            "fijar_stock": sistema.fijar_stock,
+            "obtener_producto": self._obtener_producto,
+            "listar_productos": self._listar_productos,
+            "generar_reporte_ventas": sistema.generar_reporte_ventas,
+            "ventas_por_rango": self._ventas_por_rango,
+            "exportar_clientes_excel": self._exportar_clientes_excel,
+            "exportar_clientes_csv": self._exportar_clientes_csv,
+        }
+    
+    async def iniciar(self) -> None:
+        """Empieza a aceptar conexiones"""
+        self._bucle = asyncio.get_running_loop()
+        if self.ruta_unix:
+            if os.path.exists(self.ruta_unix):
+                os.remove(self.ruta_unix)
+            self.servidor = await asyncio.start_unix_server(self._atender, path=self.ruta_unix)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+            # Con puerto 0 el sistema elige uno libre
+            self.puerto = self.servidor.sockets[0].getsockname()[1]
+    
+    async def servir(self) -> None:
+        """Atiende conexiones hasta que se llame a `detener`"""
+        await self.iniciar()
+        try:
+            async with self.servidor:
+                await self.servidor.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._ejecutor.shutdown()
+            self.sistema.cerrar()
+    
+    def detener(self) -> None:
+        """Detiene el servicio; puede llamarse desde otro hilo"""
+        if self._bucle is not None and self.servidor is not None:
+            self._bucle.call_soon_threadsafe(self.servidor.close)
+    
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende las peticiones de una conexión en orden"""
+        try:
+            while True:
+                longitud = int.from_bytes(await reader.readexactly(4), "big")
+                if longitud > MAX_MENSAJE:
+                    # No se puede saltar el mensaje sin leerlo: se avisa y se cierra la conexión
+                    print(f"Mensaje de {longitud} bytes rechazado (máximo {MAX_MENSAJE}); se cierra la conexión")
+                    writer.write(self._enmarcar([None, 0, f"ErrorServicio: mensaje demasiado grande ({longitud} bytes)", None]))
+                    await writer.drain()
+                    break
+                try:
+                    peticion = json.loads(await reader.readexactly(longitud))
+                except ValueError as e:
+                    # El mensaje se leyó entero, así que la conexión sigue sincronizada
+                    print(f"Petición con JSON no válido: {e}")
+                    writer.write(self._enmarcar([None, 0, f"ErrorServicio: JSON no válido ({e})", None]))
+                    await writer.drain()
+                    continue
+                if isinstance(peticion, list) and len(peticion) == 3 and peticion[1] in self.EN_BUCLE:
+                    respuesta = self._responder(peticion)
+                else:
+                    # Las peticiones de una conexión se siguen atendiendo en orden
+                    respuesta = await self._bucle.run_in_executor(self._ejecutor, self._responder, peticion)
+                writer.write(respuesta)
+                # Solo se espera al socket si el búfer de salida está lleno
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    def _responder(self, peticion: list) -> bytes:
+        """Ejecuta una petición y devuelve la respuesta ya enmarcada"""
+        id_peticion = peticion[0] if isinstance(peticion, list) and peticion else None
+        self._local.aviso = None
+        try:
+            _, metodo, argumentos = peticion
+            funcion = self.metodos.get(metodo)
+            if funcion is None:
+                raise ErrorServicio(f"Operación desconocida: {metodo}")
+            respuesta = [id_peticion, 1, funcion(*argumentos), self._local.aviso]
+        except Exception as e:
+            respuesta = [id_peticion, 0, f"{type(e).__name__}: {e}", None]
+        return self._enmarcar(respuesta)
+    
+    @staticmethod
+    def _enmarcar(respuesta: list) -> bytes:
+        """Codifica una respuesta como JSON precedido de su longitud"""
+        cuerpo = json.dumps(respuesta, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return len(cuerpo).to_bytes(4, "big") + cuerpo
+    
+    def _avisar(self, titulo: str, mensaje: str) -> None:
+        """Guarda el aviso para devolverlo con la respuesta en curso"""
+        self._local.aviso = [titulo, mensaje]
+    
+    def _validar_empleado(self, usuario: str, contrasena: str) -> Optional[list]:
+        """Valida las credenciales y devuelve los datos públicos del empleado"""
+        empleado = self.sistema.validar_empleado(usuario, contrasena)
+        return [empleado.nombre, empleado.telefono, empleado.puesto, empleado.usuario] if empleado else None
+    
+    def _buscar_cliente(self, identificacion: str) -> Optional[list]:
+        """Busca un cliente y devuelve sus datos"""
+        cliente = self.sistema.buscar_cliente(identificacion)
+        return [cliente.nombre, cliente.telefono, cliente.identificacion] if cliente else None
+    
+    def _registrar_cliente(self, nombre: str, telefono: str, identificacion: str) -> Optional[list]:
+        """Registra un cliente y devuelve sus datos (None si ya existía)"""
+        cliente = self.sistema.registrar_cliente(nombre, telefono, identificacion)
+        return [cliente.nombre, cliente.telefono, cliente.identificacion] if cliente else None
+    
+    def _pedidos_cliente(self, identificacion: str) -> list:
+        """Devuelve el historial de pedidos de un cliente"""
+        cliente = self.sistema.buscar_cliente(identificacion)
+        return [_pedido_a_datos(p) for p in cliente.historial_pedidos] if cliente else []
+    
+    def _lineas(self, lineas: list) -> List[ProductoConExtras]:
+        """Reconstruye las líneas recibidas con los productos del inventario del servicio"""
+        items = []
+        for linea in lineas:
+            if self.sistema.inventario.obtener_producto(linea[0]) is None:
+                raise ErrorServicio(f"Producto desconocido: {linea[0]}")
+            items.append(self.sistema._crear_item(tuple(linea)))
+        return items
+    
+    def _crear_pedido(self, cliente_id: str, lineas: list) -> Optional[list]:
+        """Crea un pedido a partir de líneas serializadas"""
+        pedido = self.sistema.crear_pedido(cliente_id, self._lineas(lineas))
+        return _pedido_a_datos(pedido) if pedido else None
+    
+    def _crear_pedidos_lote(self, lote: list) -> list:
+        """Crea varios pedidos a partir de pares (cliente_id, líneas serializadas)"""
+        pedidos = self.sistema.crear_pedidos_lote([(cliente_id, self._lineas(lineas)) for cliente_id, lineas in lote])
+        return [_pedido_a_datos(p) if p else None for p in pedidos]
+    
+    def _buscar_pedido(self, numero: int) -> Optional[list]:
+        """Busca un pedido por su número"""
+        pedido = self.sistema.buscar_pedido(numero)
+        return _pedido_a_datos(pedido) if pedido else None
+    
+    def _listar_pedidos(self, estado: Optional[str] = None) -> list:
+        """Lista los pedidos según su estado"""
+        return [_pedido_a_datos(p) for p in self.sistema.listar_pedidos(estado)]
+    
+    def _pedidos_cambiados_desde(self, version: Optional[int]) -> list:
+        """Devuelve la versión actual, los pedidos cambiados desde `version`, los eliminados y si es completa"""
+        actual, pedidos, eliminados, completa = self.sistema.pedidos_cambiados_desde(version)
+        return [actual, [_pedido_a_datos(p) for p in pedidos], eliminados, completa]
+    
+    def _modificar_pedido(self, numero: int, accion: str, linea: list) -> bool:
+        """Agrega o elimina una línea serializada de un pedido"""
+        return self.sistema.modificar_pedido(numero, accion, self._lineas([linea])[0])
+    
+    def _eliminar_pedido(self, numero: int) -> None:
+        """Elimina un pedido por su número"""
+        pedido = self.sistema.buscar_pedido(numero)
+        if pedido:
+            self.sistema.eliminar_pedido(pedido)
+    
+    def _agregar_producto(self, datos: list) -> None:
+        """Agrega al inventario un producto serializado"""
+        self.sistema.agregar_producto(_producto_desde_datos(datos))
+    
+    def _obtener_producto(self, codigo: str) -> Optional[list]:
+        """Obtiene un producto por su código"""
+        producto = self.sistema.inventario.obtener_producto(codigo)
+        return _producto_a_datos(producto) if producto else None
+    
+    def _listar_productos(self, categoria: str = "ProductoBase", solo_disponibles: bool = False) -> list:
+        """Lista los productos de una categoría (ProductoBase, Bebida o Postre)"""
+        tipos = {"ProductoBase": ProductoBase, "Bebida": Bebida, "Postre": Postre}
+        productos = self.sistema.inventario.listar_categoria(tipos[categoria], solo_disponibles)
+        return [_producto_a_datos(p) for p in productos]
+    
+    def _ventas_por_rango(self, desde: str, hasta: str, granularidad: str = "dia", horas: Optional[list] = None) -> Dict:
+        """Ventas por rango con las fechas en formato ISO"""
+        resultado = self.sistema.ventas_por_rango(datetime.datetime.fromisoformat(desde),
+                                                  datetime.datetime.fromisoformat(hasta),
+                                                  granularidad, tuple(horas) if horas else None)
+        resultado["detalle"] = [[inicio.isoformat()] + list(resto) for inicio, *resto in resultado["detalle"]]
+        return resultado
+    
+    def _exportar(self, exportar, extension: str) -> Optional[str]:
+        """Exporta a un archivo temporal del servicio y devuelve su contenido en base64.
+        
+        El cliente no elige ninguna ruta del servidor: guarda el contenido donde quiera.
+        """
+        with tempfile.TemporaryDirectory(prefix="cafeteria_exportacion_") as directorio:
+            ruta = os.path.join(directorio, "clientes" + extension)
+            if not exportar(ruta):
+                return None
+            with open(ruta, "rb") as f:
+                return base64.b64encode(f.read()).decode("ascii")
+    
+    def _exportar_clientes_excel(self) -> Optional[str]:
+        """Contenido del Excel de clientes (ver _exportar)"""
+        return self._exportar(self.sistema.exportar_clientes_excel, ".xlsx")
+    
+    def _exportar_clientes_csv(self) -> Optional[str]:
+        """Contenido del CSV de clientes (ver _exportar)"""
+        return self._exportar(self.sistema.exportar_clientes_csv, ".csv")
+
+class ClienteRemoto(Cliente):
+    """Cliente obtenido del servicio, con una copia local de su historial.
+    
+    SistemaRemoto.historial_cliente trae el historial del servicio y los cambios
+    hechos desde esta terminal lo mantienen al día, así que leer
+    `historial_pedidos` no hace ninguna petición salvo la primera vez.
+    """
+    def __init__(self, sistema: "SistemaRemoto", nombre: str, telefono: str, identificacion: str):
+        Persona.__init__(self, nombre, telefono)
+        self.identificacion = identificacion
+        self._sistema = sistema
+        self._historial_servicio: Optional[Dict[int, Pedido]] = None  # Número -> pedido, o None si no se ha pedido
+    
+    @property
+    def historial_pedidos(self) -> List[Pedido]:
+        """Pedidos del cliente según la última consulta al servicio"""
+        if self._historial_servicio is None:
+            self._sistema.historial_cliente(self.identificacion)
+        return list(self._historial_servicio.values())
+
+class InventarioRemoto:
+    """Consultas de inventario de SistemaRemoto, con la misma interfaz que Inventario"""
+    def __init__(self, sistema: "SistemaRemoto"):
+        self._sistema = sistema
+    
+    def _listar(self, categoria: str, solo_disponibles: bool) -> List[Producto]:
+        """Pide al servicio los productos de una categoría"""
+        return [_producto_desde_datos(d)
+                for d in self._sistema._llamar("listar_productos", categoria, solo_disponibles)]
+    
+    def obtener_producto(self, codigo: str) -> Optional[Producto]:
+        """Obtiene un producto por su código"""
+        datos = self._sistema._llamar("obtener_producto", codigo)
+        return _producto_desde_datos(datos) if datos else None
+    
+    def listar_productos(self) -> List[Producto]:
+        """Lista todos los productos"""
+        return self._listar("ProductoBase", False)
+    
+    def listar_disponibles(self) -> List[Producto]:
+        """Lista los productos con stock disponible"""
+        return self._listar("ProductoBase", True)
+    
+    def listar_bebidas(self, solo_disponibles: bool = False) -> List[Bebida]:
+        """Lista todas las bebidas"""
+        return self._listar("Bebida", solo_disponibles)
+    
+    def listar_postres(self, solo_disponibles: bool = False) -> List[Postre]:
+        """Lista todos los postres"""
+        return self._listar("Postre", solo_disponibles)
+
+class SistemaRemoto:
+    """Sustituto de SistemaPedidos que delega en un ServicioPedidos.
+    
+    Ofrece las operaciones que usa la interfaz con las mismas firmas, así que
+    InterfazCafeteria funciona igual con datos locales o con el servicio.
+    Los objetos devueltos son copias: reflejan el estado en el momento de la consulta.
+    """
+    def __init__(self, host: str = "127.0.0.1", puerto: int = PUERTO_SERVICIO,
+                 ruta_unix: Optional[str] = None, timeout: float = 10.0):
+        self._direccion = (host, puerto)
+        self._ruta_unix = ruta_unix
+        self._timeout = timeout
+        self._socket = self._conectar()
+        self._cerrojo = threading.Lock()
+        self._siguiente_id = 0
+        self._clientes: Dict[str, ClienteRemoto] = {}
+        self.inventario = InventarioRemoto(self)
+        self.avisar = messagebox.showwarning
+        # Solo se publican los cambios hechos desde esta terminal
+        self.eventos = BusEventos()
+        for tipo in ("pedido_creado", "pedido_modificado", "pedido_eliminado", "estado_cambiado"):
+            self.eventos.suscribir(tipo, self._anotar_historial)
+    
+    def _conectar(self) -> socket.socket:
+        """Abre una conexión nueva con el servicio"""
+        if self._ruta_unix:
+            conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conexion.settimeout(self._timeout)
+            try:
+                conexion.connect(self._ruta_unix)
+            except OSError:
+                conexion.close()
+                raise
+        else:
+            conexion = socket.create_connection(self._direccion, self._timeout)
+            conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conexion
+    
+    def _reconectar(self) -> None:
+        """Descarta la conexión actual, que puede tener respuestas a medio leer.
+        
+        Si el servicio no responde, la conexión se vuelve a intentar en la siguiente llamada.
+        """
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        try:
+            self._socket = self._conectar()
+        except OSError:
+            pass
+    
+    def _llamar(self, metodo: str, *argumentos):
+        """Envía una petición al servicio y espera su respuesta.
+        
+        Si la llamada se interrumpe (timeout, lectura incompleta o respuesta de
+        otra petición) la conexión queda desincronizada: se reabre y se lanza
+        ErrorServicio en lugar de seguir leyendo respuestas desfasadas.
+        """
+        with self._cerrojo:
+            self._siguiente_id += 1
+            id_peticion = self._siguiente_id
+            cuerpo = json.dumps([id_peticion, metodo, argumentos],
+                                separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            try:
+                if self._socket is None:
+                    self._socket = self._conectar()
+                self._socket.sendall(len(cuerpo).to_bytes(4, "big") + cuerpo)
+                longitud = int.from_bytes(self._recibir(4), "big")
+                id_respuesta, ok, resultado, aviso = json.loads(self._recibir(longitud))
+                if id_respuesta != id_peticion:
+                    raise ErrorServicio(f"Respuesta {id_respuesta} recibida para la petición {id_peticion}")
+            except (OSError, ValueError, ErrorServicio) as e:
+                self._reconectar()
+                raise ErrorServicio(f"Fallo de comunicación con el servicio en {metodo}: {e}") from e
+        if not ok:
+            raise ErrorServicio(resultado)
+        if aviso:
+            self.avisar(*aviso)
+        return resultado
+    
+    def _recibir(self, n: int) -> bytes:
+        """Lee exactamente n bytes del socket"""
+        datos = bytearray()
+        while len(datos) < n:
+            bloque = self._socket.recv(n - len(datos))
+            if not bloque:
+                raise ConnectionError("El servicio de pedidos cerró la conexión")
+            datos += bloque
+        return bytes(datos)
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con el servicio"""
+        with self._cerrojo:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+    
+    def _cliente(self, datos: list) -> ClienteRemoto:
+        """Devuelve el cliente remoto con esos datos, reutilizando el objeto si ya existe"""
+        nombre, telefono, identificacion = datos
+        cliente = self._clientes.get(identificacion)
+        if cliente is None:
+            cliente = self._clientes[identificacion] = ClienteRemoto(self, nombre, telefono, identificacion)
+        cliente.nombre, cliente.telefono = nombre, telefono
+        return cliente
+    
+    def _anotar_historial(self, evento: Evento) -> None:
+        """Lleva al historial guardado del cliente los cambios hechos desde esta terminal"""
+        pedido = evento.datos["pedido"]
+        cliente = pedido.cliente
+        if not isinstance(cliente, ClienteRemoto) or cliente._historial_servicio is None:
+            return
+        if evento.tipo == "pedido_eliminado":
+            cliente._historial_servicio.pop(pedido.numero, None)
+        else:
+            cliente._historial_servicio[pedido.numero] = pedido
+    
+    def _pedido_desde_datos(self, datos: list) -> Pedido:
+        """Reconstruye un pedido sin tocar el contador de números local"""
+        numero, cliente_id, nombre, telefono, fecha, estado, total, lineas = datos
+        pedido = Pedido.__new__(Pedido)
+        pedido.numero = numero
+        pedido.cliente = self._cliente([nombre, telefono, cliente_id])
+        pedido.productos = [ProductoConExtras(_producto_desde_datos(producto), cantidad, tipo_leche, azucar, notas)
+                            for producto, cantidad, tipo_leche, azucar, notas in lineas]
+        pedido.fecha = datetime.datetime.fromisoformat(fecha)
+        pedido.estado = estado
+        pedido.total = total
+        return pedido
+    
+    def validar_empleado(self, usuario: str, contrasena: str) -> Optional[Empleado]:
+        """Valida las credenciales de un empleado"""
+        datos = self._llamar("validar_empleado", usuario, contrasena)
+        if not datos:
+            return None
+        nombre, telefono, puesto, usuario = datos
+        return Empleado(nombre, telefono, puesto, usuario, "")
+    
+    def agregar_empleado(self, nombre: str, telefono: str, puesto: str, usuario: str, contrasena: str) -> bool:
+        """Agrega un nuevo empleado"""
+        return self._llamar("agregar_empleado", nombre, telefono, puesto, usuario, contrasena)
+    
+    def buscar_cliente(self, identificacion: str) -> Optional[Cliente]:
+        """Busca un cliente por su identificación"""
+        datos = self._llamar("buscar_cliente", identificacion)
+        return self._cliente(datos) if datos else None
+    
+    def registrar_cliente(self, nombre: str, telefono: str, identificacion: str) -> Optional[Cliente]:
+        """Registra un nuevo cliente; devuelve None si ya existe uno con esa identificación"""
+        datos = self._llamar("registrar_cliente", nombre, telefono, identificacion)
+        if not datos:
+            return None
+        cliente = self._cliente(datos)
+        self.eventos.publicar("cliente_registrado", cliente=cliente)
+        return cliente
+    
+    def historial_cliente(self, identificacion: str) -> List[Pedido]:
+        """Pide al servicio los pedidos de un cliente y renueva su historial guardado"""
+        pedidos = [self._pedido_desde_datos(d) for d in self._llamar("pedidos_cliente", identificacion)]
+        cliente = self._clientes.get(identificacion)
+        if cliente is not None:
+            cliente._historial_servicio = {p.numero: p for p in pedidos}
+        return pedidos
+    
+    def _publicar_pedido(self, tipo: str, numero_pedido: int, **datos) -> None:
+        """Publica un evento de pedido con su estado actual según el servicio"""
+        pedido = self.buscar_pedido(numero_pedido)
+        if pedido:
+            self.eventos.publicar(tipo, pedido=pedido, **datos)
+    
+    def crear_pedido(self, cliente_id: str, productos: List[ProductoConExtras]) -> Optional[Pedido]:
+        """Crea un nuevo pedido"""
+        datos = self._llamar("crear_pedido", cliente_id,
+                             [SistemaPedidos._serializar_item(item) for item in productos])
+        if not datos:
+            return None
+        pedido = self._pedido_desde_datos(datos)
+        self.eventos.publicar("pedido_creado", pedido=pedido)
+        return pedido
+    
+    def crear_pedidos_lote(self, lote: List[Tuple[str, List[ProductoConExtras]]]) -> List[Optional[Pedido]]:
+        """Crea varios pedidos a la vez; ver SistemaPedidos.crear_pedidos_lote"""
+        datos = self._llamar("crear_pedidos_lote",
+                             [(cliente_id, [SistemaPedidos._serializar_item(item) for item in productos])
+                              for cliente_id, productos in lote])
+        pedidos = [self._pedido_desde_datos(d) if d else None for d in datos]
+        for pedido in pedidos:
+            if pedido:
+                self.eventos.publicar("pedido_creado", pedido=pedido)
+        return pedidos
+    
+    def buscar_pedido(self, numero_pedido: int) -> Optional[Pedido]:
+        """Busca un pedido por su número"""
+        datos = self._llamar("buscar_pedido", numero_pedido)
+        return self._pedido_desde_datos(datos) if datos else None
+    
+    def listar_pedidos(self, estado: Optional[str] = None) -> List[Pedido]:
+        """Lista los pedidos según su estado"""
+        return [self._pedido_desde_datos(d) for d in self._llamar("listar_pedidos", estado)]
+    
+    def pedidos_cambiados_desde(self, version: Optional[int]) -> Tuple[int, List[Pedido], List[int], bool]:
+        """Pedidos cambiados en el servicio después de `version`; ver SistemaPedidos.pedidos_cambiados_desde"""
+        actual, datos, eliminados, completa = self._llamar("pedidos_cambiados_desde", version)
+        return actual, [self._pedido_desde_datos(d) for d in datos], eliminados, completa
+    
+    def modificar_pedido(self, numero_pedido: int, accion: str, producto: ProductoConExtras = None) -> bool:
+        """Modifica un pedido existente"""
+        if not self._llamar("modificar_pedido", numero_pedido, accion, SistemaPedidos._serializar_item(producto)):
+            return False
+        self._publicar_pedido("pedido_modificado", numero_pedido)
+        return True
+    
+    def procesar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
+        """Cambia el estado del pedido a 'En preparación'"""
+        if not self._llamar("procesar_pedido", numero_pedido, empleado_usuario):
+            return False
+        self._publicar_pedido("estado_cambiado", numero_pedido, anterior="Nuevo")
+        return True
+    
+    def entregar_pedido(self, numero_pedido: int, empleado_usuario: str) -> bool:
+        """Marca el pedido como entregado"""
+        if not self._llamar("entregar_pedido", numero_pedido, empleado_usuario):
+            return False
+        self._publicar_pedido("estado_cambiado", numero_pedido, anterior="En preparación")
+        return True
+    
+    def eliminar_pedido(self, pedido: Pedido) -> None:
+        """Elimina un pedido del sistema y del historial del cliente"""
+        self._llamar("eliminar_pedido", pedido.numero)
+        self.eventos.publicar("pedido_eliminado", pedido=pedido)
+    
+    def agregar_producto(self, producto: Producto) -> None:
+        """Agrega un producto al inventario"""
+        self._llamar("agregar_producto", _producto_a_datos(producto))
+        self.eventos.publicar("stock_cambiado", producto=producto)
+    
+    def actualizar_stock(self, codigo: str, cantidad: int) -> bool:
+        """Actualiza el stock de un producto del inventario"""
+        if not self._llamar("actualizar_stock", codigo, cantidad):
+            return False
+        self.eventos.publicar("stock_cambiado", producto=self.inventario.obtener_producto(codigo))
+        return True
+    
+    def fijar_stock(self, codigo: str, stock: int) -> bool:
+        """Pone el stock de un producto a un valor, sin importar lo vendido entretanto"""
+        if not self._llamar("fijar_stock", codigo, stock):
+            return False
+        self.eventos.publicar("stock_cambiado", producto=self.inventario.obtener_producto(codigo))
+        return True
+    
+    def listar_productos_disponibles(self) -> List[Producto]:
+        """Lista los productos con stock disponible"""
+        return self.inventario.listar_disponibles()
+    
+    def generar_reporte_ventas(self) -> Dict:
+        """Genera un reporte de ventas"""
+        return self._llamar("generar_reporte_ventas")
+    
+    def ventas_por_rango(self, desde: datetime.datetime, hasta: datetime.datetime,
+                         granularidad: str = "dia", horas: Optional[Tuple[int, int]] = None) -> Dict:
+        """Ventas de pedidos entregados con fecha en [desde, hasta); ver SistemaPedidos.ventas_por_rango"""
+        resultado = self._llamar("ventas_por_rango", desde.isoformat(), hasta.isoformat(), granularidad, horas)
+        resultado["detalle"] = [(datetime.datetime.fromisoformat(inicio), *resto)
+                                for inicio, *resto in resultado["detalle"]]
+        return resultado
+    
+    def _guardar_exportacion(self, metodo: str, filename: str) -> bool:
+        """Pide una exportación al servicio y la guarda en `filename` en esta terminal"""
+        contenido = self._llamar(metodo)
+        if contenido is None:
+            return False
+        try:
+            with open(filename, "wb") as f:
+                f.write(base64.b64decode(contenido))
+            return True
+        except OSError as e:
+            print(f"Error al guardar la exportación: {e}")
+            return False
+    
+    def exportar_clientes_excel(self, filename: str = "clientes_cafeteria.xlsx", progreso=None) -> bool:
+        """Exporta la lista de clientes a Excel (el servicio no informa del progreso)"""
+        return self._guardar_exportacion("exportar_clientes_excel", filename)
+    
+    def exportar_clientes_csv(self, filename: str = "clientes_cafeteria.csv", progreso=None) -> bool:
+        """Exporta la lista de clientes a CSV (el servicio no informa del progreso)"""
+        return self._guardar_exportacion("exportar_clientes_csv", filename)
+
+class DespachadorTk:
+    """Entrega en el hilo de Tk los eventos publicados desde cualquier hilo.
+    
+    Los eventos se encolan al publicarse y se reparten desde `root.after`,
+    que es el único sitio donde es seguro tocar los widgets.
+    """
+    def __init__(self, root, bus: BusEventos, intervalo_ms: int = 50):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._cola: "queue.Queue[Evento]" = queue.Queue()
+        self._llamadas: queue.Queue = queue.Queue()  # (funcion, args) pendientes de ejecutar en el hilo de Tk
+        self._suscriptores: Dict[str, list] = {tipo: [] for tipo in TIPOS_EVENTO}
+        for tipo in TIPOS_EVENTO:
+            bus.suscribir(tipo, self._cola.put)
+        self.root.after(self.intervalo_ms, self._repartir)
+    
+    def suscribir(self, tipo: str, funcion) -> None:
+        """Llama a `funcion(evento)` en el hilo de Tk; solo desde ese hilo"""
+        self._suscriptores[tipo].append(funcion)
+    
+    def cancelar(self, tipo: str, funcion) -> None:
+        """Deja de avisar a `funcion`; solo desde el hilo de Tk"""
+        if funcion in self._suscriptores[tipo]:
+            self._suscriptores[tipo].remove(funcion)
+    
+    def llamar(self, funcion, *args) -> None:
+        """Ejecuta `funcion(*args)` en el hilo de Tk; puede llamarse desde cualquier hilo"""
+        self._llamadas.put((funcion, args))
+    
+    def _repartir(self) -> None:
+        """Reparte los eventos encolados y vuelve a programarse"""
+        try:
+            while True:
+                evento = self._cola.get_nowait()
+                for funcion in list(self._suscriptores[evento.tipo]):
+                    try:
+                        funcion(evento)
+                    except Exception as e:
+                        print(f"Error al actualizar la vista ({evento.tipo}): {e}")
+        except queue.Empty:
+            pass
+        try:
+            while True:
+                funcion, args = self._llamadas.get_nowait()
+                try:
+                    funcion(*args)
+                except Exception as e:
+                    print(f"Error al actualizar la vista: {e}")
+        except queue.Empty:
+            pass
+        self.root.after(self.intervalo_ms, self._repartir)
+
+class CacheImagenes:
+    """Imágenes abiertas y redimensionadas en un hilo aparte, guardadas por tamaño.
+    
+    `pedir(ruta, tamano, funcion)` llama a `funcion(foto)` en el hilo de Tk con la
+    imagen ajustada a `tamano`. Si ese tamaño ya está en la caché se entrega al
+    momento; si no, el hilo la prepara y el resultado se recoge con `root.after`,
+    porque las PhotoImage solo se pueden crear en el hilo de Tk. Se guardan como
+    mucho `capacidad` fotos y se descartan las que llevan más tiempo sin usarse;
+    quien muestre una foto debe guardar una referencia para que no desaparezca.
+    """
+    def __init__(self, root, capacidad: int = 32, intervalo_ms: int = 30):
+        self.root = root
+        self.capacidad = capacidad
+        self.intervalo_ms = intervalo_ms
+        self._fotos: "collections.OrderedDict[tuple, ImageTk.PhotoImage]" = collections.OrderedDict()
+        self._esperando: Dict[tuple, list] = {}  # Clave -> funciones a las que avisar
+        self._trabajos: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._resultados: queue.Queue = queue.Queue()
+        self._recogiendo = False
+        self._hilo = threading.Thread(target=self._bucle, name="CacheImagenes", daemon=True)
+        self._hilo.start()
+    
+    def pedir(self, ruta: str, tamano: Tuple[int, int], funcion, proporcional: bool = False) -> None:
+        """Pide la imagen de `ruta` a `tamano`; con `proporcional` cabe en él sin deformarse"""
+        clave = (ruta, tamano, proporcional)
+        foto = self._fotos.get(clave)
+        if foto is not None:
+            self._fotos.move_to_end(clave)
+            funcion(foto)
+            return
+        
+        if clave in self._esperando:
+            self._esperando[clave].append(funcion)
+            return
+        self._esperando[clave] = [funcion]
+        self._trabajos.put(clave)
+        if not self._recogiendo:
+            self._recogiendo = True
+            self.root.after(self.intervalo_ms, self._recoger)
+    
+    def cerrar(self) -> None:
+        """Detiene el hilo; los trabajos pendientes se abandonan"""
+        self._trabajos.put(None)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _abrir(ruta: str):
+        """Decodifica cada archivo una vez aunque se pida a varios tamaños"""
+        imagen = Image.open(ruta)
+        imagen.load()
+        return imagen
+    
+    def _bucle(self) -> None:
+        """Hilo de trabajo: abre y redimensiona las imágenes pedidas"""
+        while True:
+            clave = self._trabajos.get()
+            if clave is None:
+                return
+            ruta, (ancho, alto), proporcional = clave
+            try:
+                imagen = self._abrir(ruta)
+                if proporcional:
+                    escala = min(ancho / imagen.width, alto / imagen.height)
+                    ancho = max(1, round(imagen.width * escala))
+                    alto = max(1, round(imagen.height * escala))
+                self._resultados.put((clave, imagen.resize((ancho, alto), Image.LANCZOS), None))
+            except Exception as e:
+                self._resultados.put((clave, None, e))
+    
+    def _recoger(self) -> None:
+        """Convierte en PhotoImage lo que ha terminado el hilo y avisa a quien lo pidió"""
+        try:
+            while True:
+                clave, imagen, error = self._resultados.get_nowait()
+                funciones = self._esperando.pop(clave, [])
+                if error is not None:
+                    print(f"Error cargando la imagen {clave[0]}: {error}")
+                    continue
+                
+                foto = ImageTk.PhotoImage(imagen)
+                self._fotos[clave] = foto
+                if len(self._fotos) > self.capacidad:
+                    self._fotos.popitem(last=False)
+                for funcion in funciones:
+                    try:
+                        funcion(foto)
+                    except Exception as e:
+                        print(f"Error mostrando la imagen {clave[0]}: {e}")
+        except queue.Empty:
+            pass
+        
+        if self._esperando:
+            self.root.after(self.intervalo_ms, self._recoger)
+        else:
+            self._recogiendo = False
+
+class EjecutorTareas:
+    """Ejecuta operaciones largas en un grupo de hilos sin bloquear la ventana.
+    
+    `ejecutar` vuelve enseguida. El resultado, el error o el progreso de cada
+    tarea se entregan en el hilo de Tk desde `root.after`, que solo se programa
+    mientras hay tareas en curso. Los botones indicados quedan desactivados
+    hasta que su tarea termina.
+    """
+    def __init__(self, root, hilos: int = 2, intervalo_ms: int = 50):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._grupo = concurrent.futures.ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="Tarea")
+        self._en_curso: Dict[int, tuple] = {}  # Número -> (futuro, al_terminar, al_fallar, al_progresar, botones)
+        self._avances: queue.Queue = queue.Queue()
+        self._siguiente = 0
+        self._vigilando = False
+    
+    def ejecutar(self, tarea, *args, al_terminar=None, al_fallar=None, al_progresar=None, botones=()):
+        """Lanza `tarea(*args)` en otro hilo; solo desde el hilo de Tk.
+        
+        `al_terminar(resultado)` y `al_fallar(error)` se llaman al acabar. Con
+        `al_progresar`, la tarea recibe un argumento `progreso` al que puede
+        llamar desde su hilo; a `al_progresar` solo llega el último aviso de
+        cada vuelta.
+        """
+        self._siguiente += 1
+        numero = self._siguiente
+        kwargs = {}
+        if al_progresar is not None:
+            kwargs["progreso"] = lambda *valor: self._avances.put((numero, valor))
+        
+        for boton in botones:
+            boton.state(["disabled"])
+        futuro = self._grupo.submit(tarea, *args, **kwargs)
+        self._en_curso[numero] = (futuro, al_terminar, al_fallar, al_progresar, botones)
+        if not self._vigilando:
+            self._vigilando = True
+            self.root.after(self.intervalo_ms, self._vigilar)
+        return futuro
+    
+    def cerrar(self) -> None:
+        """No acepta más tareas; las que están en marcha terminan por su cuenta"""
+        self._grupo.shutdown(wait=False)
+    
+    def _avisar(self, funcion, *args) -> None:
+        try:
+            funcion(*args)
+        except Exception as e:
+            print(f"Error al actualizar la vista tras una tarea: {e}")
+    
+    def _vigilar(self) -> None:
+        """Entrega los avisos de progreso y los resultados de las tareas terminadas"""
+        ultimos = {}
+        try:
+            while True:
+                numero, valor = self._avances.get_nowait()
+                ultimos[numero] = valor
+        except queue.Empty:
+            pass
+        
+        for numero, (futuro, al_terminar, al_fallar, al_progresar, botones) in list(self._en_curso.items()):
+            if numero in ultimos:
+                self._avisar(al_progresar, *ultimos[numero])
+            if not futuro.done():
+                continue
+            
+            del self._en_curso[numero]
+            for boton in botones:
+                if boton.winfo_exists():
+                    boton.state(["!disabled"])
+            error = futuro.exception()
+            if error is None:
+                if al_terminar is not None:
+                    self._avisar(al_terminar, futuro.result())
+            elif al_fallar is not None:
+                self._avisar(al_fallar, error)
+            else:
+                print(f"Error en una tarea en segundo plano: {error}")
+        
+        if self._en_curso:
+            self.root.after(self.intervalo_ms, self._vigilar)
+        else:
+            self._vigilando = False
+
+class ListaVirtual(ttk.Frame):
+    """Lista con scroll que solo crea widgets para las filas visibles.
+    
+    Guarda los elementos, no sus widgets: al desplazarse reutiliza un grupo
+    pequeño de filas y las rellena con el elemento que toca. `crear_fila(padre)`
+    construye una fila vacía, `rellenar_fila(fila, elemento)` le pone los datos y
+    `clave(elemento)` identifica cada elemento. La altura de cada fila se mide la
+    primera vez que se muestra. Ordenar, filtrar o cambiar un elemento solo
+    recoloca las filas visibles, sin volver a crear widgets. Añadir, cambiar o
+    quitar un elemento lo mueve con bisect en la lista ya ordenada; solo
+    `mostrar`, `ordenar` y `filtrar` vuelven a ordenar todo.
+    """
+    SEPARACION = 10  # Espacio vertical entre filas, como el pady=5 de las listas anteriores
+    
+    def __init__(self, parent, crear_fila, rellenar_fila, clave, vacio: str = "", alto_estimado: int = 80):
+        super().__init__(parent)
+        self.crear_fila = crear_fila
+        self.rellenar_fila = rellenar_fila
+        self.clave = clave
+        self.alto_estimado = alto_estimado
+        
+        self.canvas = tk.Canvas(self, bg=COLORES["fondo"], highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda e: self._programar())
+        
+        self._vacio = ttk.Label(self.canvas, text=vacio, font=('Helvetica', 12))
+        self._id_vacio = self.canvas.create_window(0, 20, window=self._vacio, anchor="n", state="hidden")
+        
+        self._elementos: dict = {}     # Clave -> elemento, en orden de llegada
+        self._llegadas: dict = {}      # Clave -> número de llegada, para desempatar al ordenar
+        self._siguiente_llegada = 0
+        self._visibles: list = []      # Claves que pasan el filtro, en el orden mostrado
+        self._llaves: list = []        # Llaves de orden de las claves visibles, siempre ascendentes
+        self._llave_de: dict = {}      # Clave visible -> su llave en _llaves
+        self._altos: dict = {}         # Clave -> altura medida (incluida la separación)
+        self._posiciones: List[int] = [0]  # Coordenada y de cada clave visible; la última es el alto total
+        self._filas: list = []         # Filas reutilizables: [widget, id en el canvas, clave mostrada]
+        self._cambiados: set = set()   # Claves cuya fila debe rellenarse de nuevo
+        self._orden = None
+        self._inverso = False
+        self._filtro = None
+        self._programado = False
+        self._posiciones_pendientes = False
+    
+    def mostrar(self, elementos) -> None:
+        """Sustituye todos los elementos de la lista"""
+        self._elementos = {self.clave(e): e for e in elementos}
+        self._llegadas = {clave: i for i, clave in enumerate(self._elementos)}
+        self._siguiente_llegada = len(self._elementos)
+        self._altos = {}
+        self._cambiados = set(self._elementos)
+        self._recalcular()
+    
+    def actualizar(self, elemento) -> None:
+        """Añade un elemento o sustituye el que tenga su misma clave (conservando su sitio)"""
+        clave = self.clave(elemento)
+        if clave in self._llave_de:
+            self._retirar(clave)
+        if clave not in self._llegadas:
+            self._llegadas[clave] = self._siguiente_llegada
+            self._siguiente_llegada += 1
+        self._elementos[clave] = elemento
+        self._altos.pop(clave, None)
+        self._cambiados.add(clave)
+        if self._filtro is None or self._filtro(elemento):
+            self._colocar(clave)
+        self._programar(posiciones=True)
+    
+    def quitar(self, clave) -> None:
+        """Quita el elemento con esa clave, si está"""
+        if self._elementos.pop(clave, None) is not None:
+            del self._llegadas[clave]
+            self._altos.pop(clave, None)
+            if clave in self._llave_de:
+                self._retirar(clave)
+            self._programar(posiciones=True)
+    
+    def ordenar(self, orden=None, inverso: bool = False) -> None:
+        """Ordena por `orden(elemento)`; sin orden se muestran en orden de llegada"""
+        self._orden, self._inverso = orden, inverso
+        self._recalcular()
+    
+    def filtrar(self, filtro=None) -> None:
+        """Muestra solo los elementos para los que `filtro(elemento)` es cierto"""
+        self._filtro = filtro
+        self._recalcular()
+    
+    def __contains__(self, clave) -> bool:
+        return clave in self._elementos
+    
+    def __len__(self) -> int:
+        return len(self._visibles)
+    
+    def _llave(self, clave) -> tuple:
+        """Llave de orden ascendente de una clave; la llegada desempata y la hace única.
+        
+        Con `inverso` se muestra al revés, así que la llegada va negada para que
+        los empates sigan en orden de llegada, como con sort(reverse=True).
+        """
+        llegada = self._llegadas[clave]
+        if self._orden is None:
+            return (llegada,)
+        return (self._orden(self._elementos[clave]), -llegada if self._inverso else llegada)
+    
+    def _colocar(self, clave) -> None:
+        """Inserta una clave visible en su sitio sin reordenar las demás"""
+        llave = self._llave(clave)
+        indice = bisect.bisect_left(self._llaves, llave)
+        self._llaves.insert(indice, llave)
+        self._llave_de[clave] = llave
+        if self._inverso:
+            indice = len(self._llaves) - 1 - indice
+        self._visibles.insert(indice, clave)
+    
+    def _retirar(self, clave) -> None:
+        """Saca una clave visible de la lista ordenada"""
+        indice = bisect.bisect_left(self._llaves, self._llave_de.pop(clave))
+        del self._llaves[indice]
+        if self._inverso:
+            indice = len(self._llaves) - indice
+        del self._visibles[indice]
+    
+    def _recalcular(self) -> None:
+        """Vuelve a filtrar y ordenar todas las claves; las filas se recolocan en idle"""
+        claves = [c for c, e in self._elementos.items() if self._filtro is None or self._filtro(e)]
+        self._llave_de = {clave: self._llave(clave) for clave in claves}
+        claves.sort(key=self._llave_de.__getitem__)
+        self._llaves = [self._llave_de[clave] for clave in claves]
+        if self._inverso:
+            claves.reverse()
+        self._visibles = claves
+        self._programar(posiciones=True)
+    
+    def _recalcular_posiciones(self) -> None:
+        """Acumula las alturas de las filas visibles; las no medidas usan la media de las medidas"""
+        estimado = (sum(self._altos.values()) // len(self._altos)) if self._altos else self.alto_estimado
+        posiciones = [0]
+        y = 0
+        for clave in self._visibles:
+            y += self._altos.get(clave, estimado)
+            posiciones.append(y)
+        self._posiciones = posiciones
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), y))
+    
+    def _desplazar(self, *args) -> None:
+        """Mueve la vista desde la barra de scroll y recoloca las filas"""
+        self.canvas.yview(*args)
+        self._redibujar()
+    
+    def _programar(self, posiciones: bool = False) -> None:
+        """Agrupa varios cambios seguidos en un solo redibujado (y un solo cálculo de posiciones)"""
+        self._posiciones_pendientes = self._posiciones_pendientes or posiciones
+        if not self._programado:
+            self._programado = True
+            self.after_idle(self._redibujar)
+    
+    def _rango_visible(self) -> Tuple[int, int]:
+        """Índices [inicio, fin) de las claves que caen en la ventana"""
+        arriba = self.canvas.canvasy(0)
+        abajo = arriba + self.canvas.winfo_height()
+        inicio = max(bisect.bisect_right(self._posiciones, arriba) - 1, 0)
+        fin = min(bisect.bisect_left(self._posiciones, abajo), len(self._visibles))
+        return inicio, fin
+    
+    def _redibujar(self) -> None:
+        """Asigna una fila a cada clave visible, mide las nuevas y oculta las que sobran"""
+        self._programado = False
+        if not self.winfo_exists():
+            # La pantalla se cerró antes de que llegara el redibujado
+            return
+        if self._posiciones_pendientes:
+            self._posiciones_pendientes = False
+            self._recalcular_posiciones()
+        # Dos pasadas como mucho: si al medir cambian las alturas, cambia lo que cabe en la ventana
+        for _ in range(2):
+            inicio, fin = self._rango_visible()
+            en_ventana = self._visibles[inicio:fin]
+            necesarias = set(en_ventana)
+            asignadas = {fila[2]: fila for fila in self._filas if fila[2] in necesarias}
+            libres = [fila for fila in self._filas if fila[2] not in necesarias]
+            ancho = max(self.canvas.winfo_width() - self.SEPARACION, 1)
+            
+            rellenadas = []
+            for posicion, clave in enumerate(en_ventana, start=inicio):
+                fila = asignadas.get(clave)
+                if fila is None:
+                    if libres:
+                        fila = libres.pop()
+                    else:
+                        widget = self.crear_fila(self.canvas)
+                        fila = [widget, self.canvas.create_window(0, 0, window=widget, anchor="nw"), None]
+                        self._filas.append(fila)
+                if fila[2] != clave or clave in self._cambiados:
+                    self.rellenar_fila(fila[0], self._elementos[clave])
+                    fila[2] = clave
+                    self._cambiados.discard(clave)
+                    rellenadas.append(fila)
+                self.canvas.coords(fila[1], self.SEPARACION // 2, self._posiciones[posicion] + self.SEPARACION // 2)
+                self.canvas.itemconfigure(fila[1], width=ancho, state="normal")
+            for fila in libres:
+                fila[2] = None
+                self.canvas.itemconfigure(fila[1], state="hidden")
+            
+            self.canvas.itemconfigure(self._id_vacio, state="hidden" if self._visibles else "normal")
+            self.canvas.coords(self._id_vacio, self.canvas.winfo_width() // 2, 20)
+            
+            if not rellenadas:
+                break
+            self.canvas.update_idletasks()
+            medidas = False
+            for fila in rellenadas:
+                alto = fila[0].winfo_reqheight() + self.SEPARACION
+                if self._altos.get(fila[2]) != alto:
+                    self._altos[fila[2]] = alto
+                    medidas = True
+            if not medidas:
+                break
+            self._recalcular_posiciones()
+
+class InterfazCafeteria:
+    """Clase para la interfaz gráfica de la cafetería"""
+    ESPERA_REDIMENSION_MS = 150  # El fondo se rehace cuando la ventana deja de cambiar de tamaño
+    INTERVALO_TABLERO_MS = 500  # Con SistemaRemoto, cada cuánto busca la gestión de pedidos cambios de otras terminales
+    MAX_ESPERA_TABLERO_MS = 30000  # Espera máxima entre reintentos si la consulta falla
+    TAMANO_MINIATURA = (96, 96)
+    
+    def __init__(self, root, sistema=None):
+        self.root = root
+        self.sistema = None
+        self.despachador = None
+        self.carrito = Carrito()
+        self.cliente_actual = None
+        self.empleado_actual = None
+        # Las cargas, guardados y exportaciones van en hilos aparte
+        self.tareas = EjecutorTareas(self.root)
+        # Cada pantalla se construye una vez y después solo se oculta y se vuelve a mostrar
+        self._pantallas: Dict[str, ttk.Frame] = {}
+        self._pantalla_actual: Optional[ttk.Frame] = None
+        # El fondo y las fotos de los productos se preparan fuera del hilo de la ventana
+        self.imagenes = CacheImagenes(self.root)
+        self._fondo_pendiente = None
+        self._tamano_fondo = None
+
+        # Configuración de la ventana principal
+        self.root.title("☕ Sistema de Gestión de Pedidos - Cafetería Dulce Aroma")
+        self.root.geometry("1000x700")
+        self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self.salir)
+
+        self.configurar_estilos()
+        
+        # Barra inferior con el avance de las tareas en segundo plano
+        self.estado_tarea = ttk.Label(self.root, anchor=tk.W, padding=(10, 2))
+        self.estado_tarea.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Sin sistema se usan los datos locales; con un SistemaRemoto, el servicio compartido
+        if sistema is not None:
+            self.iniciar(sistema)
+        else:
+            # La ventana ya responde mientras se leen los datos
+            self.mostrar_pantalla("cargando", lambda pantalla: ttk.Label(
+                pantalla, text="☕ Cargando datos...", style="Title.TLabel").pack(expand=True))
+            self.tareas.ejecutar(self.crear_sistema_local, al_terminar=self.iniciar,
+                                 al_fallar=self.error_al_cargar)
+    
+    def crear_sistema_local(self) -> SistemaPedidos:
+        """Crea el sistema con los datos de este equipo (se llama fuera del hilo de Tk)"""
+        # Las escrituras a disco se hacen en segundo plano para no congelar la ventana
+        return SistemaPedidos(almacen=AlmacenDiferido(
+            AlmacenPickle(SistemaPedidos.DATA_FILE, SistemaPedidos.JOURNAL_FILE)))
+    
+    def iniciar(self, sistema):
+        """Empieza a usar el sistema ya cargado y muestra la pantalla de inicio"""
+        self.sistema = sistema
+        # Las vistas se actualizan fila a fila con los eventos del sistema
+        self.despachador = DespachadorTk(self.root, self.sistema.eventos)
+        # Con SistemaRemoto los avisos pueden llegar desde una tarea en segundo plano
+        self.sistema.avisar = self.avisar
+        self.mostrar_pantalla_inicio()
+    
+    def avisar(self, titulo: str, mensaje: str):
+        """Muestra un aviso del sistema; desde otro hilo lo pasa antes al hilo de Tk"""
+        if threading.current_thread() is threading.main_thread():
+            messagebox.showwarning(titulo, mensaje, parent=self.root)
+        else:
+            self.despachador.llamar(self.avisar, titulo, mensaje)
+    
+    def consultar(self, operacion, *args, al_terminar, botones=()):
+        """Llama a una operación del sistema sin congelar la ventana.
+        
+        Con SistemaRemoto cada operación es una petición de red: va a
+        EjecutorTareas y `al_terminar(resultado)` llega después en el hilo de Tk.
+        El sistema local responde al momento, así que se llama directamente.
+        """
+        if isinstance(self.sistema, SistemaRemoto):
+            self.tareas.ejecutar(operacion, *args, al_terminar=al_terminar,
+                                 al_fallar=self.error_operacion, botones=botones)
+        else:
+            al_terminar(operacion(*args))
+    
+    def error_operacion(self, error: Exception):
+        """Avisa de que una operación con el servicio no se pudo completar"""
+        print(f"Error al comunicarse con el servicio: {error}")
+        messagebox.showerror("Error", f"No se pudo completar la operación.\n\n{error}", parent=self.root)
+    
+    def error_al_cargar(self, error: Exception):
+        """Avisa de que los datos no se pudieron cargar y cierra la ventana"""
+        if isinstance(error, ErrorDatosCorruptos):
+            messagebox.showerror(
+                "Datos dañados",
+                f"No se pudieron cargar los datos guardados y no se han modificado.\n\n{error}",
+                parent=self.root
+            )
+        else:
+            print(f"Error al cargar los datos: {error}")
+            messagebox.showerror("Error", f"No se pudieron cargar los datos.\n\n{error}", parent=self.root)
+        self.tareas.cerrar()
+        self.imagenes.cerrar()
+        self.root.destroy()
+    
+    def mostrar_progreso(self, texto: str, hechos: int, total: int):
+        """Muestra en la barra inferior cómo va una tarea en segundo plano"""
+        porcentaje = hechos * 100 // total if total else 100
+        self.estado_tarea.configure(text=f"{texto} {hechos}/{total} ({porcentaje}%)")
+    
+    def configurar_estilos(self):
+        """Configura los estilos visuales de la aplicación"""
+        style = ttk.Style()
+        
+        # Configurar tema general
+        style.theme_use('clam')
+        
+        # Configurar colores y fuentes
+        style.configure('.', background=COLORES["fondo"], foreground=COLORES["texto"])
+        style.configure('TFrame', background=COLORES["fondo"])
+        style.configure('TLabel', background=COLORES["fondo"], foreground=COLORES["texto"], font=('Helvetica', 10))
+        style.configure('TButton', background=COLORES["primario"], foreground='white', 
+                       font=('Helvetica', 10, 'bold'), padding=10, borderwidth=0)
+        style.configure('TEntry', fieldbackground='white', foreground=COLORES["texto"])
+        style.configure('TNotebook', background=COLORES["fondo"])
+        style.configure('TNotebook.Tab', background=COLORES["secundario"], foreground='white', 
+                       padding=[10, 5], font=('Helvetica', 10, 'bold'))
+        
+        # Estilos personalizados
+        style.configure('Title.TLabel', font=('Helvetica', 20, 'bold'), foreground=COLORES["primario"])
+        style.configure('Header.TLabel', font=('Helvetica', 14, 'bold'), foreground=COLORES["primario"])
+        style.configure('Success.TLabel', foreground=COLORES["exito"])
+        style.configure('Error.TLabel', foreground=COLORES["error"])
+        
+        # Estilo para botones importantes
+        style.map('Primary.TButton',
+                 background=[('active', COLORES["secundario"]), ('!disabled', COLORES["primario"])],
+                 foreground=[('!disabled', 'white')])
+        
+        # Estilo para botones secundarios
+        style.map('Secondary.TButton',
+                 background=[('active', COLORES["acento"]), ('!disabled', COLORES["secundario"])],
+                 foreground=[('!disabled', 'white')])
+        
+        # Configurar el Listbox
+        self.root.option_add('*Listbox*Background', 'white')
+        self.root.option_add('*Listbox*Foreground', COLORES["texto"])
+        self.root.option_add('*Listbox*selectBackground', COLORES["primario"])
+        self.root.option_add('*Listbox*selectForeground', 'white')
+
+    def salir(self):
+        """Guarda los cambios pendientes en segundo plano y cierra la aplicación al terminar"""
+        self.imagenes.cerrar()
+        if self.sistema is None:
+            # Aún cargando: no hay nada que guardar
+            self.root.quit()
+            return
+        
+        self.root.protocol("WM_DELETE_WINDOW", lambda: None)
+        self.estado_tarea.configure(text="Guardando datos...")
+        self.tareas.ejecutar(self.sistema.cerrar, al_terminar=lambda _: self.root.quit(),
+                             al_fallar=self.error_al_salir, botones=(self._boton_salir,))
+    
+    def error_al_salir(self, error: Exception):
+        """Avisa de que no se pudieron guardar los últimos cambios y cierra igualmente"""
+        print(f"Error al guardar los datos: {error}")
+        messagebox.showerror("Error", f"No se pudieron guardar los últimos cambios.\n\n{error}", parent=self.root)
+        self.root.quit()
+
+    def mostrar_pantalla(self, nombre: str, construir, refrescar=None, padding=20):
+        """Muestra la pantalla `nombre`, construyéndola con `construir(main_frame)` la primera vez.
+        
+        Las pantallas no se destruyen al salir de ellas: se ocultan, y al volver
+        `refrescar()` pone al día solo los widgets que dependen de los datos.
+        """
+        pantalla = self._pantallas.get(nombre)
+        if pantalla is None:
+            pantalla = ttk.Frame(self.root, padding=padding)
+            construir(pantalla)
+            self._pantallas[nombre] = pantalla
+        
+        if pantalla is not self._pantalla_actual:
+            if self._pantalla_actual is not None:
+                self._pantalla_actual.pack_forget()
+            pantalla.pack(expand=True, fill=tk.BOTH)
+            self._pantalla_actual = pantalla
+        
+        if refrescar is not None:
+            refrescar()
+    
+    def escuchar(self, tipos, funcion):
+        """Suscribe una pantalla a eventos del sistema; como la pantalla no se destruye, no se cancela"""
+        for tipo in tipos:
+            self.despachador.suscribir(tipo, funcion)
+    
+    def vaciar_campos(self, *campos):
+        """Borra el texto de los campos de un formulario ya construido"""
+        for campo in campos:
+            campo.delete(0, tk.END)
+    
+
+    def mostrar_pantalla_inicio(self):
+        """Muestra la pantalla de bienvenida"""
+        self.mostrar_pantalla("inicio", self.construir_pantalla_inicio, padding=0)
+    
+    def construir_pantalla_inicio(self, pantalla):
+        """Construye la pantalla de bienvenida"""
+        # Crear un Canvas como contenedor principal (para el fondo)
+        canvas = tk.Canvas(pantalla, highlightthickness=0, bg=COLORES["fondo"])
+        canvas.pack(expand=True, fill=tk.BOTH)
+
+        # La imagen de fondo llega en segundo plano y sigue el tamaño de la ventana;
+        # mientras tanto, o si no se puede abrir, se ve el color de fondo
+        self._fondo = canvas.create_image(0, 0, anchor="nw")
+        canvas.bind("<Configure>", lambda evento: self.programar_fondo(canvas, evento.width, evento.height))
+
+        # Frame principal para los widgets (con fondo semitransparente)
+        main_frame = ttk.Frame(canvas, style='TFrame')
+        main_frame.place(relx=0.5, rely=0.5, anchor="center")  # Centrado
+
+        # Logo y título
+        logo_frame = ttk.Frame(main_frame)
+        logo_frame.pack(pady=(20, 10))
+
+        ttk.Label(logo_frame, text="☕", font=('Helvetica', 60), foreground=COLORES["primario"]).pack()
+        ttk.Label(logo_frame, text="Cafetería Dulce Aroma", style="Title.TLabel").pack(pady=10)
+
+        # Botones principales
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=30, fill=tk.X, padx=50)
+
+        ttk.Button(btn_frame, text="Realizar Pedido", command=self.mostrar_identificacion_cliente, 
+              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
+        ttk.Button(btn_frame, text="Ver Pedidos", command=self.mostrar_lista_pedidos, 
+              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
+        ttk.Button(btn_frame, text="Soy Empleado", command=self.mostrar_login_empleado, 
+              style="Primary.TButton").pack(fill=tk.X, pady=10, ipady=10)
+        self._boton_salir = ttk.Button(btn_frame, text="Salir", command=self.salir, 
+              style="Secondary.TButton")
+        self._boton_salir.pack(fill=tk.X, pady=10, ipady=10)
+
+        # Pie de página
+        footer = ttk.Frame(main_frame)
+        footer.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
+        ttk.Label(footer, text="© 2025 Cafetería Dulce Aroma", anchor=tk.CENTER).pack()
+
+    def programar_fondo(self, canvas, ancho: int, alto: int):
+        """Pide el fondo al nuevo tamaño cuando pasa un rato sin cambios de tamaño"""
+        if self._fondo_pendiente is not None:
+            self.root.after_cancel(self._fondo_pendiente)
+        self._fondo_pendiente = self.root.after(
+            self.ESPERA_REDIMENSION_MS, lambda: self.pedir_fondo(canvas, ancho, alto))
+    
+    def pedir_fondo(self, canvas, ancho: int, alto: int):
+        """Muestra el fondo a `ancho` x `alto` en cuanto esté listo"""
+        self._fondo_pendiente = None
+        if ancho < 2 or alto < 2:
+            return
+        self._tamano_fondo = (ancho, alto)
+        
+        def mostrar(foto):
+            # Si la ventana ha vuelto a cambiar mientras tanto, ya hay otro tamaño en camino
+            if self._tamano_fondo == (ancho, alto):
+                canvas.itemconfigure(self._fondo, image=foto)
+                canvas.foto = foto
+        self.imagenes.pedir(FONDO_INICIO, (ancho, alto), mostrar)
+    
+    def mostrar_lista_pedidos(self):
+        """Muestra la lista de pedidos del cliente actual"""
+        if not self.cliente_actual:
+            messagebox.showwarning("Error", "Debe identificarse como cliente primero", parent=self.root)
+            self.mostrar_identificacion_cliente()
+            return
+        
+        self.mostrar_pantalla("lista_pedidos", self.construir_lista_pedidos, self.refrescar_lista_pedidos)
+    
+    def construir_lista_pedidos(self, main_frame):
+        """Construye la pantalla de pedidos del cliente"""
+        # Título
+        self._titulo_lista_pedidos = ttk.Label(main_frame, style="Title.TLabel")
+        self._titulo_lista_pedidos.pack(pady=10)
+        
+        # Lista de pedidos, del más reciente al más antiguo
+        self._lista_cliente = ListaVirtual(
+            main_frame,
+            self.crear_fila_resumen_pedido,
+            self.rellenar_fila_resumen_pedido,
+            clave=lambda p: p.numero,
+            vacio="No hay pedidos registrados"
+        )
+        self._lista_cliente.pack(fill=tk.BOTH, expand=True, pady=10)
+        self._lista_cliente.ordenar(lambda p: p.fecha, inverso=True)
+        
+        self.escuchar(("pedido_creado", "pedido_modificado", "pedido_eliminado", "estado_cambiado"),
+                      self.actualizar_resumen_pedido)
+        
+        # Botón volver
+        ttk.Button(
+            main_frame, 
+            text="Volver", 
+            command=self.mostrar_pantalla_inicio,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def refrescar_lista_pedidos(self):
+        """Pone la pantalla de pedidos al día con el cliente actual"""
+        cliente = self.cliente_actual
+        self._titulo_lista_pedidos.configure(text=f"📋 Mis Pedidos - {cliente.nombre}")
+        
+        def mostrar(pedidos):
+            # Si mientras tanto se cambió de cliente, la respuesta ya no sirve
+            if self.cliente_actual is cliente:
+                self._lista_cliente.mostrar(pedidos)
+        
+        self.consultar(self.sistema.historial_cliente, cliente.identificacion, al_terminar=mostrar)
+    
+    def actualizar_resumen_pedido(self, evento: Evento):
+        """Actualiza solo la fila del pedido afectado en la vista de pedidos del cliente"""
+        pedido = evento.datos["pedido"]
+        if self.cliente_actual is None or pedido.cliente.identificacion != self.cliente_actual.identificacion:
+            return
+        
+        if evento.tipo == "pedido_eliminado":
+            self._lista_cliente.quitar(pedido.numero)
+        else:
+            self._lista_cliente.actualizar(pedido)
+    
+    def crear_fila_resumen_pedido(self, parent):
+        """Crea una fila vacía para el resumen de un pedido (ver rellenar_fila_resumen_pedido)"""
+        fila = ttk.Frame(
+            parent, 
+            borderwidth=2, 
+            relief="groove", 
+            padding=10
+        )
+        
+        # Encabezado del pedido
+        header_frame = ttk.Frame(fila)
+        header_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        fila.titulo = ttk.Label(header_frame, font=('Helvetica', 12, 'bold'))
+        fila.titulo.pack(side=tk.LEFT)
+        
+        fila.estado = ttk.Label(header_frame, font=('Helvetica', 12, 'bold'))
+        fila.estado.pack(side=tk.RIGHT)
+        
+        # Productos del pedido, uno por línea
+        fila.productos = ttk.Label(fila, font=('Helvetica', 10), justify=tk.LEFT)
+        fila.productos.pack(anchor=tk.W, padx=10)
+        
+        # Total del pedido
+        fila.total = ttk.Label(fila, font=('Helvetica', 11, 'bold'))
+        fila.total.pack(anchor=tk.E, pady=(5, 0))
+        
+        # Frame para botones de acción
+        btn_frame = ttk.Frame(fila)
+        btn_frame.pack(pady=(5, 0))
+        
+        # Botón para ver detalles (siempre visible)
+        fila.detalles = ttk.Button(btn_frame, text="Ver Detalles", style="Secondary.TButton")
+        fila.detalles.pack(side=tk.LEFT, padx=5)
+        
+        # Botón "Ya lo recibí": solo se muestra en pedidos entregados
+        fila.recibido = ttk.Button(btn_frame, text="✅ Ya lo recibí", style="Success.TButton")
+        
+        # Botón para eliminar pedido (visible para todos los estados)
+        fila.eliminar = ttk.Button(btn_frame, text="🗑️ Eliminar", style="Error.TButton")
+        fila.eliminar.pack(side=tk.LEFT, padx=5)
+        return fila
+    
+    def rellenar_fila_resumen_pedido(self, fila, pedido: Pedido):
+        """Muestra un pedido en una fila creada por crear_fila_resumen_pedido"""
+        estado_color = {
+            "Nuevo": COLORES["info"],
+            "En preparación": COLORES["advertencia"],
+            "Entregado": COLORES["exito"]
+        }.get(pedido.estado, COLORES["texto"])
+        
+        fila.titulo.configure(text=f"Pedido #{pedido.numero} - {pedido.fecha.strftime('%d/%m/%Y %H:%M')}")
+        fila.estado.configure(text=pedido.estado, foreground=estado_color)
+        fila.productos.configure(text="\n".join(f"• {item}" for item in pedido.productos))
+        fila.total.configure(text=f"Total: {formatear_dinero(pedido.total)}")
+        
+        fila.detalles.configure(command=lambda p=pedido: self.mostrar_detalle_pedido(p))
+        fila.recibido.configure(command=lambda p=pedido: self.confirmar_recepcion(p))
+        fila.eliminar.configure(command=lambda p=pedido: self.eliminar_pedido(p, fila.eliminar))
+        if pedido.estado == "Entregado":
+            fila.recibido.pack(side=tk.LEFT, padx=5, before=fila.eliminar)
+        else:
+            fila.recibido.pack_forget()
+
+    def confirmar_recepcion(self, pedido: Pedido):
+        """Confirma la recepción de un pedido entregado"""
+        if messagebox.askyesno(
+            "Confirmar recepción", 
+            f"¿Confirmas que has recibido el pedido #{pedido.numero}?", 
+            parent=self.root
+        ):
+            # En un sistema real, aquí podríamos marcar el pedido como recibido
+            # Por ahora simplemente lo eliminaremos
+            self.eliminar_pedido(pedido, al_eliminar=lambda: messagebox.showinfo(
+                "Confirmado", 
+                f"Pedido #{pedido.numero} marcado como recibido", 
+                parent=self.root
+            ))
+
+    def eliminar_pedido(self, pedido: Pedido, boton=None, al_eliminar=None):
+        """Elimina un pedido del historial del cliente"""
+        if messagebox.askyesno(
+            "Eliminar pedido", 
+            f"¿Estás seguro de eliminar el pedido #{pedido.numero}?\nEsta acción no se puede deshacer.", 
+            parent=self.root
+        ):
+            def eliminado(_):
+                messagebox.showinfo(
+                    "Éxito", 
+                    f"Pedido #{pedido.numero} eliminado correctamente", 
+                    parent=self.root
+                )
+                if al_eliminar is not None:
+                    al_eliminar()
+            
+            # Eliminar el pedido del sistema y del historial del cliente
+            self.consultar(self.sistema.eliminar_pedido, pedido, al_terminar=eliminado,
+                           botones=(boton,) if boton else ())
+
+    def mostrar_detalle_pedido(self, pedido: Pedido):
+        """Muestra el detalle completo de un pedido"""
+        self._pedido_detalle = pedido
+        self.mostrar_pantalla("detalle_pedido", self.construir_detalle_pedido, self.refrescar_detalle_pedido)
+    
+    def construir_detalle_pedido(self, main_frame):
+        """Construye la pantalla de detalle; los datos del pedido los pone refrescar_detalle_pedido"""
+        # Título
+        self._detalle_titulo = ttk.Label(main_frame, style="Title.TLabel")
+        self._detalle_titulo.pack(pady=10)
+        
+        # Frame de detalles
+        detalles_frame = ttk.Frame(
+            main_frame, 
+            padding=15, 
+            relief=tk.RAISED, 
+            borderwidth=2
+        )
+        detalles_frame.pack(pady=10, fill=tk.X)
+        
+        # Información del pedido
+        self._detalle_cliente = ttk.Label(detalles_frame, font=('Helvetica', 12))
+        self._detalle_cliente.pack(anchor=tk.W, pady=5)
+        
+        self._detalle_fecha = ttk.Label(detalles_frame, font=('Helvetica', 12))
+        self._detalle_fecha.pack(anchor=tk.W, pady=5)
+        
+        self._detalle_estado = ttk.Label(detalles_frame, font=('Helvetica', 12, 'bold'))
+        self._detalle_estado.pack(anchor=tk.W, pady=5)
+        
+        # Lista de productos
+        self._detalle_productos = ttk.LabelFrame(
+            main_frame, 
+            text="🍽️ Productos en el Pedido",
+            padding=10
+        )
+        self._detalle_productos.pack(fill=tk.BOTH, pady=10)
+        
+        # Total del pedido
+        self._detalle_total = ttk.Label(
+            main_frame, 
+            style="Header.TLabel",
+            font=('Helvetica', 14, 'bold')
+        )
+        self._detalle_total.pack(anchor=tk.E, pady=10, padx=20)
+        
+        # Botones de acción
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(
+            btn_frame, 
+            text="🔄 Volver al Menú", 
+            command=self.mostrar_menu_productos,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            btn_frame, 
+            text="🏠 Volver al Inicio", 
+            command=self.mostrar_pantalla_inicio,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=5)
+    
+    def refrescar_detalle_pedido(self):
+        """Muestra el pedido elegido en la pantalla de detalle"""
+        pedido = self._pedido_detalle
+        
+        estado_color = {
+            "Nuevo": COLORES["info"],
+            "En preparación": COLORES["advertencia"],
+            "Entregado": COLORES["exito"]
+        }.get(pedido.estado, COLORES["texto"])
+        
+        self._detalle_titulo.configure(text=f"📝 Detalle del Pedido #{pedido.numero}")
+        self._detalle_cliente.configure(text=f"👤 Cliente: {pedido.cliente.nombre}")
+        self._detalle_fecha.configure(text=f"📅 Fecha: {pedido.fecha.strftime('%Y-%m-%d %H:%M:%S')}")
+        self._detalle_estado.configure(text=f"🔄 Estado: {pedido.estado}", foreground=estado_color)
+        self._detalle_total.configure(text=f"💰 Total: {formatear_dinero(pedido.total)}")
+        
+        # Las líneas del pedido cambian de un pedido a otro; son pocas y se rehacen
+        for widget in self._detalle_productos.winfo_children():
+            widget.destroy()
+        
+        for item in pedido.productos:
+            producto_frame = ttk.Frame(self._detalle_productos)
+            producto_frame.pack(fill=tk.X, pady=2)
+            
+            ttk.Label(
+                producto_frame, 
+                text=f"• {item.cantidad}x {item.producto.nombre} - {formatear_dinero(item.producto.precio)} c/u", 
+                font=('Helvetica', 10, 'bold')
+            ).pack(anchor=tk.W)
+            
+            # Mostrar opciones personalizadas si existen
+            if item.tipo_leche or item.azucar or item.notas:
+                opciones_frame = ttk.Frame(producto_frame, padding=(10, 0))
+                opciones_frame.pack(anchor=tk.W)
+                
+                if item.tipo_leche:
+                    ttk.Label(
+                        opciones_frame, 
+                        text=f"Leche: {item.tipo_leche}", 
+                        font=('Helvetica', 9)
+                    ).pack(side=tk.LEFT, padx=5)
+                
+                if item.azucar:
+                    ttk.Label(
+                        opciones_frame, 
+                        text=f"Azúcar: {item.azucar}", 
+                        font=('Helvetica', 9)
+                    ).pack(side=tk.LEFT, padx=5)
+                
+                if item.notas:
+                    ttk.Label(
+                        opciones_frame, 
+                        text=f"Notas: {item.notas}", 
+                        font=('Helvetica', 9)
+                    ).pack(side=tk.LEFT, padx=5)
+    
+    def mostrar_identificacion_cliente(self):
+        """Muestra la pantalla para identificar al cliente"""
+        self.mostrar_pantalla("identificacion_cliente", self.construir_identificacion_cliente,
+                              lambda: self.vaciar_campos(self._id_cliente_entry))
+    
+    def construir_identificacion_cliente(self, main_frame):
+        """Construye la pantalla para identificar al cliente"""
+        # Título
+        ttk.Label(main_frame, text="Identificación del Cliente", style="Title.TLabel").pack(pady=10)
+        
+        # Frame del formulario
+        form_frame = ttk.Frame(main_frame, padding=20, relief=tk.RAISED, borderwidth=2)
+        form_frame.pack(pady=20, ipadx=20, ipady=20)
+        
+        # Etiqueta y campo de entrada
+        ttk.Label(form_frame, text="Identificación:", font=('Helvetica', 12)).grid(row=0, column=0, pady=10, sticky=tk.W)
+        id_entry = self._id_cliente_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
+        id_entry.grid(row=0, column=1, pady=10, padx=10)
+        
+        # Botones
+        btn_frame = ttk.Frame(form_frame)
+        btn_frame.grid(row=1, column=0, columnspan=2, pady=20)
+        
+        self._boton_buscar_cliente = ttk.Button(btn_frame, text="Buscar", command=lambda: self.buscar_cliente(id_entry.get()), 
+                  style="Primary.TButton")
+        self._boton_buscar_cliente.pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="Nuevo Cliente", command=self.mostrar_registro_cliente, 
+                  style="Secondary.TButton").pack(side=tk.LEFT, padx=10)
+        
+        # Botón volver
+        ttk.Button(main_frame, text="Volver", command=self.mostrar_pantalla_inicio, 
+                  style="Secondary.TButton").pack(side=tk.BOTTOM, pady=10)
+    
+    def buscar_cliente(self, id_cliente):
+        """Busca un cliente en el sistema"""
+        if not id_cliente:
+            messagebox.showwarning("Error", "Por favor ingrese una identificación", parent=self.root)
+            return
+        
+        def encontrado(cliente):
+            if cliente:
+                self.cliente_actual = cliente
+                messagebox.showinfo("Bienvenido", f"¡Bienvenido/a {cliente.nombre}!", parent=self.root)
+                self.mostrar_menu_productos()
+            else:
+                if messagebox.askyesno("Cliente No Encontrado", 
+                                      "No se encontró el cliente. ¿Desea registrarse?", 
+                                      parent=self.root):
+                    self.mostrar_registro_cliente()
+        
+        self.consultar(self.sistema.buscar_cliente, id_cliente, al_terminar=encontrado,
+                       botones=(self._boton_buscar_cliente,))
+    
+    def mostrar_registro_cliente(self):
+        """Muestra el formulario de registro de cliente"""
+        self.mostrar_pantalla("registro_cliente", self.construir_registro_cliente,
+                              lambda: self.vaciar_campos(*self._campos_registro))
+    
+    def construir_registro_cliente(self, main_frame):
+        """Construye el formulario de registro de cliente"""
+        ttk.Label(main_frame, text="Registro de Cliente", style="Title.TLabel").pack(pady=10)
+        
+        # Frame del formulario
+        form_frame = ttk.Frame(main_frame, padding=20, relief=tk.RAISED, borderwidth=2)
+        form_frame.pack(pady=20, ipadx=20, ipady=20)
+        
+        # Campos del formulario
+        ttk.Label(form_frame, text="Identificación:", font=('Helvetica', 12)).grid(row=0, column=0, pady=10, sticky=tk.W)
+        id_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
+        id_entry.grid(row=0, column=1, pady=10, padx=10)
+        
+        ttk.Label(form_frame, text="Nombre:", font=('Helvetica', 12)).grid(row=1, column=0, pady=10, sticky=tk.W)
+        nombre_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
+        nombre_entry.grid(row=1, column=1, pady=10, padx=10)
+        
+        ttk.Label(form_frame, text="Teléfono:", font=('Helvetica', 12)).grid(row=2, column=0, pady=10, sticky=tk.W)
+        telefono_entry = ttk.Entry(form_frame, font=('Helvetica', 12), width=30)
+        telefono_entry.grid(row=2, column=1, pady=10, padx=10)
+        self._campos_registro = (id_entry, nombre_entry, telefono_entry)
+        
+        # Botón registrar
+        self._boton_registrar_cliente = ttk.Button(form_frame, text="Registrar", 
+                  command=lambda: self.registrar_cliente(
+                      id_entry.get(), nombre_entry.get(), telefono_entry.get()
+                  ), style="Primary.TButton"
+                  )
+        self._boton_registrar_cliente.grid(row=3, column=0, columnspan=2, pady=20, sticky=tk.EW)
+        
+        # Botón volver
+        ttk.Button(main_frame, text="Volver", command=self.mostrar_identificacion_cliente, 
+                  style="Secondary.TButton").pack(side=tk.BOTTOM, pady=10)
+    
+    def registrar_cliente(self, id_cliente, nombre, telefono):
+        """Registra un nuevo cliente en el sistema"""
+        if not id_cliente or not nombre or not telefono:
+            messagebox.showwarning("Error", "Todos los campos son obligatorios", parent=self.root)
+            return
+        
+        def registrado(cliente):
+            if cliente is None:
+                messagebox.showwarning("Error", "Ya existe un cliente con esa identificación", parent=self.root)
+                return
+            self.cliente_actual = cliente
+            messagebox.showinfo("Éxito", "Cliente registrado correctamente", parent=self.root)
+            self.mostrar_menu_productos()
+        
+        # El sistema rechaza la identificación repetida, también si otra terminal la registró antes
+        self.consultar(self.sistema.registrar_cliente, nombre, telefono, id_cliente, al_terminar=registrado,
+                       botones=(self._boton_registrar_cliente,))
+    
+    def mostrar_menu_productos(self):
+        """Muestra el menú de productos disponibles"""
+        self.mostrar_pantalla("menu_productos", self.construir_menu_productos,
+                              self.refrescar_menu_productos, padding=10)
+    
+    def construir_menu_productos(self, main_frame):
+        """Construye el menú con una tarjeta por producto"""
+        # Título y info del cliente
+        ttk.Label(main_frame, text="Menú de Productos", style="Title.TLabel").pack(pady=5)
+        self._cliente_menu = ttk.Label(main_frame, style="Header.TLabel")
+        self._cliente_menu.pack()
+        
+        # Notebook para pestañas de productos
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(expand=True, fill=tk.BOTH, pady=10)
+        
+        # Código de producto -> su tarjeta; clase -> grid de su pestaña
+        self._tarjetas: Dict[str, ttk.Frame] = {}
+        self._grids_menu: Dict[type, ttk.Frame] = {}
+        
+        # Las pestañas empiezan vacías: refrescar_menu_productos pide los productos y crea sus tarjetas
+        # Pestaña Bebidas
+        bebidas_tab = ttk.Frame(notebook)
+        notebook.add(bebidas_tab, text="☕ Bebidas")
+        self._grids_menu[Bebida] = self.crear_productos_tab(bebidas_tab, [])
+        
+        # Pestaña Postres
+        postres_tab = ttk.Frame(notebook)
+        notebook.add(postres_tab, text="🍰 Postres")
+        self._grids_menu[Postre] = self.crear_productos_tab(postres_tab, [])
+        
+        # Frame para carrito
+        carrito_frame = ttk.LabelFrame(main_frame, text="🛒 Carrito de Compras", padding=10)
+        carrito_frame.pack(fill=tk.X, pady=10)
+        
+        # Listbox para el carrito con scrollbar
+        self.carrito_listbox = tk.Listbox(
+            carrito_frame, 
+            height=5, 
+            font=('Helvetica', 10),
+            selectbackground=COLORES["primario"],
+            selectforeground='white'
+        )
+        self.carrito_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        scrollbar = ttk.Scrollbar(carrito_frame, orient=tk.VERTICAL, command=self.carrito_listbox.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.carrito_listbox.config(yscrollcommand=scrollbar.set)
+        
+        # Label para el total
+        self.total_label = ttk.Label(
+            main_frame, 
+            style="Header.TLabel",
+            font=('Helvetica', 12, 'bold')
+        )
+        self.total_label.pack(anchor=tk.E, padx=20)
+        
+        # Botones de acción
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=10, fill=tk.X, padx=20)
+        
+        ttk.Button(
+            btn_frame, 
+            text="❌ Eliminar Seleccionado", 
+            command=self.eliminar_del_carrito,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self._boton_realizar_pedido = ttk.Button(
+            btn_frame, 
+            text="✅ Realizar Pedido", 
+            command=self.finalizar_pedido,
+            style="Primary.TButton"
+        )
+        self._boton_realizar_pedido.pack(side=tk.RIGHT, padx=5)
+        
+        ttk.Button(
+            btn_frame, 
+            text="↩️ Volver", 
+            command=self.mostrar_pantalla_inicio,
+            style="Secondary.TButton"
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        self.escuchar(("stock_cambiado",), lambda evento: self.actualizar_tarjeta(evento.datos["producto"]))
+    
+    def refrescar_menu_productos(self):
+        """Empieza un carrito nuevo y pone al día solo las tarjetas cuyo producto cambió"""
+        self._cliente_menu.configure(text=f"Cliente: {self.cliente_actual.nombre}")
+        self.carrito.vaciar()
+        self.actualizar_carrito()
+        
+        def actualizar_tarjetas(productos):
+            for producto in productos:
+                self.actualizar_tarjeta(producto)
+        
+        self.consultar(self.sistema.inventario.listar_productos, al_terminar=actualizar_tarjetas)
+    
+    def crear_productos_tab(self, tab, productos):
+        """Crea una pestaña con los productos y devuelve el grid de sus tarjetas"""
+        # Frame contenedor con scroll
+        container = ttk.Frame(tab)
+        container.pack(fill=tk.BOTH, expand=True)
+        
+        # Canvas y scrollbar
+        canvas = tk.Canvas(container, bg=COLORES["fondo"], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Layout
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Una tarjeta por producto; solo se colocan en el grid las que tienen stock
+        scrollable_frame.tarjetas = []
+        for producto in productos:
+            self.crear_tarjeta_producto(scrollable_frame, producto)
+        self.colocar_tarjetas(scrollable_frame)
+        return scrollable_frame
+    
+    def crear_tarjeta_producto(self, grid, producto):
+        """Crea la tarjeta de un producto en el grid de su pestaña (ver rellenar_tarjeta_producto)"""
+        tarjeta = ttk.Frame(
+            grid, 
+            borderwidth=2, 
+            relief="solid", 
+            padding=10,
+            style='TFrame'
+        )
+        
+        # Nombre y precio
+        tarjeta.nombre = ttk.Label(
+            tarjeta, 
+            style="Header.TLabel",
+            font=('Helvetica', 12, 'bold')
+        )
+        tarjeta.nombre.pack()
+        
+        # "Imagen" (emoji)
+        tarjeta.imagen = ttk.Label(
+            tarjeta, 
+            font=('Helvetica', 36),
+            foreground=COLORES["primario"]
+        )
+        tarjeta.imagen.pack(pady=5)
+        
+        # Detalles específicos
+        detalles_frame = ttk.Frame(tarjeta)
+        detalles_frame.pack(fill=tk.X, pady=5)
+        
+        tarjeta.detalle = ttk.Label(detalles_frame)
+        tarjeta.detalle.pack(anchor=tk.W)
+        tarjeta.precio = ttk.Label(detalles_frame, font=('Helvetica', 11, 'bold'))
+        tarjeta.precio.pack(anchor=tk.W)
+        tarjeta.stock = ttk.Label(detalles_frame, font=('Helvetica', 10))
+        tarjeta.stock.pack(anchor=tk.W)
+        
+        # Botón agregar con opciones
+        self.crear_boton_agregar(tarjeta, tarjeta)
+        
+        tarjeta.datos = None
+        tarjeta.ruta_imagen = None
+        self.rellenar_tarjeta_producto(tarjeta, producto)
+        grid.tarjetas.append(tarjeta)
+        self._tarjetas[producto.codigo] = tarjeta
+        return tarjeta
+    
+    def rellenar_tarjeta_producto(self, tarjeta, producto):
+        """Muestra un producto en su tarjeta; no toca los widgets si lo mostrado no ha cambiado"""
+        tarjeta.producto = producto
+        if isinstance(producto, Bebida):
+            detalle = f"Tamaño: {producto.tamano}"
+        elif isinstance(producto, Postre):
+            detalle = f"Ingredientes: {producto.mostrar_ingredientes()}"
+        else:
+            detalle = ""
+        imagen = getattr(producto, "imagen", None)
+        datos = (producto.nombre, imagen, detalle, producto.precio, producto.stock)
+        if datos == tarjeta.datos:
+            return
+        tarjeta.datos = datos
+        
+        tarjeta.nombre.configure(text=producto.nombre)
+        icono = "☕" if isinstance(producto, Bebida) else "🍰"
+        ruta = self.ruta_imagen(imagen)
+        if ruta is None:
+            tarjeta.imagen.configure(image="", text=imagen if imagen else icono)
+            tarjeta.ruta_imagen = None
+        elif ruta != tarjeta.ruta_imagen:
+            # Hasta que llegue la miniatura se ve el icono del tipo de producto
+            tarjeta.imagen.configure(image="", text=icono)
+            self.pedir_miniatura(tarjeta, ruta)
+        tarjeta.detalle.configure(text=detalle)
+        tarjeta.precio.configure(text=f"💲 Precio: {formatear_dinero(producto.precio)}")
+        tarjeta.stock.configure(
+            text=f"📦 Disponible: {producto.stock}",
+            foreground=COLORES["exito"] if producto.stock > 5 else COLORES["advertencia"] if producto.stock > 0 else COLORES["error"])
+    
+    def ruta_imagen(self, imagen: Optional[str]) -> Optional[str]:
+        """Ruta del archivo si `imagen` nombra uno; si no, es un emoji o no hay imagen"""
+        if not imagen or os.path.splitext(imagen)[1].lower() not in EXTENSIONES_IMAGEN:
+            return None
+        # Las rutas relativas se toman desde la carpeta del programa
+        return os.path.join(DIRECTORIO_PROGRAMA, imagen)
+    
+    def pedir_miniatura(self, tarjeta, ruta: str):
+        """Carga la miniatura de una tarjeta la primera vez que la tarjeta se ve"""
+        tarjeta.ruta_imagen = ruta
+        
+        def mostrar(foto):
+            if tarjeta.ruta_imagen == ruta and tarjeta.winfo_exists():
+                tarjeta.imagen.configure(image=foto, text="")
+                tarjeta.imagen.foto = foto
+        
+        def pedir(evento=None):
+            tarjeta.imagen.unbind("<Map>")
+            if tarjeta.ruta_imagen == ruta:
+                self.imagenes.pedir(ruta, self.TAMANO_MINIATURA, mostrar, proporcional=True)
+        
+        # Las tarjetas de la pestaña oculta o sin stock no se cargan hasta que aparecen
+        if tarjeta.imagen.winfo_ismapped():
+            pedir()
+        else:
+            tarjeta.imagen.bind("<Map>", pedir)
+    
+    def actualizar_tarjeta(self, producto):
+        """Pone al día la tarjeta de un producto y la muestra u oculta según su stock"""
+        tarjeta = self._tarjetas.get(producto.codigo)
+        if tarjeta is None:
+            grid = next((g for clase, g in self._grids_menu.items() if isinstance(producto, clase)), None)
+            if grid is None:
+                return
+            self.crear_tarjeta_producto(grid, producto)
+            self.colocar_tarjetas(grid)
+            return
+        
+        visible_antes = tarjeta.producto.stock > 0
+        self.rellenar_tarjeta_producto(tarjeta, producto)
+        if (producto.stock > 0) != visible_antes:
+            self.colocar_tarjetas(tarjeta.master)
+    
+    def colocar_tarjetas(self, grid):
+        """Coloca en el grid las tarjetas con stock y retira las demás"""
+        row, col = 0, 0
+        max_cols = 3
+        
+        for tarjeta in grid.tarjetas:
+            if tarjeta.producto.stock <= 0:
+                tarjeta.grid_remove()
+                continue
+            
+            # Posicionamiento en el grid
+            tarjeta.grid(
+                row=row, 
+                column=col, 
+                padx=10, 
+                pady=10, 
+                sticky="nsew"
+            )
+            
+            # Configurar columnas para expansión
+            grid.columnconfigure(col, weight=1)
+            
+            col += 1
+            if col >= max_cols:
+                col = 0
+                row += 1
+        
+        # Configurar filas para expansión
+        for r in range(row + 1):
+            grid.rowconfigure(r, weight=1)
+    
+    def crear_boton_agregar(self, parent, tarjeta):
+        """Crea el botón de agregar con opciones para el producto de la tarjeta"""
+        ttk.Button(
+            parent, 
+            text="➕ Agregar al Carrito", 
+            command=lambda: self.mostrar_opciones_producto(tarjeta.producto),
+            style="Primary.TButton"
+        ).pack(fill=tk.X, pady=5, ipady=5)
+    
+    def mostrar_opciones_producto(self, producto):
+        """Abre la ventana de opciones para agregar un producto al carrito"""
+        opciones_window = tk.Toplevel(self.root)
+        opciones_window.title(f"Opciones para {producto.nombre}")
+        opciones_window.geometry("400x300")
+        opciones_window.resizable(False, False)
+        
+        # Variables para las opciones
+        cantidad = tk.IntVar(value=1)
+        tipo_leche = tk.StringVar(value=TIPOS_LECHE[0] if isinstance(producto, Bebida) else "")
+        nivel_azucar = tk.StringVar(value=NIVELES_AZUCAR[2] if isinstance(producto, Bebida) else "")
+        notas = tk.StringVar()
+        
+        # Frame principal
+        main_frame = ttk.Frame(opciones_window, padding=10)
+        main_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Cantidad
+        ttk.Label(main_frame, text="Cantidad:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Spinbox(main_frame, from_=1, to=10, textvariable=cantidad, width=5).grid(row=0, column=1, sticky=tk.W, pady=5)
+        
+        # Opciones específicas para bebidas
+        if isinstance(producto, Bebida):
+            # Tipo de leche
+            ttk.Label(main_frame, text="Tipo de leche:").grid(row=1, column=0, sticky=tk.W, pady=5)
+            ttk.Combobox(
+                main_frame, 
+                textvariable=tipo_leche, 
+                values=TIPOS_LECHE,
+                state="readonly"
+            ).grid(row=1, column=1, sticky=tk.W, pady=5)
+            
+            # Nivel de azúcar
+            ttk.Label(main_frame, text="Nivel de azúcar:").grid(row=2, column=0, sticky=tk.W, pady=5)
+            ttk.Combobox(
+                main_frame, 
+                textvariable=nivel_azucar, 
+                values=NIVELES_AZUCAR,
+                state="readonly"
+            ).grid(row=2, column=1, sticky=tk.W, pady=5)
+        
+        # Notas adicionales
+        ttk.Label(main_frame, text="Notas adicionales:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(main_frame, textvariable=notas).grid(row=3, column=1, sticky=tk.W, pady=5)
+        
+        # Botones
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.grid(row=4, column=0, columnspan=2, pady=10)
+        
+        ttk.Button(
+            btn_frame, 
+            text="Agregar al Carrito", 
+            command=lambda: self.agregar_con_opciones(
+                producto, 
+                cantidad.get(),
+                tipo_leche.get() if isinstance(producto, Bebida) else None,
+                nivel_azucar.get() if isinstance(producto, Bebida) else None,
+                notas.get(),
+                opciones_window
+            ),
+            style="Primary.TButton"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            btn_frame, 
+            text="Cancelar", 
+            command=opciones_window.destroy,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=5)
+    
+    def agregar_con_opciones(self, producto, cantidad, tipo_leche, azucar, notas, ventana):
+        """Agrega un producto al carrito con las opciones seleccionadas"""
+        if cantidad < 1:
+            messagebox.showwarning("Error", "La cantidad debe ser al menos 1", parent=ventana)
+            return
+        
+        # Las unidades que ya están en el carrito también cuentan contra el stock
+        if producto.stock >= self.carrito.unidades(producto.codigo) + cantidad:
+            item = ProductoConExtras(
+                producto=producto,
+                cantidad=cantidad,
+                tipo_leche=tipo_leche,
+                azucar=azucar,
+                notas=notas
+            )
+            posicion, nueva = self.carrito.agregar(item)
+            # Solo se toca la fila afectada: una nueva al final o la línea que creció
+            if not nueva:
+                self.carrito_listbox.delete(posicion)
+            self.carrito_listbox.insert(posicion, str(self.carrito.lineas[posicion]))
+            self.mostrar_total_carrito()
+            ventana.destroy()
+            messagebox.showinfo("Éxito", f"{cantidad}x {producto.nombre} agregado al carrito", parent=self.root)
+        else:
+            messagebox.showwarning("Error", "No hay suficiente stock", parent=ventana)
+    
+    def eliminar_del_carrito(self):
+        """Elimina un producto seleccionado del carrito"""
+        try:
+            seleccion = self.carrito_listbox.curselection()[0]
+            self.carrito.quitar(seleccion)
+            self.carrito_listbox.delete(seleccion)
+            self.mostrar_total_carrito()
+        except IndexError:
+            messagebox.showwarning("Error", "Seleccione un producto para eliminar", parent=self.root)
+    
+    def actualizar_carrito(self):
+        """Vuelve a mostrar el carrito entero; los cambios de una línea no pasan por aquí"""
+        self.carrito_listbox.delete(0, tk.END)
+        if len(self.carrito):
+            self.carrito_listbox.insert(tk.END, *(str(item) for item in self.carrito))
+        self.mostrar_total_carrito()
+    
+    def mostrar_total_carrito(self):
+        """Muestra el total que lleva el carrito"""
+        self.total_label.config(text=f"Total: {formatear_dinero(self.carrito.total)}")
+    
+    def finalizar_pedido(self):
+        """Finaliza el pedido y lo registra en el sistema"""
+        if not self.carrito:
+            messagebox.showwarning("Error", "El carrito está vacío", parent=self.root)
+            return
+        
+        # Crear pedido; el botón queda desactivado hasta la respuesta para no enviarlo dos veces
+        self.consultar(self.sistema.crear_pedido, self.cliente_actual.identificacion, list(self.carrito.lineas),
+                       al_terminar=self.pedido_finalizado, botones=(self._boton_realizar_pedido,))
+    
+    def pedido_finalizado(self, pedido: Optional[Pedido]):
+        """Muestra el resultado de finalizar_pedido"""
+        if pedido:
+            messagebox.showinfo(
+                "Éxito", 
+                f"Pedido #{pedido.numero} creado con éxito.\nTotal: {formatear_dinero(pedido.total)}", 
+                parent=self.root
+            )
+            self.carrito.vaciar()
+            self.actualizar_carrito()
+            self.mostrar_detalle_pedido(pedido)
+        else:
+            messagebox.showerror("Error", "No se pudo crear el pedido", parent=self.root)
+    
+    def mostrar_login_empleado(self):
+        """Muestra el formulario de inicio de sesión para empleados"""
+        self.mostrar_pantalla("login_empleado", self.construir_login_empleado,
+                              lambda: self.vaciar_campos(self.usuario_entry, self.contrasena_entry))
+    
+    def construir_login_empleado(self, main_frame):
+        """Construye el formulario de inicio de sesión para empleados"""
+        ttk.Label(
+            main_frame, 
+            text="🔐 Inicio de Sesión para Empleados", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Frame del formulario
+        form_frame = ttk.Frame(
+            main_frame, 
+            padding=20, 
+            relief=tk.RAISED, 
+            borderwidth=2
+        )
+        form_frame.pack(pady=20, ipadx=20, ipady=20)
+        
+        # Campos del formulario
+        ttk.Label(
+            form_frame, 
+            text="👤 Usuario:", 
+            font=('Helvetica', 12)
+        ).grid(row=0, column=0, pady=10, sticky=tk.W)
+        
+        self.usuario_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30
+        )
+        self.usuario_entry.grid(row=0, column=1, pady=10, padx=10)
+        
+        ttk.Label(
+            form_frame, 
+            text="🔒 Contraseña:", 
+            font=('Helvetica', 12)
+        ).grid(row=1, column=0, pady=10, sticky=tk.W)
+        
+        self.contrasena_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30, 
+            show="*"
+        )
+        self.contrasena_entry.grid(row=1, column=1, pady=10, padx=10)
+        
+        # Botones
+        btn_frame = ttk.Frame(form_frame)
+        btn_frame.grid(row=2, column=0, columnspan=2, pady=20)
+        
+        self._boton_iniciar_sesion = ttk.Button(
+            btn_frame, 
+            text="Iniciar Sesión", 
+            command=self.validar_empleado,
+            style="Primary.TButton"
+        )
+        self._boton_iniciar_sesion.pack(side=tk.LEFT, padx=10)
+        
+        ttk.Button(
+            btn_frame, 
+            text="Volver", 
+            command=self.mostrar_pantalla_inicio,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=10)
+    
+    def validar_empleado(self):
+        """Valida las credenciales del empleado"""
+        usuario = self.usuario_entry.get()
+        contrasena = self.contrasena_entry.get()
+        
+        def validado(empleado):
+            if empleado:
+                self.empleado_actual = empleado
+                messagebox.showinfo(
+                    "Bienvenido", 
+                    f"Bienvenido/a {empleado.nombre} ({empleado.puesto})", 
+                    parent=self.root
+                )
+                self.mostrar_panel_empleado()
+            else:
+                messagebox.showerror(
+                    "Error", 
+                    "Usuario o contraseña incorrectos", 
+                    parent=self.root
+                )
+        
+        self.consultar(self.sistema.validar_empleado, usuario, contrasena, al_terminar=validado,
+                       botones=(self._boton_iniciar_sesion,))
+    
+    def mostrar_panel_empleado(self):
+        """Muestra el panel de control para empleados"""
+        self.mostrar_pantalla("panel_empleado", self.construir_panel_empleado, self.refrescar_panel_empleado)
+    
+    def construir_panel_empleado(self, main_frame):
+        """Construye el panel de control para empleados"""
+        # Título
+        self._titulo_panel = ttk.Label(main_frame, style="Title.TLabel")
+        self._titulo_panel.pack(pady=10)
+        
+        # Información del empleado
+        info_frame = ttk.Frame(main_frame, padding=10, relief=tk.RAISED, borderwidth=1)
+        info_frame.pack(pady=10, fill=tk.X)
+        
+        self._puesto_panel = ttk.Label(info_frame, font=('Helvetica', 12))
+        self._puesto_panel.pack(anchor=tk.W)
+        
+        self._telefono_panel = ttk.Label(info_frame, font=('Helvetica', 12))
+        self._telefono_panel.pack(anchor=tk.W)
+        
+        # Botones de acciones
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=20)
+        
+        ttk.Button(
+            btn_frame, 
+            text="➕ Agregar Producto", 
+            command=self.mostrar_agregar_producto,
+            style="Primary.TButton"
+        ).grid(row=0, column=0, padx=5, pady=5, sticky=tk.EW)
+        
+        ttk.Button(
+            btn_frame, 
+            text="📦 Actualizar Stock", 
+            command=self.mostrar_actualizar_stock,
+            style="Primary.TButton"
+        ).grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
+        
+        ttk.Button(
+            btn_frame, 
+            text="📋 Ver Inventario", 
+            command=self.mostrar_inventario,
+            style="Primary.TButton"
+        ).grid(row=1, column=0, padx=5, pady=5, sticky=tk.EW)
+        
+        ttk.Button(
+            btn_frame, 
+            text="📊 Reporte de Ventas", 
+            command=self.mostrar_reporte_ventas,
+            style="Primary.TButton"
+        ).grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
+        
+        ttk.Button(
+            btn_frame, 
+            text="📝 Gestionar Pedidos", 
+            command=self.mostrar_gestion_pedidos,
+            style="Primary.TButton"
+        ).grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky=tk.EW)
+
+        # Botón para exportar clientes a Excel
+        self._boton_excel = ttk.Button(
+            btn_frame,
+            text="Exportar Clientes a Excel",
+            command=self.exportar_clientes_excel,
+            style="Primary.TButton"
+            )
+        self._boton_excel.grid(row=3, column=0, padx=5, pady=5, sticky=tk.EW)
+        
+        self._boton_csv = ttk.Button(
+            btn_frame,
+            text="Exportar Clientes a CSV",
+            command=self.exportar_clientes_csv,
+            style="Primary.TButton"
+            )
+        self._boton_csv.grid(row=3, column=1, padx=5, pady=5, sticky=tk.EW)
+        
+        # Botón cerrar sesión
+        ttk.Button(
+            main_frame, 
+            text="🚪 Cerrar Sesión", 
+            command=self.cerrar_sesion_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def refrescar_panel_empleado(self):
+        """Muestra los datos del empleado que ha iniciado sesión"""
+        self._titulo_panel.configure(text=f"👨‍💼 Panel de Empleado - {self.empleado_actual.nombre}")
+        self._puesto_panel.configure(text=f"Puesto: {self.empleado_actual.puesto}")
+        self._telefono_panel.configure(text=f"Teléfono: {self.empleado_actual.telefono}")
+    
+    def mostrar_gestion_pedidos(self):
+        """Muestra la interfaz para gestionar pedidos (empleados)"""
+        self.mostrar_pantalla("gestion_pedidos", self.construir_gestion_pedidos, self.refrescar_gestion_pedidos)
+    
+    def construir_gestion_pedidos(self, main_frame):
+        """Construye la interfaz para gestionar pedidos, con una pestaña por estado"""
+        # Título
+        ttk.Label(
+            main_frame, 
+            text="📝 Gestión de Pedidos", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Notebook para pestañas de estados
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(expand=True, fill=tk.BOTH, pady=10)
+        
+        # Estado -> lista de sus pedidos; se mantienen al día con los cambios desde _version_tablero
+        self._listas_pedidos: Dict[str, ListaVirtual] = {}
+        self._version_tablero: Optional[int] = None
+        self._sondeo_tablero = None  # Consulta programada con root.after
+        self._sondeando = False
+        self._repetir_sondeo = False
+        self._fallos_sondeo = 0  # Fallos seguidos; la espera entre reintentos se duplica con cada uno
+        
+        # Pestaña de pedidos nuevos
+        nuevos_tab = ttk.Frame(notebook)
+        notebook.add(nuevos_tab, text="🆕 Nuevos")
+        self.crear_lista_pedidos_empleado(nuevos_tab, "Nuevo")
+        
+        # Pestaña de pedidos en preparación
+        preparacion_tab = ttk.Frame(notebook)
+        notebook.add(preparacion_tab, text="👨‍🍳 En Preparación")
+        self.crear_lista_pedidos_empleado(preparacion_tab, "En preparación")
+        
+        # Pestaña de pedidos entregados
+        entregados_tab = ttk.Frame(notebook)
+        notebook.add(entregados_tab, text="✅ Entregados")
+        self.crear_lista_pedidos_empleado(entregados_tab, "Entregado")
+        
+        # Los cambios de esta terminal se piden al momento; los de otras (solo con
+        # SistemaRemoto), con el temporizador
+        self.escuchar(("pedido_creado", "pedido_modificado", "pedido_eliminado", "estado_cambiado"),
+                      lambda evento: self.programar_sondeo_tablero(0))
+        
+        # Botón volver
+        ttk.Button(
+            main_frame, 
+            text="Volver", 
+            command=self.mostrar_panel_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def refrescar_gestion_pedidos(self):
+        """Trae lo que ha cambiado desde la última visita; los pedidos sin cambios no se tocan"""
+        self.programar_sondeo_tablero(0)
+    
+    def programar_sondeo_tablero(self, espera_ms: int):
+        """Programa la próxima consulta de cambios mientras la gestión de pedidos está a la vista"""
+        if self._pantalla_actual is not self._pantallas.get("gestion_pedidos"):
+            return
+        if self._sondeando:
+            # Se vuelve a consultar en cuanto llegue la respuesta en curso
+            self._repetir_sondeo = self._repetir_sondeo or espera_ms == 0
+            return
+        if self._sondeo_tablero is not None:
+            self.root.after_cancel(self._sondeo_tablero)
+        self._sondeo_tablero = self.root.after(espera_ms, self.sondear_tablero)
+    
+    def sondear_tablero(self):
+        """Pide en segundo plano los pedidos cambiados desde la versión que se muestra"""
+        self._sondeo_tablero = None
+        if self._pantalla_actual is not self._pantallas.get("gestion_pedidos"):
+            # Fuera de la pantalla no se consulta; al volver se piden los cambios acumulados
+            return
+        self._sondeando = True
+        self._repetir_sondeo = False
+        self.tareas.ejecutar(self.sistema.pedidos_cambiados_desde, self._version_tablero,
+                             al_terminar=self.aplicar_cambios_tablero, al_fallar=self.error_sondeo_tablero)
+    
+    def aplicar_cambios_tablero(self, cambios):
+        """Coloca, mueve o quita solo las filas de los pedidos cambiados"""
+        version, cambiados, eliminados, completa = cambios
+        self._sondeando = False
+        self._fallos_sondeo = 0
+        if completa:
+            for estado, lista in self._listas_pedidos.items():
+                lista.mostrar([p for p in cambiados if p.estado == estado])
+        else:
+            for numero in eliminados:
+                for lista in self._listas_pedidos.values():
+                    lista.quitar(numero)
+            for pedido in cambiados:
+                self.colocar_pedido_tablero(pedido)
+        self._version_tablero = version
+        if self._repetir_sondeo:
+            self.programar_sondeo_tablero(0)
+        elif isinstance(self.sistema, SistemaRemoto):
+            # Localmente los eventos del sistema ya avisan de cada cambio; solo el servicio
+            # compartido tiene cambios de otras terminales que hay que ir a buscar
+            self.programar_sondeo_tablero(self.INTERVALO_TABLERO_MS)
+    
+    def error_sondeo_tablero(self, error: Exception):
+        """Lo vuelve a intentar cada vez más espaciado; solo avisa del primer fallo seguido"""
+        print(f"Error al actualizar la gestión de pedidos: {error}")
+        self._sondeando = False
+        self._fallos_sondeo += 1
+        if self._fallos_sondeo == 1:
+            self.sistema.avisar(
+                "Gestión de pedidos",
+                f"No se pudo actualizar la lista de pedidos: {error}\nSe seguirá intentando."
+            )
+        espera = min(self.INTERVALO_TABLERO_MS * 2 ** self._fallos_sondeo, self.MAX_ESPERA_TABLERO_MS)
+        self.programar_sondeo_tablero(espera)
+    
+    def crear_lista_pedidos_empleado(self, parent, estado: str):
+        """Crea una lista de pedidos para el panel de empleados"""
+        lista = ListaVirtual(
+            parent,
+            self.crear_fila_pedido_empleado,
+            self.rellenar_fila_pedido_empleado,
+            clave=lambda p: p.numero,
+            vacio=f"No hay pedidos {estado.lower()}"
+        )
+        lista.pack(fill=tk.BOTH, expand=True)
+        self._listas_pedidos[estado] = lista
+    
+    def colocar_pedido_tablero(self, pedido: Pedido):
+        """Pone un pedido en la lista de su estado y lo quita de las demás"""
+        for estado, lista in self._listas_pedidos.items():
+            if estado != pedido.estado:
+                lista.quitar(pedido.numero)
+            else:
+                # Si ya estaba se sustituye en su sitio; si llega de otro estado entra al final
+                lista.actualizar(pedido)
+    
+    def crear_fila_pedido_empleado(self, parent):
+        """Crea una fila vacía para un pedido del panel de empleados"""
+        fila = ttk.Frame(
+            parent, 
+            borderwidth=2, 
+            relief="groove", 
+            padding=10
+        )
+        
+        # Encabezado del pedido
+        header_frame = ttk.Frame(fila)
+        header_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        fila.titulo = ttk.Label(header_frame, font=('Helvetica', 12, 'bold'))
+        fila.titulo.pack(side=tk.LEFT)
+        
+        fila.fecha = ttk.Label(header_frame, font=('Helvetica', 10))
+        fila.fecha.pack(side=tk.RIGHT)
+        
+        # Productos del pedido, uno por línea
+        fila.productos = ttk.Label(fila, font=('Helvetica', 10), justify=tk.LEFT)
+        fila.productos.pack(anchor=tk.W, padx=10)
+        
+        # Total del pedido
+        fila.total = ttk.Label(fila, font=('Helvetica', 11, 'bold'))
+        fila.total.pack(anchor=tk.E, pady=(5, 0))
+        
+        # Botones de acción; se muestra el que corresponde al estado
+        btn_frame = ttk.Frame(fila)
+        btn_frame.pack(pady=(5, 0))
+        fila.procesar = ttk.Button(btn_frame, text="Iniciar Preparación", style="Primary.TButton")
+        fila.entregar = ttk.Button(btn_frame, text="Marcar como Entregado", style="Primary.TButton")
+        return fila
+    
+    def rellenar_fila_pedido_empleado(self, fila, pedido: Pedido):
+        """Muestra un pedido en una fila creada por crear_fila_pedido_empleado"""
+        fila.titulo.configure(text=f"Pedido #{pedido.numero} - Cliente: {pedido.cliente.nombre}")
+        fila.fecha.configure(text=f"Fecha: {pedido.fecha.strftime('%d/%m/%Y %H:%M')}")
+        fila.productos.configure(text="\n".join(f"• {item}" for item in pedido.productos))
+        fila.total.configure(text=f"Total: {formatear_dinero(pedido.total)}")
+        
+        fila.procesar.configure(command=lambda p=pedido: self.procesar_pedido(p, fila.procesar))
+        fila.entregar.configure(command=lambda p=pedido: self.entregar_pedido(p, fila.entregar))
+        if pedido.estado == "Nuevo":
+            fila.procesar.pack(side=tk.LEFT, padx=5)
+        else:
+            fila.procesar.pack_forget()
+        if pedido.estado == "En preparación":
+            fila.entregar.pack(side=tk.LEFT, padx=5)
+        else:
+            fila.entregar.pack_forget()
+    
+    def procesar_pedido(self, pedido: Pedido, boton=None):
+        """Cambia el estado del pedido a 'En preparación'"""
+        def mostrar_resultado(procesado: bool):
+            if procesado:
+                messagebox.showinfo(
+                    "Éxito", 
+                    f"Pedido #{pedido.numero} en preparación", 
+                    parent=self.root
+                )
+            else:
+                messagebox.showerror(
+                    "Error", 
+                    "No se pudo procesar el pedido", 
+                    parent=self.root
+                )
+        
+        self.consultar(self.sistema.procesar_pedido, pedido.numero, self.empleado_actual.usuario,
+                       al_terminar=mostrar_resultado, botones=(boton,) if boton else ())
+    
+    def entregar_pedido(self, pedido: Pedido, boton=None):
+        """Marca el pedido como entregado"""
+        def mostrar_resultado(entregado: bool):
+            if entregado:
+                messagebox.showinfo(
+                    "Éxito", 
+                    f"Pedido #{pedido.numero} marcado como entregado", 
+                    parent=self.root
+                )
+            else:
+                messagebox.showerror(
+                    "Error", 
+                    "No se pudo marcar el pedido como entregado", 
+                    parent=self.root
+                )
+        
+        self.consultar(self.sistema.entregar_pedido, pedido.numero, self.empleado_actual.usuario,
+                       al_terminar=mostrar_resultado, botones=(boton,) if boton else ())
+    
+    def mostrar_agregar_producto(self):
+        """Muestra el formulario para agregar un nuevo producto"""
+        self.mostrar_pantalla("agregar_producto", self.construir_agregar_producto,
+                              lambda: self.vaciar_campos(*self._campos_producto))
+    
+    def construir_agregar_producto(self, main_frame):
+        """Construye el formulario para agregar un nuevo producto"""
+        ttk.Label(
+            main_frame, 
+            text="➕ Agregar Producto", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Frame del formulario
+        form_frame = ttk.Frame(
+            main_frame, 
+            padding=20, 
+            relief=tk.RAISED, 
+            borderwidth=2
+        )
+        form_frame.pack(pady=20, ipadx=20, ipady=20)
+        
+        # Campos del formulario
+        ttk.Label(
+            form_frame, 
+            text="🆔 Código:", 
+            font=('Helvetica', 12)
+        ).grid(row=0, column=0, pady=10, sticky=tk.W)
+        
+        codigo_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30
+        )
+        codigo_entry.grid(row=0, column=1, pady=10, padx=10)
+        
+        ttk.Label(
+            form_frame, 
+            text="📛 Nombre:", 
+            font=('Helvetica', 12)
+        ).grid(row=1, column=0, pady=10, sticky=tk.W)
+        
+        nombre_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30
+        )
+        nombre_entry.grid(row=1, column=1, pady=10, padx=10)
+        
+        ttk.Label(
+            form_frame, 
+            text="💲 Precio:", 
+            font=('Helvetica', 12)
+        ).grid(row=2, column=0, pady=10, sticky=tk.W)
+        
+        precio_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30
+        )
+        precio_entry.grid(row=2, column=1, pady=10, padx=10)
+        
+        ttk.Label(
+            form_frame, 
+            text="📦 Stock:", 
+            font=('Helvetica', 12)
+        ).grid(row=3, column=0, pady=10, sticky=tk.W)
+        
+        stock_entry = ttk.Entry(
+            form_frame, 
+            font=('Helvetica', 12), 
+            width=30
+        )
+        stock_entry.grid(row=3, column=1, pady=10, padx=10)
+        self._campos_producto = (codigo_entry, nombre_entry, precio_entry, stock_entry)
+        
+        ttk.Label(
+            form_frame, 
+            text="📌 Tipo:", 
+            font=('Helvetica', 12)
+        ).grid(row=4, column=0, pady=10, sticky=tk.W)
+        
+        tipo_var = tk.StringVar(value="Bebida")
+        
+        ttk.Radiobutton(
+            form_frame, 
+            text="☕ Bebida", 
+            variable=tipo_var, 
+            value="Bebida",
+            style='TRadiobutton'
+        ).grid(row=4, column=1, pady=5, sticky=tk.W)
+        
+        ttk.Radiobutton(
+            form_frame, 
+            text="🍰 Postre", 
+            variable=tipo_var, 
+            value="Postre",
+            style='TRadiobutton'
+        ).grid(row=5, column=1, pady=5, sticky=tk.W)
+        
+        # Botones
+        btn_frame = ttk.Frame(form_frame)
+        btn_frame.grid(row=6, column=0, columnspan=2, pady=20)
+        
+        self._boton_agregar_producto = ttk.Button(
+            btn_frame, 
+            text="Agregar", 
+            command=lambda: self.agregar_producto(
+                codigo_entry.get(), 
+                nombre_entry.get(), 
+                precio_entry.get(), 
+                stock_entry.get(), 
+                tipo_var.get()
+            ),
+            style="Primary.TButton"
+        )
+        self._boton_agregar_producto.pack(side=tk.LEFT, padx=10)
+        
+        ttk.Button(
+            btn_frame, 
+            text="Volver", 
+            command=self.mostrar_panel_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.LEFT, padx=10)
+    
+    def agregar_producto(self, codigo, nombre, precio, stock, tipo):
+        """Agrega un nuevo producto al inventario"""
+        if not codigo or not nombre or not precio or not stock:
+            messagebox.showwarning("Error", "Todos los campos son obligatorios", parent=self.root)
+            return
+        
+        try:
+            precio = a_centimos(precio)
+            stock = int(stock)
+            if precio <= 0 or stock < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Error", "Precio y stock deben ser números válidos", parent=self.root)
+            return
+        
+        if tipo == "Bebida":
+            producto = Bebida(codigo, nombre, precio, stock)
+        elif tipo == "Postre":
+            producto = Postre(codigo, nombre, precio, stock)
+        
+        def agregado(_):
+            messagebox.showinfo("Éxito", "Producto agregado correctamente", parent=self.root)
+            self.mostrar_panel_empleado()
+        
+        self.consultar(self.sistema.agregar_producto, producto, al_terminar=agregado,
+                       botones=(self._boton_agregar_producto,))
+    
+    def mostrar_actualizar_stock(self):
+        """Muestra la lista de productos para actualizar stock"""
+        self.mostrar_pantalla("actualizar_stock", self.construir_actualizar_stock,
+                              lambda: self.consultar(self.sistema.inventario.listar_productos,
+                                                     al_terminar=self._lista_stock.mostrar))
+    
+    def construir_actualizar_stock(self, main_frame):
+        """Construye la lista de productos para actualizar stock"""
+        ttk.Label(
+            main_frame, 
+            text="📦 Actualizar Stock", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Lista de productos
+        self._lista_stock = self.mostrar_filas_productos(main_frame, self.crear_fila_stock, self.rellenar_fila_stock)
+        
+        # Botón volver
+        ttk.Button(
+            main_frame, 
+            text="Volver", 
+            command=self.mostrar_panel_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def crear_fila_stock(self, parent):
+        """Crea una fila vacía para la vista de actualizar stock"""
+        fila = ttk.Frame(
+            parent, 
+            borderwidth=1, 
+            relief="solid", 
+            padding=10
+        )
+        
+        # Información del producto
+        fila.nombre = ttk.Label(fila, font=('Helvetica', 11, 'bold'))
+        fila.nombre.pack(anchor=tk.W)
+        
+        fila.stock = ttk.Label(fila, font=('Helvetica', 10))
+        fila.stock.pack(anchor=tk.W)
+        
+        # Botón actualizar
+        fila.boton = ttk.Button(fila, text="Actualizar Stock", style="Primary.TButton")
+        fila.boton.pack(side=tk.RIGHT, padx=5)
+        return fila
+    
+    def rellenar_fila_stock(self, fila, producto):
+        """Muestra un producto en una fila creada por crear_fila_stock"""
+        fila.nombre.configure(text=f"{producto.nombre} (Código: {producto.codigo})")
+        fila.stock.configure(text=f"Stock actual: {producto.stock}")
+        fila.boton.configure(command=lambda p=producto: self.actualizar_stock_producto(p, fila.boton))
+    
+    def mostrar_filas_productos(self, parent, crear_fila, rellenar_fila):
+        """Crea una lista de productos con buscador que sigue los cambios de stock y la devuelve"""
+        buscar_frame = ttk.Frame(parent)
+        buscar_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(buscar_frame, text="🔍 Buscar:", font=('Helvetica', 11)).pack(side=tk.LEFT)
+        busqueda = tk.StringVar()
+        ttk.Entry(buscar_frame, textvariable=busqueda, width=30).pack(side=tk.LEFT, padx=5)
+        
+        lista = ListaVirtual(parent, crear_fila, rellenar_fila, clave=lambda p: p.codigo,
+                             vacio="No hay productos")
+        lista.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        def filtrar(*_):
+            texto = busqueda.get().strip().lower()
+            lista.filtrar((lambda p: texto in p.codigo.lower() or texto in p.nombre.lower()) if texto else None)
+        busqueda.trace_add("write", filtrar)
+        
+        self.escuchar(("stock_cambiado",), lambda evento: lista.actualizar(evento.datos["producto"]))
+        return lista
+    
+    def actualizar_stock_producto(self, producto, boton=None):
+        """Actualiza el stock de un producto específico"""
+        nuevo_stock = simpledialog.askinteger(
+            "Actualizar Stock", 
+            f"Ingrese el nuevo stock para {producto.nombre}:", 
+            parent=self.root,
+            minvalue=0
+        )
+        
+        if nuevo_stock is not None:
+            # Valor absoluto: otra terminal puede haber vendido desde que se mostró la lista
+            self.consultar(self.sistema.fijar_stock, producto.codigo, nuevo_stock,
+                           al_terminar=lambda _: messagebox.showinfo(
+                               "Éxito", "Stock actualizado correctamente", parent=self.root),
+                           botones=(boton,) if boton else ())
+    
+    def mostrar_inventario(self):
+        """Muestra el inventario completo"""
+        self.mostrar_pantalla("inventario", self.construir_inventario,
+                              lambda: self.consultar(self.sistema.inventario.listar_productos,
+                                                     al_terminar=self._lista_inventario.mostrar))
+    
+    def construir_inventario(self, main_frame):
+        """Construye la vista del inventario completo"""
+        ttk.Label(
+            main_frame, 
+            text="📋 Inventario Completo", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Lista de productos
+        self._lista_inventario = self.mostrar_filas_productos(main_frame, self.crear_fila_inventario, self.rellenar_fila_inventario)
+        
+        # Botón volver
+        ttk.Button(
+            main_frame, 
+            text="Volver", 
+            command=self.mostrar_panel_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def crear_fila_inventario(self, parent):
+        """Crea una fila vacía para la vista de inventario"""
+        fila = ttk.Frame(
+            parent, 
+            borderwidth=1, 
+            relief="solid", 
+            padding=10
+        )
+        
+        # Tipo de producto (icono)
+        fila.icono = ttk.Label(fila, font=('Helvetica', 14))
+        fila.icono.pack(side=tk.LEFT, padx=5)
+        
+        # Información del producto
+        info_frame = ttk.Frame(fila)
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        fila.nombre = ttk.Label(info_frame, font=('Helvetica', 11, 'bold'))
+        fila.nombre.pack(anchor=tk.W)
+        
+        fila.precio = ttk.Label(info_frame, font=('Helvetica', 10))
+        fila.precio.pack(anchor=tk.W)
+        
+        # Detalles específicos (tamaño o ingredientes)
+        fila.detalle = ttk.Label(info_frame, font=('Helvetica', 10))
+        return fila
+    
+    def rellenar_fila_inventario(self, fila, producto):
+        """Muestra un producto en una fila creada por crear_fila_inventario"""
+        fila.icono.configure(text="☕" if isinstance(producto, Bebida) else "🍰")
+        fila.nombre.configure(text=f"{producto.nombre} (Código: {producto.codigo})")
+        fila.precio.configure(text=f"Precio: {formatear_dinero(producto.precio)} | Stock: {producto.stock}")
+        
+        if isinstance(producto, Bebida):
+            fila.detalle.configure(text=f"Tamaño: {producto.tamano}")
+            fila.detalle.pack(anchor=tk.W)
+        elif isinstance(producto, Postre):
+            fila.detalle.configure(text=f"Ingredientes: {producto.mostrar_ingredientes()}")
+            fila.detalle.pack(anchor=tk.W)
+        else:
+            fila.detalle.pack_forget()
+    
+    def mostrar_reporte_ventas(self):
+        """Muestra un reporte de ventas"""
+        self.mostrar_pantalla("reporte_ventas", self.construir_reporte_ventas, self.refrescar_reporte_ventas)
+    
+    def construir_reporte_ventas(self, main_frame):
+        """Construye la pantalla del reporte; las cifras las pone refrescar_reporte_ventas"""
+        ttk.Label(
+            main_frame, 
+            text="📊 Reporte de Ventas", 
+            style="Title.TLabel"
+        ).pack(pady=10)
+        
+        # Frame de información
+        info_frame = ttk.Frame(
+            main_frame, 
+            padding=15, 
+            relief=tk.RAISED, 
+            borderwidth=2
+        )
+        info_frame.pack(pady=10, fill=tk.X)
+        
+        # Total de ventas
+        self._total_reporte = ttk.Label(info_frame, font=('Helvetica', 12, 'bold'))
+        self._total_reporte.pack(anchor=tk.W, pady=5)
+        
+        self._completados_reporte = ttk.Label(info_frame, font=('Helvetica', 12))
+        self._completados_reporte.pack(anchor=tk.W, pady=5)
+        
+        ttk.Label(
+            info_frame, 
+            text="🏆 Productos más vendidos:", 
+            font=('Helvetica', 12, 'bold')
+        ).pack(anchor=tk.W, pady=(15, 5))
+        
+        # Top 5; las etiquetas sobrantes quedan ocultas
+        self._top_reporte = [ttk.Label(info_frame, font=('Helvetica', 11)) for _ in range(5)]
+        
+        # Botón volver
+        ttk.Button(
+            main_frame, 
+            text="Volver", 
+            command=self.mostrar_panel_empleado,
+            style="Secondary.TButton"
+        ).pack(side=tk.BOTTOM, pady=10)
+    
+    def refrescar_reporte_ventas(self):
+        """Pide el reporte de ventas; las cifras las pone mostrar_reporte"""
+        self.consultar(self.sistema.generar_reporte_ventas, al_terminar=self.mostrar_reporte)
+    
+    def mostrar_reporte(self, reporte: Dict):
+        """Pone las cifras del reporte de ventas al día"""
+        self._total_reporte.configure(text=f"💰 Total de ventas: {formatear_dinero(reporte['total_ventas'])}")
+        self._completados_reporte.configure(text=f"📦 Pedidos completados: {reporte['pedidos_completados']}")
+        
+        # Productos más vendidos
+        productos_vendidos = sorted(
+            reporte['productos_vendidos'].items(), 
+            key=lambda x: x[1], 
+            reverse=True
+        )[:5]  # Top 5
+        
+        nombres = reporte['nombres_productos']
+        lineas = [f"• {nombres[codigo]}: {cantidad} unidades"
+                  for codigo, cantidad in productos_vendidos if codigo in nombres]
+        
+        for i, etiqueta in enumerate(self._top_reporte):
+            if i < len(lineas):
+                etiqueta.configure(text=lineas[i])
+                etiqueta.pack(anchor=tk.W, padx=20)
+            else:
+                etiqueta.pack_forget()
+    
+    def cerrar_sesion_empleado(self):
+        """Cierra la sesión del empleado"""
+        self.empleado_actual = None
+        self.mostrar_pantalla_inicio()
+    
+    def exportar_clientes_excel(self):
+        """Exporta los datos de clientes a un archivo Excel en segundo plano"""
+        def terminado(exito):
+            self.estado_tarea.configure(text="")
+            if exito:
+                messagebox.showinfo(
+                    "Éxito",
+                    "Datos de clientes exportados correctamente a 'clientes_cafeteria.xlsx'",
+                    parent=self.root
+                )
+            else:
+                messagebox.showerror(
+                    "Error",
+                    "No se pudo exportar los datos. Asegúrate de tener instalado openpyxl (pip install openpyxl)",
+                    parent=self.root
+                )
+        
+        self.tareas.ejecutar(
+            self.sistema.exportar_clientes_excel,
+            al_terminar=terminado,
+            al_progresar=lambda hechos, total: self.mostrar_progreso("Exportando a Excel...", hechos, total),
+            botones=(self._boton_excel,)
+        )
+
+    def exportar_clientes_csv(self):
+        """Exporta los datos de clientes a un archivo CSV en segundo plano"""
+        def terminado(exito):
+            self.estado_tarea.configure(text="")
+            if exito:
+                messagebox.showinfo(
+                    "Éxito",
+                    "Datos de clientes exportados correctamente a 'clientes_cafeteria.csv'",
+                    parent=self.root
+                )
+            else:
+                messagebox.showerror(
+                    "Error",
+                    "No se pudo exportar los datos a CSV",
+                    parent=self.root
+                )
+        
+        self.tareas.ejecutar(
+            self.sistema.exportar_clientes_csv,
+            al_terminar=terminado,
+            al_progresar=lambda hechos, total: self.mostrar_progreso("Exportando a CSV...", hechos, total),
+            botones=(self._boton_csv,)
+        )
+
+    def cerrar_sesion_empleado(self):
+        """Cierra la sesión del empleado"""
+        self.empleado_actual = None
+        self.mostrar_pantalla_inicio()
+# Iniciar la aplicación
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sistema de pedidos de la Cafetería Dulce Aroma")
+    parser.add_argument("--servicio", action="store_true",
+                        help="atender a otras terminales en lugar de abrir la ventana")
+    parser.add_argument("--conectar", action="store_true",
+                        help="usar el servicio de pedidos en lugar de los datos locales")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO_SERVICIO)
+    parser.add_argument("--unix", metavar="RUTA", help="usar un socket Unix en lugar de TCP")
+    args = parser.parse_args()
+    
+    if args.servicio:
+        sistema = SistemaPedidos(almacen=AlmacenDiferido(
+            AlmacenPickle(SistemaPedidos.DATA_FILE, SistemaPedidos.JOURNAL_FILE)))
+        asyncio.run(ServicioPedidos(sistema, args.host, args.puerto, args.unix).servir())
+    else:
+        root = tk.Tk()
+        sistema = SistemaRemoto(args.host, args.puerto, args.unix) if args.conectar else None
+        app = InterfazCafeteria(root, sistema)
+        root.mainloop()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""Mide con tracemalloc la memoria de los pedidos y sus líneas.
+
+Crea N pedidos de varias líneas, como los que deja la interfaz, con el modelo
+actual (__slots__, céntimos y opciones como códigos) y con el modelo anterior
+(objetos con __dict__, precios en unidades y opciones como texto), e informa
+para cada uno de los bytes por pedido y por línea en memoria y del tamaño al
+guardarlos con pickle. Sirve para comprobar que un cambio en el modelo no
+dispara la memoria con cientos de miles de líneas.
+
+    python medir_memoria.py --pedidos 100000 --lineas 3
+"""
+import argparse
+import datetime
+import gc
+import pickle
+import random
+import tracemalloc
+
+from prueba_estres import cargar_programa
+
+
+class LineaAnterior:
+    """ProductoConExtras tal como era antes de usar __slots__"""
+    def __init__(self, producto, cantidad=1, tipo_leche=None, azucar=None, notas=""):
+        self.producto = producto
+        self.cantidad = cantidad
+        self.tipo_leche = tipo_leche
+        self.azucar = azucar
+        self.notas = notas
+
+
+class ProductoAnterior:
+    """Producto con __dict__ y precio en unidades"""
+    def __init__(self, codigo, nombre, precio, stock=0):
+        self.codigo = codigo
+        self.nombre = nombre
+        self.precio = precio
+        self.stock = stock
+        self.descripcion = ""
+        self.imagen = None
+
+
+class ClienteAnterior:
+    """Cliente con __dict__"""
+    def __init__(self, nombre, telefono, identificacion):
+        self.nombre = nombre
+        self.telefono = telefono
+        self.identificacion = identificacion
+        self.historial_pedidos = []
+
+
+class PedidoAnterior:
+    """Pedido con __dict__, fecha como datetime y total en unidades"""
+    def __init__(self, cliente, productos, numero):
+        self.numero = numero
+        self.cliente = cliente
+        self.productos = productos.copy()
+        self.fecha = datetime.datetime.now()
+        self.estado = "Nuevo"
+        self.total = sum(item.producto.precio * item.cantidad for item in self.productos)
+
+
+def texto_formulario(azar: random.Random, opciones: list) -> str:
+    """Una opción elegida en un formulario: Tk devuelve un str nuevo en cada lectura"""
+    return azar.choice(opciones).encode("utf-8").decode("utf-8")
+
+
+def medir(crear_pedidos) -> tuple:
+    """Memoria retenida, pico y tamaño en pickle de los pedidos que devuelve `crear_pedidos()`"""
+    gc.collect()
+    tracemalloc.start()
+    pedidos = crear_pedidos()
+    gc.collect()
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    guardado = len(pickle.dumps(pedidos, protocol=pickle.HIGHEST_PROTOCOL))
+    return actual, pico, guardado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memoria de N pedidos con sus líneas")
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    parser.add_argument("--lineas", type=int, default=3, help="líneas por pedido")
+    args = parser.parse_args()
+
+    cafeteria = cargar_programa()
+    leches, azucares = cafeteria.TIPOS_LECHE, cafeteria.NIVELES_AZUCAR
+    productos = ([cafeteria.Bebida(f"B{i:03d}", f"Bebida {i}", 250, 100) for i in range(10)]
+                 + [cafeteria.Postre(f"P{i:03d}", f"Postre {i}", 300, 100, ["Harina"]) for i in range(10)])
+    clientes = [cafeteria.Cliente(f"Cliente {i}", "555-0000", f"cliente{i}") for i in range(1000)]
+    productos_anteriores = [ProductoAnterior(p.codigo, p.nombre, p.precio / 100, p.stock) for p in productos]
+    clientes_anteriores = [ClienteAnterior(c.nombre, c.telefono, c.identificacion) for c in clientes]
+
+    def modelo_actual():
+        azar = random.Random(1)
+        pedidos = []
+        for i in range(args.pedidos):
+            lineas = [cafeteria.ProductoConExtras(azar.choice(productos), azar.randint(1, 3),
+                                                  texto_formulario(azar, leches),
+                                                  texto_formulario(azar, azucares), "")
+                      for _ in range(args.lineas)]
+            pedidos.append(clientes[i % len(clientes)].realizar_pedido(lineas, i + 1))
+        return pedidos
+
+    def modelo_anterior():
+        # Misma semilla: los mismos pedidos con la representación anterior
+        azar = random.Random(1)
+        pedidos = []
+        for i in range(args.pedidos):
+            lineas = [LineaAnterior(azar.choice(productos_anteriores), azar.randint(1, 3),
+                                    texto_formulario(azar, leches), texto_formulario(azar, azucares), "")
+                      for _ in range(args.lineas)]
+            cliente = clientes_anteriores[i % len(clientes_anteriores)]
+            pedido = PedidoAnterior(cliente, lineas, i + 1)
+            cliente.historial_pedidos.append(pedido)
+            pedidos.append(pedido)
+        return pedidos
+
+    n_lineas = args.pedidos * args.lineas
+    print(f"{args.pedidos} pedidos, {n_lineas} líneas")
+    resultados = {}
+    for nombre, crear_pedidos in (("Anterior", modelo_anterior), ("Actual", modelo_actual)):
+        actual, pico, guardado = resultados[nombre] = medir(crear_pedidos)
+        print(f"{nombre}:")
+        print(f"  Memoria:  {actual / 1e6:.1f} MB (pico {pico / 1e6:.1f} MB), "
+              f"{actual / args.pedidos:.0f} bytes por pedido, {actual / n_lineas:.0f} por línea")
+        print(f"  Pickle:   {guardado / 1e6:.1f} MB, {guardado / args.pedidos:.0f} bytes por pedido")
+    anterior, actual = resultados["Anterior"], resultados["Actual"]
+    print(f"Ahorro: {1 - actual[0] / anterior[0]:.0%} de memoria, {1 - actual[2] / anterior[2]:.0%} en pickle")
+
+
+if __name__ == "__main__":
+    main()
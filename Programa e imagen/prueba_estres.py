@@ -0,0 +1,293 @@
+"""Prueba de estrés del sistema de pedidos con varias terminales a la vez.
+
+Cada hilo hace de terminal: crea pedidos, los procesa y los entrega. Al
+terminar se comprueba que no se repitió ningún número de pedido, que los
+acumulados de ventas coinciden con un recorrido completo y que al volver a
+cargar los datos se obtiene el mismo estado.
+
+Después se comprueban los caminos de recuperación y migración: journal con
+el final cortado, segmentos del journal, instantánea dañada, transacciones
+deshechas, bloques de números de pedido, importes antiguos en unidades y
+el orden de ListaVirtual (este último solo si hay pantalla). Sale con código 1 si falla cualquier comprobación.
+
+    python prueba_estres.py --hilos 8 --pedidos 500 --almacen sqlite
+"""
+import argparse
+import importlib.util
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def cargar_programa():
+    """Importa el programa, cuyo nombre de archivo no es un nombre de módulo válido"""
+    spec = importlib.util.spec_from_file_location(
+        "cafeteria", os.path.join(DIRECTORIO, "Cafeteria Dulce Aroma 2.py"))
+    modulo = importlib.util.module_from_spec(spec)
+    # pickle busca las clases por el nombre del módulo
+    sys.modules["cafeteria"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def crear_almacen(cafeteria, tipo: str, directorio: str):
+    """Almacén nuevo sobre los archivos de `directorio`"""
+    if tipo == "sqlite":
+        return cafeteria.AlmacenSQLite(os.path.join(directorio, "cafeteria.db"))
+    return cafeteria.AlmacenPickle(os.path.join(directorio, "cafeteria.pkl"),
+                                   os.path.join(directorio, "cafeteria.journal"))
+
+
+def estado(sistema) -> tuple:
+    """Lo que debe sobrevivir a una recarga: pedidos, stock y acumulados"""
+    pedidos = [(p.numero, p.cliente.identificacion, p.estado, p.total,
+                [(i.producto.codigo, i.cantidad, i.precio_total) for i in p.productos])
+               for p in sistema.pedidos]
+    stock = {p.codigo: p.stock for p in sistema.inventario.listar_productos()}
+    return pedidos, stock, sistema.generar_reporte_ventas()
+
+
+def terminal(sistema, semilla: int, n_pedidos: int, clientes: list, creados: list) -> None:
+    """Crea `n_pedidos` pedidos y procesa o entrega una parte de ellos"""
+    azar = random.Random(semilla)
+    productos = sistema.inventario.listar_productos()
+    for _ in range(n_pedidos):
+        lineas = [sistema._crear_item((producto.codigo, azar.randint(1, 3), None, None, ""))
+                  for producto in azar.sample(productos, 3)]
+        pedido = sistema.crear_pedido(azar.choice(clientes), lineas)
+        if pedido is None:
+            continue
+        creados.append(pedido.numero)
+        if azar.random() < 0.7:
+            sistema.procesar_pedido(pedido.numero, "amanda")
+            if azar.random() < 0.6:
+                sistema.entregar_pedido(pedido.numero, "amanda")
+
+
+def sistema_pickle(cafeteria, directorio: str):
+    """Sistema sobre un almacén pickle en `directorio`, sin avisos en pantalla"""
+    sistema = cafeteria.SistemaPedidos(almacen=crear_almacen(cafeteria, "pickle", directorio))
+    sistema.avisar = lambda titulo, mensaje: None
+    return sistema
+
+
+def crear_pedidos(sistema, cantidad: int, cliente: str = "cliente0") -> list:
+    """Crea `cantidad` pedidos de una línea y devuelve sus números"""
+    if sistema.buscar_cliente(cliente) is None:
+        sistema.registrar_cliente("Cliente", "555-0000", cliente)
+    return [sistema.crear_pedido(cliente, [sistema._crear_item(("B001", 1, None, None, ""))]).numero
+            for _ in range(cantidad)]
+
+
+def comprobar_journal_cortado(cafeteria, directorio: str) -> bool:
+    """Un registro a medio escribir al final del journal se descarta y lo anterior se conserva"""
+    sistema = sistema_pickle(cafeteria, directorio)
+    numeros = crear_pedidos(sistema, 3)
+    sistema.cerrar()
+    with open(os.path.join(directorio, "cafeteria.journal"), "ab") as f:
+        f.write(pickle.dumps((10 ** 6, "pedido", ()))[:-3])
+    recargado = sistema_pickle(cafeteria, directorio)
+    correcto = [p.numero for p in recargado.pedidos] == numeros
+    numeros += crear_pedidos(recargado, 1)
+    recargado.cerrar()
+    otra_vez = sistema_pickle(cafeteria, directorio)
+    otra_vez.cerrar()
+    return correcto and [p.numero for p in otra_vez.pedidos] == numeros
+
+
+def comprobar_segmentos_journal(cafeteria, directorio: str) -> bool:
+    """Con compactaciones frecuentes los segmentos viejos se borran y la recarga no pierde nada"""
+    sistema = sistema_pickle(cafeteria, directorio)
+    sistema.almacen.LIMITE_JOURNAL = 5
+    numeros = []
+    for _ in range(12):
+        numeros += crear_pedidos(sistema, 3)
+        sistema.almacen.cerrar()  # Espera a la compactación lanzada en segundo plano
+    antes = estado(sistema)
+    sistema.cerrar()
+    segmentos = [n for n in os.listdir(directorio) if n.startswith("cafeteria.journal.")]
+    recargado = sistema_pickle(cafeteria, directorio)
+    recargado.cerrar()
+    return (len(segmentos) <= cafeteria.AlmacenPickle.GENERACIONES
+            and estado(recargado) == antes and [p.numero for p in recargado.pedidos] == numeros)
+
+
+def comprobar_instantanea_danada(cafeteria, directorio: str) -> bool:
+    """Si la instantánea más reciente está dañada se usa la anterior más el journal"""
+    sistema = sistema_pickle(cafeteria, directorio)
+    crear_pedidos(sistema, 3)
+    sistema.guardar_datos()
+    crear_pedidos(sistema, 2)
+    sistema.guardar_datos()
+    crear_pedidos(sistema, 1)
+    antes = estado(sistema)
+    sistema.cerrar()
+    with open(os.path.join(directorio, "cafeteria.pkl"), "r+b") as f:
+        f.seek(-20, os.SEEK_END)
+        f.write(b"\0" * 20)
+    recargado = sistema_pickle(cafeteria, directorio)
+    recargado.cerrar()
+    return estado(recargado) == antes
+
+
+def comprobar_transaccion_deshecha(cafeteria, directorio: str) -> bool:
+    """Una transacción que falla no deja cambios en memoria ni en disco"""
+    sistema = sistema_pickle(cafeteria, directorio)
+    crear_pedidos(sistema, 2)
+    antes = estado(sistema)
+    historial = sistema.buscar_cliente("cliente0").historial_pedidos
+    try:
+        with sistema.transaccion():
+            crear_pedidos(sistema, 2)
+            sistema.actualizar_stock("B002", 7)
+            sistema.eliminar_pedido(historial[0])
+            raise RuntimeError("se deshace")
+    except RuntimeError:
+        pass
+    correcto = (estado(sistema) == antes and sistema.verificar_reporte_ventas()
+                and sistema.buscar_cliente("cliente0").historial_pedidos == historial)
+    sistema.cerrar()
+    recargado = sistema_pickle(cafeteria, directorio)
+    recargado.cerrar()
+    return correcto and estado(recargado) == antes
+
+
+def comprobar_bloques_numeros(cafeteria, directorio: str) -> bool:
+    """Los números reservados no se repiten tras un cierre inesperado ni tras deshacer una transacción"""
+    sistema = sistema_pickle(cafeteria, directorio)
+    sistema.actualizar_stock("B001", 2 * cafeteria.SecuenciaPedidos.BLOQUE)
+    numeros = crear_pedidos(sistema, 2)
+    try:
+        with sistema.transaccion():
+            crear_pedidos(sistema, cafeteria.SecuenciaPedidos.BLOQUE)
+            raise RuntimeError("se deshace")
+    except RuntimeError:
+        pass
+    numeros += crear_pedidos(sistema, 2)
+    # Sin cerrar: los números que quedaban del bloque no se devuelven
+    sistema.almacen.cerrar()
+    recargado = sistema_pickle(cafeteria, directorio)
+    numeros += crear_pedidos(recargado, 2)
+    recargado.cerrar()
+    return len(set(numeros)) == len(numeros) and numeros[-1] > cafeteria.SecuenciaPedidos.BLOQUE
+
+
+def comprobar_importes_antiguos(cafeteria, directorio: str) -> bool:
+    """Los objetos guardados con importes en unidades se cargan en céntimos, con el total cobrado"""
+    bebida = cafeteria.Bebida("B900", "Antigua", 250, 5)
+    pedido = cafeteria.Cliente("Cliente", "555-0000", "antiguo").realizar_pedido(
+        [cafeteria.ProductoConExtras(bebida, 2)], 1)
+    estado_bebida = list(bebida.__getstate__())
+    estado_bebida[2] = 2.75  # Precio actual distinto del cobrado
+    estado_pedido = list(pedido.__getstate__())
+    estado_pedido[cafeteria.Pedido._campos().index("total")] = 4.5
+    bebida.__setstate__(tuple(estado_bebida))
+    pedido.__setstate__(tuple(estado_pedido))
+    return bebida.precio == 275 and pedido.total == 450
+
+
+def comprobar_lista_virtual(cafeteria, directorio: str) -> bool:
+    """ListaVirtual mantiene el orden (con empates por llegada) al añadir, cambiar y quitar"""
+    root = cafeteria.tk.Tk()
+    try:
+        lista = cafeteria.ListaVirtual(root, lambda padre: cafeteria.ttk.Frame(padre),
+                                       lambda fila, elemento: None, clave=lambda e: e[0])
+        esperado = lambda inverso: [e[0] for e in sorted(lista._elementos.values(),
+                                                          key=lambda e: e[1], reverse=inverso)]
+        correcto = True
+        for inverso in (False, True):
+            lista.mostrar([(i, i % 3) for i in range(10)])
+            lista.ordenar(lambda e: e[1], inverso)
+            lista.actualizar((4, 0))
+            lista.actualizar((10, 1))
+            lista.quitar(5)
+            correcto = correcto and lista._visibles == esperado(inverso)
+        return correcto
+    finally:
+        root.destroy()
+
+
+COMPROBACIONES_RECUPERACION = [
+    ("journal con el final cortado", comprobar_journal_cortado),
+    ("segmentos del journal", comprobar_segmentos_journal),
+    ("instantánea dañada", comprobar_instantanea_danada),
+    ("transacción deshecha", comprobar_transaccion_deshecha),
+    ("bloques de números de pedido", comprobar_bloques_numeros),
+    ("importes antiguos en unidades", comprobar_importes_antiguos),
+    ("orden de ListaVirtual", comprobar_lista_virtual),
+]
+
+
+def recuperacion(cafeteria) -> list:
+    """Ejecuta COMPROBACIONES_RECUPERACION, cada una en un directorio vacío"""
+    resultados = []
+    for descripcion, comprobar in COMPROBACIONES_RECUPERACION:
+        with tempfile.TemporaryDirectory() as directorio:
+            try:
+                resultados.append((descripcion, comprobar(cafeteria, directorio)))
+            except cafeteria.tk.TclError as e:
+                # Sin pantalla no se puede crear la ventana
+                print(f"OMITIDA {descripcion}: {e}")
+            except Exception as e:
+                print(f"ERROR {descripcion}: {type(e).__name__}: {e}")
+                resultados.append((descripcion, False))
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prueba de estrés con varias terminales concurrentes")
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--pedidos", type=int, default=300, help="pedidos por hilo")
+    parser.add_argument("--almacen", choices=("pickle", "sqlite"), default="sqlite")
+    args = parser.parse_args()
+
+    cafeteria = cargar_programa()
+    with tempfile.TemporaryDirectory() as directorio:
+        sistema = cafeteria.SistemaPedidos(almacen=crear_almacen(cafeteria, args.almacen, directorio))
+        sistema.avisar = lambda titulo, mensaje: None
+        clientes = [f"cliente{i}" for i in range(20)]
+        for identificacion in clientes:
+            sistema.registrar_cliente(f"Cliente {identificacion}", "555-0000", identificacion)
+        # Stock suficiente para que ningún pedido se rechace
+        for producto in sistema.inventario.listar_productos():
+            sistema.actualizar_stock(producto.codigo, args.hilos * args.pedidos * 3)
+        stock_inicial = {p.codigo: p.stock for p in sistema.inventario.listar_productos()}
+
+        creados: list = []
+        hilos = [threading.Thread(target=terminal, args=(sistema, i, args.pedidos, clientes, creados))
+                 for i in range(args.hilos)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        vendidos: dict = {}
+        for pedido in sistema.pedidos:
+            for item in pedido.productos:
+                vendidos[item.producto.codigo] = vendidos.get(item.producto.codigo, 0) + item.cantidad
+        antes = estado(sistema)
+        sistema.cerrar()
+        recargado = cafeteria.SistemaPedidos(almacen=crear_almacen(cafeteria, args.almacen, directorio))
+        despues = estado(recargado)
+        recargado.cerrar()
+
+    comprobaciones = [
+        ("todos los pedidos creados", len(creados) == args.hilos * args.pedidos),
+        ("números de pedido únicos", len(set(creados)) == len(creados)),
+        ("acumulados de ventas correctos", sistema.verificar_reporte_ventas()),
+        ("stock descontado una sola vez",
+         all(stock_inicial[c] - p.stock == vendidos.get(c, 0) for c, p in sistema.inventario.productos.items())),
+        ("recarga consistente", antes == despues and recargado.verificar_reporte_ventas()),
+    ] + recuperacion(cafeteria)
+    for descripcion, correcto in comprobaciones:
+        print(f"{'OK   ' if correcto else 'FALLO'} {descripcion}")
+    return 0 if all(correcto for _, correcto in comprobaciones) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())